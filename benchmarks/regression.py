@@ -0,0 +1,125 @@
+"""
+Сравнение результатов бенчмарков с зафиксированным базовым прогоном.
+
+Время и пропускная способность нормируются на калибровочный замер, чтобы
+результаты с машин разной скорости были сопоставимы. Пиковая память не нормируется.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+CALIBRATION_ROUNDS = 5
+CALIBRATION_BYTES = 4 * 1024 * 1024
+DEFAULT_TOLERANCE = 0.25
+
+
+def calibrate(rounds: int = CALIBRATION_ROUNDS) -> float:
+    """
+    Время (лучшее из `rounds`) фиксированной нагрузки: deflate/inflate и цикл интерпретатора.
+
+    Нагрузка похожа на распаковку, поэтому отношение к ней слабо зависит от машины.
+    """
+    rng = random.Random(0)
+    data = b"".join(rng.randbytes(2048) + bytes(2048) for _ in range(CALIBRATION_BYTES // 4096))
+    best = float("inf")
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        zlib.decompress(zlib.compress(data, 6))
+        total = 0
+        for index in range(300_000):
+            total += index & 0xFF
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@dataclass
+class Comparison:
+    """Сравнение одной метрики с базовым значением."""
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    regressed: bool
+
+    def describe(self) -> str:
+        status = "REGRESSION" if self.regressed else "ok"
+        return f"{status:<10} {self.name:<28} {self.metric:<12} {self.baseline:12.4g} -> {self.current:12.4g} ({self.change:+.1%})"
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Comparison]:
+    """
+    Сравнивает отчёты run_benchmarks.
+
+    Регрессия — падение нормированной пропускной способности или рост нормированного
+    времени запуска и пиковой памяти больше чем на `tolerance` (доля, 0.25 = 25%).
+    Сценарии, которых нет в обоих отчётах, пропускаются.
+    """
+    baseline_scale = _calibration(baseline)
+    current_scale = _calibration(current)
+    comparisons: List[Comparison] = []
+
+    baseline_results = {(item["scenario"], item["mode"]): item for item in baseline.get("results", [])}
+    for item in current.get("results", []):
+        reference = baseline_results.get((item["scenario"], item["mode"]))
+        if reference is None:
+            continue
+        name = f"{item['scenario']}/{item['mode']}"
+        comparisons.append(
+            _compare(
+                name,
+                "mb_per_s",
+                reference["mb_per_s"] * baseline_scale,
+                item["mb_per_s"] * current_scale,
+                tolerance,
+                higher_is_better=True,
+            )
+        )
+        if reference.get("peak_rss") and item.get("peak_rss"):
+            comparisons.append(
+                _compare(name, "peak_rss", reference["peak_rss"], item["peak_rss"], tolerance, higher_is_better=False)
+            )
+
+    for name, seconds in current.get("startup", {}).items():
+        reference_seconds = baseline.get("startup", {}).get(name)
+        if reference_seconds is None:
+            continue
+        comparisons.append(
+            _compare(
+                f"startup/{name}",
+                "seconds",
+                reference_seconds / baseline_scale,
+                seconds / current_scale,
+                tolerance,
+                higher_is_better=False,
+            )
+        )
+    return comparisons
+
+
+def _calibration(report: Dict[str, Any]) -> float:
+    value: Optional[float] = report.get("environment", {}).get("calibration_seconds")
+    return value if value else 1.0
+
+
+def _compare(
+    name: str,
+    metric: str,
+    baseline: float,
+    current: float,
+    tolerance: float,
+    higher_is_better: bool,
+) -> Comparison:
+    change = (current - baseline) / baseline if baseline else 0.0
+    regressed = change < -tolerance if higher_is_better else change > tolerance
+    return Comparison(name, metric, baseline, current, change, regressed)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк распаковки EFD: пропускная способность (МБ/с, файлов/с) и пик RSS по режимам.
+
+Каждый замер выполняется в отдельном процессе, чтобы пик памяти не смешивался
+между режимами. Результаты сохраняются в JSON для сравнения между коммитами.
+
+    python benchmarks/run_benchmarks.py --output bench_results.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --tolerance 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from efd_unpacker.domain.unpack_service import (  # noqa: E402
+    DEFAULT_WRITERS,
+    UNPACK_MODES,
+    UnpackService,
+    UnpackTimings,
+    create_reader_factory,
+)
+from regression import DEFAULT_TOLERANCE, calibrate, compare_reports  # noqa: E402
+from startup import measure_startup  # noqa: E402
+from synthetic_efd import PRESETS, generate_efd  # noqa: E402
+
+RESULTS_VERSION = 1
+DEFAULT_REPEAT = 3
+MB = 1024 * 1024
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Пик RSS текущего процесса (None, если платформа не поддерживает resource).
+
+    На Linux берётся VmHWM: ru_maxrss наследуется от родителя через fork/exec
+    и в изолированном замере показал бы память генератора комплектов.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_single(input_file: str, output_dir: str, mode: str, writers: int) -> Dict[str, Any]:
+    """Один замер в текущем процессе."""
+    service = UnpackService(create_reader_factory(mode, writers))
+    timings = UnpackTimings()
+    started = time.perf_counter()
+    manifest = service.unpack(input_file, output_dir, timings=timings)
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "files": len(manifest.included_files),
+        "bytes": manifest.total_size,
+        "timings": timings.to_dict(),
+        "peak_rss": peak_rss_bytes(),
+    }
+
+
+def run_isolated(input_file: str, output_dir: str, mode: str, writers: int) -> Dict[str, Any]:
+    """Замер в отдельном процессе интерпретатора."""
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--worker",
+        input_file,
+        output_dir,
+        "--modes",
+        mode,
+        "--writers",
+        str(writers),
+    ]
+    completed = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout)
+
+
+def summarize(scenario: str, mode: str, generated: Any, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    seconds = statistics.median(run["seconds"] for run in runs)
+    peaks = [run["peak_rss"] for run in runs if run["peak_rss"] is not None]
+    return {
+        "scenario": scenario,
+        "mode": mode,
+        "files": generated.files,
+        "payload_bytes": generated.payload_bytes,
+        "compressed_bytes": generated.compressed_bytes,
+        "repeat": len(runs),
+        "seconds": seconds,
+        "seconds_min": min(run["seconds"] for run in runs),
+        "mb_per_s": generated.payload_bytes / MB / seconds if seconds else 0.0,
+        "files_per_s": generated.files / seconds if seconds else 0.0,
+        "peak_rss": max(peaks) if peaks else None,
+        "timings": runs[len(runs) // 2]["timings"],
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "calibration_seconds": calibrate(),
+    }
+
+
+def run_benchmarks(
+    scenarios: List[str],
+    modes: List[str],
+    repeat: int = DEFAULT_REPEAT,
+    writers: int = DEFAULT_WRITERS,
+    workdir: Optional[str] = None,
+    isolated: bool = True,
+    startup: bool = True,
+    log=print,
+) -> Dict[str, Any]:
+    """Генерирует комплекты для сценариев и замеряет каждый режим распаковки и время запуска."""
+    root = Path(workdir or tempfile.mkdtemp(prefix="efd-bench-"))
+    root.mkdir(parents=True, exist_ok=True)
+    runner = run_isolated if isolated else run_single
+    results = []
+    try:
+        for scenario in scenarios:
+            shape = PRESETS[scenario]
+            generated = generate_efd(str(root / f"{scenario}.efd"), shape)
+            log(
+                f"{scenario}: {generated.files} files, {generated.payload_bytes / MB:.1f} MB "
+                f"({generated.compressed_bytes / MB:.1f} MB compressed)"
+            )
+            for mode in modes:
+                runs = []
+                for attempt in range(repeat):
+                    output_dir = root / f"{scenario}-{mode}-{attempt}"
+                    runs.append(runner(generated.path, str(output_dir), mode, writers))
+                    shutil.rmtree(output_dir, ignore_errors=True)
+                summary = summarize(scenario, mode, generated, runs)
+                summary["shape"] = shape.to_dict()
+                results.append(summary)
+                log(
+                    f"  {mode:<7} {summary['mb_per_s']:8.1f} MB/s {summary['files_per_s']:10.0f} files/s"
+                    f"  peak RSS {(summary['peak_rss'] or 0) / MB:.1f} MB"
+                )
+    finally:
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    startup_details = measure_startup(repeat=repeat, log=log) if startup else {}
+
+    return {
+        "version": RESULTS_VERSION,
+        "environment": environment_info(),
+        "settings": {"repeat": repeat, "writers": writers, "isolated": isolated},
+        "results": results,
+        # Для сравнения с базовым отчётом используется тёплый старт.
+        "startup": {name: item["warm"] for name, item in startup_details.items()},
+        "startup_details": startup_details,
+    }
+
+
+def _parse_list(value: str, allowed: List[str]) -> List[str]:
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown values: {', '.join(unknown)}; allowed: {', '.join(allowed)}")
+    return items
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="EFD unpack benchmarks")
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: _parse_list(value, list(PRESETS)),
+        default=list(PRESETS),
+        help=f"comma-separated scenarios ({', '.join(PRESETS)})",
+    )
+    parser.add_argument(
+        "--modes",
+        type=lambda value: _parse_list(value, list(UNPACK_MODES)),
+        default=list(UNPACK_MODES),
+        help=f"comma-separated unpack modes ({', '.join(UNPACK_MODES)})",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per mode (median is reported)")
+    parser.add_argument("--writers", type=int, default=DEFAULT_WRITERS, help="writer threads for pooled mode")
+    parser.add_argument("--workdir", help="keep generated files in this directory")
+    parser.add_argument("--in-process", action="store_true", help="do not spawn a process per run")
+    parser.add_argument("--no-startup", action="store_true", help="skip process startup measurements")
+    parser.add_argument("--output", "-o", help="write JSON results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail if results regress against this JSON report")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"allowed relative regression for --compare (default {DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument("--worker", nargs=2, metavar=("EFD", "OUTPUT_DIR"), help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.worker:
+        print(json.dumps(run_single(args.worker[0], args.worker[1], args.modes[0], args.writers)))
+        return 0
+
+    report = run_benchmarks(
+        args.scenarios,
+        args.modes,
+        repeat=max(1, args.repeat),
+        writers=max(1, args.writers),
+        workdir=args.workdir,
+        isolated=not args.in_process,
+        startup=not args.no_startup,
+        log=lambda line: print(line, file=sys.stderr),
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        comparisons = compare_reports(baseline, report, args.tolerance)
+        for comparison in comparisons:
+            print(comparison.describe())
+        regressions = [comparison for comparison in comparisons if comparison.regressed]
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%} tolerance", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
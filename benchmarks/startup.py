@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк запуска: время от старта процесса до первой полезной работы.
+
+Сценарии: `--help`, headless `unpack` маленького EFD и первая отрисовка окна GUI
+(Qt offscreen). Холодный старт — первый запуск с пустым HOME (нет кеша переводов,
+штампа launcher и настроек), тёплый — медиана последующих запусков с тем же HOME.
+Кеш файлов ОС не сбрасывается. С `--importtime` для каждого сценария сохраняется
+разбор `-X importtime`: число модулей и самые дорогие импорты. Для `gui` процесс
+дополнительно сообщает время внутри процесса: создание окна, первую отрисовку
+и готовность (отложенная инициализация после первой отрисовки выполнена).
+
+    python benchmarks/startup.py --repeat 5 --importtime --output startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+SRC_DIR = REPO_ROOT / "src"
+MAIN_SCRIPT = REPO_ROOT / "main.py"
+
+SCENARIOS = ("help", "unpack", "gui")
+GUI_STAGES = ("window", "first_paint", "ready")
+DEFAULT_REPEAT = 3
+TOP_IMPORTS = 10
+
+
+@dataclass(frozen=True)
+class ImportBudget:
+    """Допустимое число модулей и суммарное время (мс) импорта модуля в чистом интерпретаторе."""
+
+    modules: int
+    milliseconds: float
+    forbidden: Tuple[str, ...] = ()
+
+
+# Консольная точка входа не должна тянуть Qt и тяжёлые зависимости.
+# Сейчас: ~155 модулей и ~80 мс; запас по времени рассчитан на медленные CI.
+IMPORT_BUDGETS: Dict[str, ImportBudget] = {
+    "efd_unpacker.application.console": ImportBudget(modules=200, milliseconds=600.0, forbidden=("PyQt5",)),
+}
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Строки `import time: self | cumulative | module` из вывода `-X importtime`."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # заголовок таблицы
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        records.append(
+            ImportRecord(stripped, int(parts[0]), int(parts[1]), (len(name) - len(stripped) - 1) // 2)
+        )
+    return records
+
+
+def summarize_imports(records: Sequence[ImportRecord], top: int = TOP_IMPORTS) -> Dict[str, Any]:
+    """Число модулей, суммарное время импортов верхнего уровня и самые дорогие модули."""
+    heaviest = sorted(records, key=lambda record: record.cumulative_us, reverse=True)[:top]
+    return {
+        "modules": len(records),
+        "milliseconds": sum(record.cumulative_us for record in records if record.depth == 0) / 1000,
+        "top": [
+            {"module": record.module, "cumulative_ms": record.cumulative_us / 1000, "self_ms": record.self_us / 1000}
+            for record in heaviest
+        ],
+    }
+
+
+def measure_import(module: str, env: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Импортирует `module` в чистом интерпретаторе с `-X importtime`.
+
+    Возвращает сводку (как `summarize_imports`) и имена модулей, загруженных сверх
+    пустого интерпретатора.
+    """
+    baseline = {record.module for record in _importtime(["-c", "pass"], env)}
+    records = [record for record in _importtime(["-c", f"import {module}"], env) if record.module not in baseline]
+    return summarize_imports(records), [record.module for record in records]
+
+
+def check_import_budget(module: str, budget: ImportBudget, env: Optional[Dict[str, str]] = None) -> List[str]:
+    """Нарушения бюджета импорта; пустой список — бюджет соблюдён."""
+    summary, modules = measure_import(module, env)
+    problems = []
+    if summary["modules"] > budget.modules:
+        problems.append(f"{module}: {summary['modules']} modules > {budget.modules}")
+    if summary["milliseconds"] > budget.milliseconds:
+        problems.append(f"{module}: {summary['milliseconds']:.0f} ms > {budget.milliseconds:.0f} ms")
+    for name in modules:
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in budget.forbidden):
+            problems.append(f"{module}: imports forbidden {name}")
+            break
+    return problems
+
+
+def _importtime(arguments: List[str], env: Optional[Dict[str, str]]) -> List[ImportRecord]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env or _python_env(),
+    )
+    return parse_importtime(result.stderr)
+
+
+def _python_env(home: Optional[Path] = None) -> Dict[str, str]:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    if home is not None:
+        env["HOME"] = str(home)
+        env["USERPROFILE"] = str(home)
+        env["XDG_CONFIG_HOME"] = str(home / ".config")
+    return env
+
+
+def scenario_command(name: str, workdir: Path, attempt: int) -> List[str]:
+    """Аргументы интерпретатора для сценария; файлы сценария создаются в `workdir`."""
+    if name == "help":
+        return [str(MAIN_SCRIPT), "--help"]
+    if name == "unpack":
+        return [
+            str(MAIN_SCRIPT),
+            "unpack",
+            str(_tiny_efd(workdir)),
+            "-tmplts",
+            str(workdir / f"out-{attempt}"),
+            "--no-cache",
+        ]
+    if name == "gui":
+        return [str(Path(__file__).resolve()), "--gui-probe"]
+    raise ValueError(f"unknown startup scenario: {name}")
+
+
+def _tiny_efd(workdir: Path) -> Path:
+    path = workdir / "tiny.efd"
+    if not path.exists():
+        sys.path.insert(0, str(SRC_DIR))
+        sys.path.insert(0, str(BENCH_DIR))
+        from synthetic_efd import EFDShape, generate_efd
+
+        generate_efd(str(path), EFDShape(files=5, mean_size=1000, depth=1, seed=1), workers=1)
+    return path
+
+
+def run_scenario(name: str, repeat: int = DEFAULT_REPEAT, importtime: bool = False) -> Dict[str, Any]:
+    """Холодный запуск, медиана тёплых запусков и (по запросу) разбор импортов сценария."""
+    workdir = Path(tempfile.mkdtemp(prefix="efd-startup-"))
+    home = workdir / "home"
+    home.mkdir()
+    env = _python_env(home)
+    try:
+        # Команды (и файлы для них) готовятся заранее, чтобы не попасть в замер.
+        commands = [scenario_command(name, workdir, attempt) for attempt in range(max(2, repeat + 1))]
+        samples = []
+        stages: List[Dict[str, float]] = []
+        for command in commands:
+            started = time.perf_counter()
+            completed = subprocess.run([sys.executable, *command], check=True, capture_output=True, text=True, env=env)
+            samples.append(time.perf_counter() - started)
+            if name == "gui":
+                stages.append(parse_gui_stages(completed.stdout))
+        result: Dict[str, Any] = {"cold": samples[0], "warm": statistics.median(samples[1:])}
+        if stages:
+            # Тёплые запуски, как и для времени процесса.
+            result["stages"] = {stage: statistics.median(item[stage] for item in stages[1:]) for stage in GUI_STAGES}
+        if importtime:
+            command = scenario_command(name, workdir, len(samples))
+            profiled = subprocess.run(
+                [sys.executable, "-X", "importtime", *command], check=True, capture_output=True, text=True, env=env
+            )
+            result["imports"] = summarize_imports(parse_importtime(profiled.stderr))
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def parse_gui_stages(stdout: str) -> Dict[str, float]:
+    """Времена этапов (секунды от начала gui_probe) из последней строки вывода `--gui-probe`."""
+    lines = stdout.strip().splitlines()
+    data = json.loads(lines[-1]) if lines else {}
+    return {stage: float(data[stage]) for stage in GUI_STAGES}
+
+
+def measure_startup(
+    scenarios: Sequence[str] = SCENARIOS,
+    repeat: int = DEFAULT_REPEAT,
+    importtime: bool = False,
+    log=print,
+) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name in scenarios:
+        try:
+            results[name] = run_scenario(name, repeat, importtime)
+        except subprocess.CalledProcessError as exc:
+            # Например, gui без PyQt5: остальные сценарии всё равно замеряются.
+            log(f"startup {name}: failed with exit code {exc.returncode}")
+            continue
+        line = f"startup {name}: cold {results[name]['cold'] * 1000:.0f} ms, warm {results[name]['warm'] * 1000:.0f} ms"
+        if "stages" in results[name]:
+            line += ", in process: " + ", ".join(
+                f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in results[name]["stages"].items()
+            )
+        if "imports" in results[name]:
+            line += f", {results[name]['imports']['modules']} modules"
+        log(line)
+    return results
+
+
+def gui_probe() -> int:  # pragma: no cover - требует PyQt5
+    """
+    Повторяет запуск GUI из run_gui и завершается после первой отрисовки окна.
+
+    Печатает JSON с этапами (секунды от начала функции): `window` — окно создано,
+    `first_paint` — первая отрисовка, `ready` — выполнена отложенная инициализация.
+    """
+    started = time.perf_counter()
+    stages: Dict[str, float] = {}
+    sys.path.insert(0, str(SRC_DIR))
+    from efd_unpacker.application.console import run_console
+    from efd_unpacker.domain.file_validator import FileValidator
+    from efd_unpacker.localization.translator import create_translator
+    from efd_unpacker.runtime import detect_system_language
+
+    translator = create_translator(detect_system_language())
+    validator = FileValidator()
+    if run_console([sys.argv[0]], translator, validator) is not None:
+        return 1
+
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+
+    from efd_unpacker.application.main import FileAssociationApp
+    from efd_unpacker.domain.unpack_service import UnpackService
+    from efd_unpacker.infrastructure.settings_service import SettingsService
+    from efd_unpacker.presentation.ui import MainWindow
+
+    app = FileAssociationApp([sys.argv[0]], validator)
+    window = MainWindow(
+        translator=translator,
+        settings_service=SettingsService(translator),
+        file_validator=validator,
+        unpack_service=UnpackService(),
+    )
+    stages["window"] = time.perf_counter() - started
+
+    def ready() -> None:
+        if not getattr(window, "secondary_widgets_ready", True):
+            QTimer.singleShot(0, ready)
+            return
+        stages["ready"] = time.perf_counter() - started
+        app.quit()
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event) -> bool:
+            if event.type() == QEvent.Type.Paint and "first_paint" not in stages:
+                stages["first_paint"] = time.perf_counter() - started
+                QTimer.singleShot(0, ready)
+            return False
+
+    first_paint = FirstPaint()
+    window.installEventFilter(first_paint)
+    window.show()
+    app.exec()
+    print(json.dumps(stages))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="EFD Unpacker startup benchmark")
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"comma-separated scenarios ({', '.join(SCENARIOS)})",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="warm runs per scenario (median is reported)")
+    parser.add_argument("--importtime", action="store_true", help="record -X importtime breakdown")
+    parser.add_argument("--check-budget", action="store_true", help="fail if IMPORT_BUDGETS are exceeded")
+    parser.add_argument("--output", "-o", help="write JSON results to this file")
+    parser.add_argument("--gui-probe", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.gui_probe:
+        return gui_probe()
+
+    scenarios = [item.strip() for item in args.scenarios.split(",") if item.strip()]
+    unknown = [item for item in scenarios if item not in SCENARIOS]
+    if unknown:
+        build_parser().error(f"unknown scenarios: {', '.join(unknown)}")
+
+    report: Dict[str, Any] = {"startup": measure_startup(scenarios, args.repeat, args.importtime, log=print)}
+    if args.importtime:
+        report["imports"] = {module: measure_import(module)[0] for module in IMPORT_BUDGETS}
+        for module, summary in report["imports"].items():
+            heaviest = ", ".join(f"{item['module']} {item['cumulative_ms']:.1f}" for item in summary["top"][:5])
+            print(f"import {module}: {summary['modules']} modules, {summary['milliseconds']:.0f} ms ({heaviest})")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    if args.check_budget:
+        problems = [problem for module, budget in IMPORT_BUDGETS.items() for problem in check_import_budget(module, budget)]
+        for problem in problems:
+            print(f"BUDGET EXCEEDED {problem}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
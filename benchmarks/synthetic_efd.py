@@ -0,0 +1,123 @@
+"""
+Генератор синтетических EFD-файлов для бенчмарков.
+
+Форма комплекта задаётся EFDShape: количество файлов, распределение размеров,
+глубина каталогов и сжимаемость содержимого. Генерация детерминирована по `seed`.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import math
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List
+
+from efd_unpacker.domain.supply_stream import SupplyManifest
+from efd_unpacker.domain.supply_writer import DEFAULT_PACK_WORKERS, EFDWriter
+
+SIZE_FIXED = "fixed"
+SIZE_UNIFORM = "uniform"
+SIZE_LOGNORMAL = "lognormal"
+SIZE_DISTRIBUTIONS = (SIZE_FIXED, SIZE_UNIFORM, SIZE_LOGNORMAL)
+
+BLOCK_SIZE = 4096
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class EFDShape:
+    """Параметры синтетического комплекта."""
+
+    files: int = 100
+    mean_size: int = 64 * 1024
+    size_distribution: str = SIZE_LOGNORMAL
+    depth: int = 3
+    compressibility: float = 0.5
+    level: int = 6
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+@dataclass
+class GeneratedEFD:
+    path: str
+    files: int
+    payload_bytes: int
+    compressed_bytes: int
+
+
+def file_sizes(shape: EFDShape, rng: random.Random) -> List[int]:
+    """Размеры файлов по заданному распределению (среднее — `mean_size`)."""
+    if shape.size_distribution == SIZE_FIXED:
+        return [shape.mean_size] * shape.files
+    if shape.size_distribution == SIZE_UNIFORM:
+        return [rng.randint(0, 2 * shape.mean_size) for _ in range(shape.files)]
+    if shape.size_distribution == SIZE_LOGNORMAL:
+        sigma = 1.0
+        mu = max(0.0, math.log(max(1, shape.mean_size)) - sigma * sigma / 2)
+        return [int(rng.lognormvariate(mu, sigma)) for _ in range(shape.files)]
+    raise ValueError(f"unknown size distribution: {shape.size_distribution}")
+
+
+def file_paths(shape: EFDShape) -> List[str]:
+    """Пути в стиле EFD (`\\`), разложенные по дереву глубины `depth`."""
+    paths = []
+    for index in range(shape.files):
+        parts = [f"dir{(index >> (2 * level)) % 4}_{level}" for level in range(shape.depth)]
+        paths.append("\\".join(["Bench", *parts, f"file{index:06d}.bin"]))
+    return paths
+
+
+def file_content(size: int, compressibility: float, rng: random.Random) -> bytes:
+    """
+    Содержимое с заданной долей сжимаемых данных.
+
+    В каждом блоке первые `(1 - compressibility)` байт случайны, остальные — нули.
+    """
+    random_part = int(BLOCK_SIZE * (1.0 - min(1.0, max(0.0, compressibility))))
+    parts = []
+    for start in range(0, size, BLOCK_SIZE):
+        length = min(BLOCK_SIZE, size - start)
+        random_length = min(length, random_part)
+        parts.append(rng.randbytes(random_length))
+        parts.append(bytes(length - random_length))
+    return b"".join(parts)
+
+
+def generate_efd(path: str, shape: EFDShape, workers: int = DEFAULT_PACK_WORKERS) -> GeneratedEFD:
+    """Записывает EFD с заданной формой через EFDWriter и возвращает его характеристики."""
+    rng = random.Random(shape.seed)
+    sizes = file_sizes(shape, rng)
+    paths = file_paths(shape)
+    modified_at = dt.datetime(2024, 1, 1)
+    manifest = SupplyManifest(
+        description={"ru": ("Benchmark", "EFD Unpacker", "")},
+        included_files=[(name, modified_at, size) for name, size in zip(paths, sizes)],
+    )
+
+    def payload() -> Iterator[bytes]:
+        for size in sizes:
+            content = file_content(size, shape.compressibility, rng)
+            for start in range(0, len(content), WRITE_CHUNK_SIZE):
+                yield content[start:start + WRITE_CHUNK_SIZE]
+
+    with open(path, "wb") as handle:
+        compressed_bytes = EFDWriter(handle, level=shape.level, workers=workers).write(manifest, payload())
+
+    return GeneratedEFD(
+        path=path,
+        files=len(paths),
+        payload_bytes=manifest.total_size,
+        compressed_bytes=compressed_bytes,
+    )
+
+
+PRESETS: Dict[str, EFDShape] = {
+    "small-files": EFDShape(files=2000, mean_size=4 * 1024, depth=4),
+    "mixed": EFDShape(files=200, mean_size=256 * 1024),
+    "large-files": EFDShape(files=4, mean_size=32 * 1024 * 1024, size_distribution=SIZE_FIXED, depth=1),
+    "incompressible": EFDShape(files=50, mean_size=1024 * 1024, compressibility=0.0),
+}
@@ -11,7 +11,7 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from efd_unpacker.application.main import main as efd_main
+from efd_unpacker.application.console import main as efd_main
 
 if __name__ == "__main__":
     efd_main()
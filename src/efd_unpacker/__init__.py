@@ -2,14 +2,15 @@
 EFD Unpacker package.
 """
 
-from importlib import metadata
-
 
 def get_version() -> str:
     """
     Возвращает версию пакета, если он установлен.
     Для локальной разработки, где дистрибутива нет, возвращает '0.0.0'.
     """
+    # importlib.metadata загружается только здесь: это заметная часть времени запуска CLI.
+    from importlib import metadata
+
     try:
         return metadata.version("efd_unpacker")
     except metadata.PackageNotFoundError:
@@ -0,0 +1,8 @@
+"""
+Запуск `python -m efd_unpacker`: консольная точка входа, GUI загружается только при необходимости.
+"""
+
+from efd_unpacker.application.console import main
+
+if __name__ == "__main__":
+    main()
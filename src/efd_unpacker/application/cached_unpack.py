@@ -0,0 +1,118 @@
+"""
+Распаковка с кешем результатов по хешу содержимого.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, List, Optional
+
+from ..domain.errors import UnpackError, UnpackErrorCode
+from ..domain.metrics import MetricNames, MetricsRecorder
+from ..domain.supply_stream import SupplyManifest
+from ..domain.unpack_service import ProgressCallback, UnpackProgress, UnpackService, UnpackTimings
+from ..infrastructure.extraction_cache import HASH_CHUNK_SIZE, ExtractionCache, hash_file, new_digest
+
+
+class _TeeDigest:
+    """Передаёт прочитанные байты нескольким объектам hashlib за один проход."""
+
+    def __init__(self, *digests: Any) -> None:
+        self._digests: List[Any] = list(digests)
+
+    def update(self, data: bytes) -> None:
+        for digest in self._digests:
+            digest.update(data)
+
+
+def _update_digest(digest: Any, input_file: str) -> None:
+    with open(input_file, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+
+class CachedUnpackService(UnpackService):
+    """
+    UnpackService, который пропускает повторную распаковку одинакового содержимого.
+
+    Хеш входного файла считается во время обычной распаковки. Отдельное чтение
+    нужно только если в кеше уже есть запись с таким же размером входного файла.
+    Остальные параметры `unpack` передаются во вложенный сервис; `digest` вызывающего
+    кода при попадании в кеш заполняется чтением входного файла.
+    """
+
+    def __init__(self, unpack_service: UnpackService, cache: ExtractionCache) -> None:
+        super().__init__()
+        self._unpack_service = unpack_service
+        self.cache = cache
+
+    def unpack(
+        self,
+        input_file: str,
+        output_dir: str,
+        progress: Optional[ProgressCallback] = None,
+        digest: Any = None,
+        timings: Optional[UnpackTimings] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> SupplyManifest:
+        if cancel is not None and cancel.is_set():
+            raise UnpackError(UnpackErrorCode.CANCELLED)
+        try:
+            stat_result: Optional[os.stat_result] = os.stat(input_file)
+        except FileNotFoundError as exc:
+            raise UnpackError(UnpackErrorCode.FILE_NOT_FOUND) from exc
+        except PermissionError as exc:
+            raise UnpackError(UnpackErrorCode.PERMISSION) from exc
+        except OSError:
+            stat_result = None
+
+        if stat_result is not None:
+            try:
+                manifest = self._unpack_from_cache(input_file, stat_result, output_dir, digest)
+            except OSError:
+                manifest = None  # недоступный или повреждённый кеш — обычный промах
+            if manifest is not None:
+                if metrics is not None:
+                    metrics.increment(MetricNames.CACHE_HITS)
+                if progress is not None:
+                    total = len(manifest.included_files)
+                    progress(UnpackProgress(total, total, manifest.total_size, manifest.total_size))
+                return manifest
+
+        file_digest = new_digest()
+        manifest = self._unpack_service.unpack(
+            input_file,
+            output_dir,
+            progress=progress,
+            digest=file_digest if digest is None else _TeeDigest(file_digest, digest),
+            timings=timings,
+            metrics=metrics,
+            cancel=cancel,
+        )
+        if stat_result is not None:
+            try:
+                self.cache.record(file_digest.hexdigest(), input_file, stat_result, output_dir, manifest.to_dict())
+            except OSError:
+                pass
+        return manifest
+
+    def _unpack_from_cache(
+        self, input_file: str, stat_result: os.stat_result, output_dir: str, digest: Any
+    ) -> Optional[SupplyManifest]:
+        content_hash = self.cache.known_hash(input_file, stat_result)
+        if content_hash is None and self.cache.has_input_size(stat_result.st_size):
+            content_hash = hash_file(input_file)
+            self.cache.remember_hash(input_file, stat_result, content_hash)
+        if content_hash is None:
+            return None
+        entry = self.cache.lookup(content_hash)
+        if entry is None or not self.cache.materialize(entry, output_dir):
+            return None
+        if digest is not None:
+            _update_digest(digest, input_file)
+        return SupplyManifest.from_dict(entry.manifest)
+
+    def probe(self, input_file: str) -> SupplyManifest:
+        return self._unpack_service.probe(input_file)
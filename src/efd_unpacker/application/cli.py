@@ -4,17 +4,68 @@ CLI приложение, использующее доменные сервис
 
 from __future__ import annotations
 
+import json
+import logging
+import os
+import signal
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from ..constants import CLICommands
-from ..domain.errors import FileValidationError, UnpackError
+from ..constants import CLICommands, FileExtensions
+from ..domain.errors import DomainError, FileValidationCode, FileValidationError, PackError, UnpackError
 from ..domain.file_validator import FileValidator
-from ..domain.unpack_service import UnpackService
+from ..domain.supply_diff import (
+    CHANGE_ADDED,
+    CHANGE_CHANGED,
+    CHANGE_REMOVED,
+    DEFAULT_VERIFY_WORKERS,
+    SupplyDiff,
+    diff_supplies,
+    verify_against_directory,
+)
+from ..domain.supply_stream import SupplyManifest
+from ..domain.supply_verify import VerifyReport, verify_supply
+from ..domain.supply_writer import (
+    DEFAULT_LEVEL,
+    DEFAULT_PACK_LANG,
+    DEFAULT_PACK_WORKERS,
+    SupplyFilter,
+    pack_directory,
+    repack_supply,
+)
+from ..domain.unpack_service import UnpackService, UnpackTimings
+from ..infrastructure.dir_watcher import DEFAULT_POLL_INTERVAL, create_directory_watcher
+from ..infrastructure.extraction_cache import ExtractionCache
+from ..infrastructure.metrics import (
+    DEFAULT_REPORT_INTERVAL,
+    LoggingSink,
+    MetricsRegistry,
+    MetricsReporter,
+    create_metrics_sink,
+)
+from ..infrastructure.os_utils import get_1c_configuration_location_preferred
+from ..infrastructure.profiling import MODE_CPROFILE, PROFILE_MODES, ProfileReport, UnpackProfiler
 from ..localization.translator import Translator
 from ..runtime import detect_system_language
-from .messages import format_unpack_result, format_validation_error
+from .cached_unpack import CachedUnpackService
+from .messages import (
+    format_cli_message,
+    format_domain_error,
+    format_supply_info,
+    format_unpack_result,
+)
+from .profiled_unpack import ProfilingUnpackService
+from .watch_service import WatchService
+from .worker_service import (
+    DEFAULT_WORKERS,
+    ServiceAlreadyRunningError,
+    ServiceClient,
+    ServiceUnavailableError,
+    WorkerService,
+)
 
 
 @dataclass
@@ -34,11 +85,31 @@ class CLIApplication:
         unpack_service: UnpackService,
         translator: Translator,
         output = print,
+        service_client: Optional[ServiceClient] = None,
+        cache: Optional[ExtractionCache] = None,
+        profiler: Optional[UnpackProfiler] = None,
     ) -> None:
         self._validator = validator
         self._unpack_service = unpack_service
         self._translator = translator
         self._output = output
+        self._service_client = service_client
+        self._cache = cache
+        self._profiler = profiler
+        self._profile_report: Optional[ProfileReport] = None
+        self._watch_failures = 0
+        self._handlers: Dict[str, Callable[[List[str]], CLIResult]] = {
+            CLICommands.UNPACK: self._run_unpack,
+            CLICommands.INFO: self._run_info,
+            CLICommands.SERVE: self._run_serve,
+            CLICommands.WATCH: self._run_watch,
+            CLICommands.CACHE: self._run_cache,
+            CLICommands.PACK: self._run_pack,
+            CLICommands.REPACK: self._run_repack,
+            CLICommands.DIFF: self._run_diff,
+            CLICommands.VERIFY_AGAINST: self._run_verify_against,
+            CLICommands.VERIFY: self._run_verify,
+        }
 
     def run(self, argv: Sequence[str]) -> CLIResult:
         """Обрабатывает аргументы. Возвращает CLIResult, но не завершает процесс."""
@@ -46,29 +117,526 @@ class CLIApplication:
         if not parsed:
             return CLIResult(exit_code=0, handled=False)
 
-        input_path, output_dir = parsed
+        command, args = parsed
         try:
+            return self._handlers[command](args)
+        except (FileValidationError, UnpackError, PackError) as exc:
+            self._output(f"[ERROR] {format_domain_error(self._translator, exc)}")
+            return CLIResult(exit_code=1, handled=True)
+
+    def _run_unpack(self, args: List[str]) -> CLIResult:
+        input_path, output_dir = args[0], args[2]
+        options = args[3:]
+        use_cache = not _take_flag(options, CLICommands.NO_CACHE_FLAG)
+        output_format = _take_option(options, CLICommands.FORMAT_FLAG) or CLICommands.FORMAT_TEXT
+        profile_mode = _take_option(options, CLICommands.PROFILE_FLAG)
+        profile_memory = _take_flag(options, CLICommands.PROFILE_MEMORY_FLAG)
+        profile_dir = _take_option(options, CLICommands.PROFILE_DIR_FLAG)
+        if output_format not in (CLICommands.FORMAT_TEXT, CLICommands.FORMAT_JSON):
+            return self._usage_error()
+        if profile_mode is not None and profile_mode not in PROFILE_MODES:
+            return self._usage_error()
+        if profile_dir == "":
+            return self._usage_error()
+        try:
+            reporter = _take_metrics_reporter(options)
+        except ValueError:
+            return self._usage_error()
+
+        profiler = self._profiler
+        if profile_mode is not None or profile_memory or profile_dir is not None:
+            profiler = UnpackProfiler(
+                profile_mode or MODE_CPROFILE, trace_memory=profile_memory, profile_dir=profile_dir
+            )
+        metrics = reporter.registry if reporter is not None else None
+        try:
+            if output_format == CLICommands.FORMAT_JSON:
+                return self._run_unpack_json(input_path, output_dir, use_cache, profiler, metrics)
+
             normalized_input = self._validator.validate_input_file(input_path)
             normalized_output = self._validator.prepare_output_directory(output_dir)
-            self._unpack_service.unpack(normalized_input, normalized_output)
-        except FileValidationError as exc:
-            message = format_validation_error(self._translator, exc)
-            self._output(f"[ERROR] {message}")
-            return CLIResult(exit_code=1, handled=True)
-        except UnpackError as exc:
-            message = format_unpack_result(self._translator, success=False, error=exc)
-            self._output(f"[ERROR] {message}")
-            return CLIResult(exit_code=1, handled=True)
+            self._unpack(normalized_input, normalized_output, use_cache, profiler=profiler, metrics=metrics)
+        finally:
+            if reporter is not None:
+                reporter.stop()
 
         success_text = format_unpack_result(self._translator, success=True)
         self._output(f"[OK] {success_text}")
+        self._report_profile()
+        return CLIResult(exit_code=0, handled=True)
+
+    def _report_profile(self) -> None:
+        report = self._profile_report
+        if report is None:
+            return
+        for path in report.paths:
+            self._output(f"[OK] {format_cli_message(self._translator, 'Profile written to %1', path)}")
+        if report.peak_memory is not None:
+            self._output(format_cli_message(self._translator, "Peak memory: %1 bytes", report.peak_memory))
+
+    def _run_unpack_json(
+        self,
+        input_path: str,
+        output_dir: str,
+        use_cache: bool,
+        profiler: Optional[UnpackProfiler] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> CLIResult:
+        """Распаковка с выводом одной JSON-строки вместо локализованных сообщений."""
+        timings = UnpackTimings()
+        result: Dict[str, Any] = {
+            "ok": False,
+            "input": input_path,
+            "input_size": None,
+            "output": output_dir,
+            "files": 0,
+            "bytes": 0,
+            "error": None,
+        }
+        started = time.perf_counter()
+        try:
+            try:
+                normalized_input = self._validator.validate_input_file(input_path)
+                normalized_output = self._validator.prepare_output_directory(output_dir)
+                result["input_size"] = os.path.getsize(normalized_input)
+            finally:
+                timings.validate = time.perf_counter() - started
+            result.update(input=normalized_input, output=normalized_output)
+            manifest = self._unpack(normalized_input, normalized_output, use_cache, timings, profiler, metrics)
+            result.update(ok=True, files=len(manifest.included_files), bytes=manifest.total_size)
+        except (FileValidationError, UnpackError) as exc:
+            result["error"] = {"code": exc.code.value, "message": format_domain_error(self._translator, exc)}
+        except OSError as exc:
+            result["error"] = {"code": FileValidationCode.SIZE_UNAVAILABLE.value, "message": str(exc)}
+        result["timings"] = timings.to_dict()
+        result["elapsed"] = time.perf_counter() - started
+        if self._profile_report is not None:
+            result["profile"] = {"paths": self._profile_report.paths, "peak_memory": self._profile_report.peak_memory}
+        self._output(json.dumps(result, ensure_ascii=False))
+        return CLIResult(exit_code=0 if result["ok"] else 1, handled=True)
+
+    def _run_info(self, args: List[str]) -> CLIResult:
+        if len(args) != 1:
+            return self._usage_error()
+        normalized_input = self._validator.validate_input_file(args[0])
+        manifest = self._probe(normalized_input)
+        self._output(f"[OK] {normalized_input}")
+        preferred_lang = getattr(self._translator, "lang", None)
+        for line in format_supply_info(self._translator, manifest, preferred_lang):
+            self._output(line)
+        return CLIResult(exit_code=0, handled=True)
+
+    def _run_serve(self, args: List[str]) -> CLIResult:
+        workers = _take_number(args, CLICommands.WORKERS_FLAG, DEFAULT_WORKERS)
+        try:
+            reporter = _take_metrics_reporter(args)
+        except ValueError:
+            return self._usage_error()
+        if args or workers is None:
+            return self._usage_error()
+
+        service = WorkerService(
+            self._validator,
+            self._effective_unpack_service(),
+            workers=int(workers),
+            metrics=reporter.registry if reporter is not None else None,
+        )
+        try:
+            endpoint = service.start()
+        except ServiceAlreadyRunningError:
+            self._output(f"[ERROR] {format_cli_message(self._translator, 'Service is already running')}")
+            return CLIResult(exit_code=1, handled=True)
+
+        self._output(f"[OK] {format_cli_message(self._translator, 'Service is listening on %1', endpoint.address)}")
+        previous_handler = _install_sigterm_handler()
+        if reporter is not None:
+            reporter.start()
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.shutdown()
+            _restore_sigterm_handler(previous_handler)
+            if reporter is not None:
+                reporter.stop()
+        self._output(f"[OK] {format_cli_message(self._translator, 'Service stopped')}")
+        return CLIResult(exit_code=0, handled=True)
+
+    def _run_watch(self, args: List[str]) -> CLIResult:
+        output_dir = _take_option(args, CLICommands.OUTPUT_FLAG)
+        done_dir = _take_option(args, CLICommands.DONE_FLAG)
+        failed_dir = _take_option(args, CLICommands.FAILED_FLAG)
+        workers = _take_number(args, CLICommands.WORKERS_FLAG, DEFAULT_WORKERS)
+        interval = _take_number(args, CLICommands.INTERVAL_FLAG, DEFAULT_POLL_INTERVAL)
+        once = _take_flag(args, CLICommands.ONCE_FLAG)
+        try:
+            reporter = _take_metrics_reporter(args)
+        except ValueError:
+            return self._usage_error()
+        if len(args) != 1 or workers is None or interval is None or "" in (output_dir, done_dir, failed_dir):
+            return self._usage_error()
+
+        inbox_dir = self._validator.validate_inbox_directory(args[0])
+        normalized_output = self._validator.prepare_output_directory(
+            output_dir or get_1c_configuration_location_preferred()
+        )
+        watch_service = WatchService(
+            self._validator,
+            self._effective_unpack_service(),
+            inbox_dir,
+            normalized_output,
+            workers=int(workers),
+            done_dir=done_dir and self._validator.normalize_path(done_dir),
+            failed_dir=failed_dir and self._validator.normalize_path(failed_dir),
+            on_result=self._report_watch_result,
+            metrics=reporter.registry if reporter is not None else None,
+        )
+
+        if once:
+            self._watch_failures = 0
+            try:
+                watch_service.run_once()
+            finally:
+                if reporter is not None:
+                    reporter.stop()
+            return CLIResult(exit_code=1 if self._watch_failures else 0, handled=True)
+
+        self._output(f"[OK] {format_cli_message(self._translator, 'Watching %1, unpacking to %2', inbox_dir, normalized_output)}")
+        watcher = create_directory_watcher(inbox_dir, FileExtensions.EFD, interval=interval)
+        previous_handler = _install_sigterm_handler()
+        if reporter is not None:
+            reporter.start()
+        try:
+            watch_service.run(watcher)
+        except KeyboardInterrupt:
+            watch_service.stop()
+        finally:
+            _restore_sigterm_handler(previous_handler)
+            if reporter is not None:
+                reporter.stop()
+        self._output(f"[OK] {format_cli_message(self._translator, 'Watch stopped')}")
+        return CLIResult(exit_code=0, handled=True)
+
+    def _report_watch_result(self, path: str, error: Optional[DomainError]) -> None:
+        if error is None:
+            self._output(f"[OK] {format_cli_message(self._translator, 'Processed %1', path)}")
+        else:
+            self._watch_failures += 1
+            self._output(f"[ERROR] {path}: {format_domain_error(self._translator, error)}")
+
+    def _run_cache(self, args: List[str]) -> CLIResult:
+        if len(args) != 1 or args[0] not in (CLICommands.CACHE_STATS, CLICommands.CACHE_PURGE):
+            return self._usage_error()
+        cache = self._cache or ExtractionCache.from_environment()
+        if cache is None and args[0] == CLICommands.CACHE_PURGE:
+            # Выключенный кеш мог остаться от запусков, когда он был включён.
+            cache = ExtractionCache.default()
+        if cache is None:
+            self._output(f"[OK] {format_cli_message(self._translator, 'Cache is disabled')}")
+            return CLIResult(exit_code=0, handled=True)
+
+        if args[0] == CLICommands.CACHE_PURGE:
+            removed = cache.purge()
+            self._output(f"[OK] {format_cli_message(self._translator, 'Cache entries removed: %1', removed)}")
+            return CLIResult(exit_code=0, handled=True)
+
+        stats = cache.stats()
+        self._output(f"[OK] {stats.root}")
+        self._output(format_cli_message(self._translator, "Entries: %1", stats.entries))
+        self._output(format_cli_message(self._translator, "Cached trees: %1", stats.trees))
+        self._output(
+            format_cli_message(self._translator, "Disk usage: %1 of %2 bytes", stats.tree_bytes, stats.budget_bytes)
+        )
+        return CLIResult(exit_code=0, handled=True)
+
+    def _run_pack(self, args: List[str]) -> CLIResult:
+        name = _take_option(args, CLICommands.NAME_FLAG)
+        provider = _take_option(args, CLICommands.PROVIDER_FLAG) or ""
+        lang = _take_option(args, CLICommands.LANG_FLAG) or DEFAULT_PACK_LANG
+        level = _take_level(args)
+        workers = _take_number(args, CLICommands.WORKERS_FLAG, DEFAULT_PACK_WORKERS)
+        if len(args) != 2 or level is None or workers is None or name == "":
+            return self._usage_error()
+
+        source_dir = self._validator.validate_input_directory(args[0])
+        output_file = self._validator.normalize_path(args[1])
+        self._validator.prepare_output_directory(os.path.dirname(output_file))
+        description = {lang: (name or os.path.basename(source_dir), provider, "")}
+        manifest = pack_directory(source_dir, output_file, description, level=level, workers=int(workers))
+        message = format_cli_message(
+            self._translator,
+            "Packed %1 files (%2 bytes) into %3",
+            len(manifest.included_files),
+            manifest.total_size,
+            output_file,
+        )
+        self._output(f"[OK] {message}")
+        return CLIResult(exit_code=0, handled=True)
+
+    def _run_repack(self, args: List[str]) -> CLIResult:
+        supply_filter = SupplyFilter(
+            languages=tuple(_take_all_options(args, CLICommands.LANG_FLAG)),
+            include=tuple(_take_all_options(args, CLICommands.INCLUDE_FLAG)),
+            exclude=tuple(_take_all_options(args, CLICommands.EXCLUDE_FLAG)),
+        )
+        level = _take_level(args)
+        workers = _take_number(args, CLICommands.WORKERS_FLAG, DEFAULT_PACK_WORKERS)
+        if len(args) != 2 or level is None or workers is None:
+            return self._usage_error()
+
+        input_file = self._validator.validate_input_file(args[0])
+        output_file = self._validator.normalize_path(args[1])
+        self._validator.prepare_output_directory(os.path.dirname(output_file))
+        original, filtered = repack_supply(input_file, output_file, supply_filter, level=level, workers=int(workers))
+        message = format_cli_message(
+            self._translator,
+            "Repacked %1 of %2 files (%3 bytes) into %4",
+            len(filtered.included_files),
+            len(original.included_files),
+            filtered.total_size,
+            output_file,
+        )
+        self._output(f"[OK] {message}")
         return CLIResult(exit_code=0, handled=True)
 
-    @staticmethod
-    def _parse_arguments(argv: Sequence[str]) -> Optional[Tuple[str, str]]:
-        if len(argv) >= 5 and argv[1] == CLICommands.UNPACK and argv[3] == CLICommands.OUTPUT_FLAG:
-            return argv[2], argv[4]
+    def _run_diff(self, args: List[str]) -> CLIResult:
+        quick = _take_flag(args, CLICommands.QUICK_FLAG)
+        output_format = _take_option(args, CLICommands.FORMAT_FLAG) or CLICommands.FORMAT_TEXT
+        if len(args) != 2 or output_format not in (CLICommands.FORMAT_TEXT, CLICommands.FORMAT_JSON):
+            return self._usage_error()
+
+        old_file = self._validator.validate_input_file(args[0])
+        new_file = self._validator.validate_input_file(args[1])
+        diff = diff_supplies(old_file, new_file, stop_on_first=quick)
+        if output_format == CLICommands.FORMAT_JSON:
+            self._output(json.dumps({"old": old_file, "new": new_file, **diff.to_dict()}, ensure_ascii=False))
+        else:
+            self._report_diff(diff)
+        return CLIResult(exit_code=0 if diff.identical else 1, handled=True)
+
+    def _report_diff(self, diff: SupplyDiff) -> None:
+        markers = {CHANGE_ADDED: "+", CHANGE_REMOVED: "-", CHANGE_CHANGED: "~"}
+        for change in diff.changes:
+            sizes = " -> ".join(str(size) for size in (change.old_size, change.new_size) if size is not None)
+            self._output(f"{markers[change.kind]} {change.path} ({sizes})")
+        if diff.identical:
+            self._output(f"[OK] {format_cli_message(self._translator, 'Files are identical')}")
+            return
+        summary = format_cli_message(
+            self._translator,
+            "Added: %1, removed: %2, changed: %3",
+            len(diff.of_kind(CHANGE_ADDED)),
+            len(diff.of_kind(CHANGE_REMOVED)),
+            len(diff.of_kind(CHANGE_CHANGED)),
+        )
+        if not diff.complete:
+            summary = f"{summary} {format_cli_message(self._translator, '(stopped at first difference)')}"
+        self._output(summary)
+
+    def _run_verify(self, args: List[str]) -> CLIResult:
+        workers = _take_number(args, CLICommands.WORKERS_FLAG, DEFAULT_WORKERS)
+        output_format = _take_option(args, CLICommands.FORMAT_FLAG) or CLICommands.FORMAT_TEXT
+        if not args or workers is None or output_format not in (CLICommands.FORMAT_TEXT, CLICommands.FORMAT_JSON):
+            return self._usage_error()
+
+        input_files = []
+        for result in self._validator.validate_many(args):
+            if result.error is not None:
+                raise result.error
+            input_files.append(result.normalized)
+        with ThreadPoolExecutor(max_workers=min(int(workers), len(input_files))) as executor:
+            reports = list(executor.map(verify_supply, input_files))
+        for report in reports:
+            if output_format == CLICommands.FORMAT_JSON:
+                self._output(json.dumps(report.to_dict(), ensure_ascii=False))
+            else:
+                self._report_verify(report)
+        return CLIResult(exit_code=0 if all(report.ok for report in reports) else 1, handled=True)
+
+    def _report_verify(self, report: VerifyReport) -> None:
+        for issue in report.issues:
+            self._output(f"[ERROR] {report.input_file}: {issue.describe()}")
+        if not report.ok:
+            self._output(
+                f"[ERROR] {format_cli_message(self._translator, '%1: problems found: %2', report.input_file, len(report.issues))}"
+            )
+            return
+        message = format_cli_message(
+            self._translator,
+            "%1: %2 files, %3 bytes, %4 MB/s",
+            report.input_file,
+            report.files,
+            report.payload_bytes,
+            f"{report.mb_per_s:.1f}",
+        )
+        self._output(f"[OK] {message}")
+
+    def _run_verify_against(self, args: List[str]) -> CLIResult:
+        check_hash = _take_flag(args, CLICommands.HASH_FLAG)
+        workers = _take_number(args, CLICommands.WORKERS_FLAG, DEFAULT_VERIFY_WORKERS)
+        output_format = _take_option(args, CLICommands.FORMAT_FLAG) or CLICommands.FORMAT_TEXT
+        if len(args) != 2 or workers is None or output_format not in (CLICommands.FORMAT_TEXT, CLICommands.FORMAT_JSON):
+            return self._usage_error()
+
+        input_file = self._validator.validate_input_file(args[0])
+        directory = self._validator.validate_input_directory(args[1])
+        result = verify_against_directory(input_file, directory, check_hash=check_hash, workers=int(workers))
+        if output_format == CLICommands.FORMAT_JSON:
+            self._output(json.dumps({"input": input_file, "directory": directory, **result.to_dict()}, ensure_ascii=False))
+            return CLIResult(exit_code=0 if result.matches else 1, handled=True)
+
+        for item in result.drift:
+            details = f" ({item.expected} -> {item.actual})" if item.expected is not None else ""
+            self._output(f"{item.kind} {item.path}{details}")
+        if result.matches:
+            self._output(f"[OK] {format_cli_message(self._translator, 'Directory matches EFD (%1 files)', result.checked)}")
+            return CLIResult(exit_code=0, handled=True)
+        self._output(
+            format_cli_message(self._translator, "Checked %1 files, drifted: %2", result.checked, len(result.drift))
+        )
+        return CLIResult(exit_code=1, handled=True)
+
+    def _effective_unpack_service(self, use_cache: bool = True) -> UnpackService:
+        if use_cache and self._cache is not None:
+            return CachedUnpackService(self._unpack_service, self._cache)
+        return self._unpack_service
+
+    def _unpack(
+        self,
+        input_file: str,
+        output_dir: str,
+        use_cache: bool = True,
+        timings: Optional[UnpackTimings] = None,
+        profiler: Optional[UnpackProfiler] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> SupplyManifest:
+        options: Dict[str, Any] = {} if timings is None else {"timings": timings}
+        if metrics is not None:
+            options["metrics"] = metrics
+        if profiler is not None:
+            # Профилируется реальная распаковка в этом процессе: без сервиса и кеша.
+            service = ProfilingUnpackService(self._effective_unpack_service(use_cache=False), profiler)
+            try:
+                return service.unpack(input_file, output_dir, **options)
+            finally:
+                self._profile_report = service.last_report
+        if self._service_client is not None and use_cache and metrics is None:
+            try:
+                return self._service_client.unpack(input_file, output_dir, **options)
+            except ServiceUnavailableError:
+                pass
+        return self._effective_unpack_service(use_cache).unpack(input_file, output_dir, **options)
+
+    def _probe(self, input_file: str) -> SupplyManifest:
+        if self._service_client is not None:
+            try:
+                return self._service_client.probe(input_file)
+            except ServiceUnavailableError:
+                pass
+        return self._unpack_service.probe(input_file)
+
+    def _usage_error(self) -> CLIResult:
+        self._output(f"[ERROR] {format_cli_message(self._translator, 'Invalid arguments. Use --help for usage')}")
+        return CLIResult(exit_code=1, handled=True)
+
+    def _parse_arguments(self, argv: Sequence[str]) -> Optional[Tuple[str, List[str]]]:
+        if len(argv) < 2 or argv[1] not in self._handlers:
+            return None
+        command = argv[1]
+        if command == CLICommands.UNPACK and not (len(argv) >= 5 and argv[3] == CLICommands.OUTPUT_FLAG):
+            return None
+        return command, list(argv[2:])
+
+
+def _take_option(args: List[str], flag: str) -> Optional[str]:
+    """Извлекает `flag value` из списка аргументов. Возвращает значение или None."""
+    if flag not in args:
         return None
+    index = args.index(flag)
+    if index + 1 >= len(args):
+        del args[index]
+        return ""
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
+
+def _take_flag(args: List[str], flag: str) -> bool:
+    """Извлекает булев флаг из списка аргументов."""
+    if flag not in args:
+        return False
+    args.remove(flag)
+    return True
+
+
+def _take_number(args: List[str], flag: str, default: float) -> Optional[float]:
+    """Извлекает положительное число после `flag`. None — значение некорректно."""
+    value = _take_option(args, flag)
+    if value is None:
+        return default
+    try:
+        number = type(default)(value)
+    except ValueError:
+        return None
+    return number if number > 0 else None
+
+
+def _take_level(args: List[str]) -> Optional[int]:
+    """Извлекает уровень сжатия zlib после `--level`: 0 (без сжатия) – 9. None — значение некорректно."""
+    value = _take_option(args, CLICommands.LEVEL_FLAG)
+    if value is None:
+        return DEFAULT_LEVEL
+    try:
+        level = int(value)
+    except ValueError:
+        return None
+    return level if 0 <= level <= 9 else None
+
+
+def _take_all_options(args: List[str], flag: str) -> List[str]:
+    """Извлекает все значения повторяющейся опции."""
+    values = []
+    while True:
+        value = _take_option(args, flag)
+        if value is None:
+            return values
+        values.append(value)
+
+
+def _take_metrics_reporter(args: List[str]) -> Optional[MetricsReporter]:
+    """
+    Создаёт MetricsReporter по опциям `--metrics` и `--metrics-interval`.
+
+    Возвращает None, если метрики не запрошены; поднимает ValueError для некорректных опций.
+    """
+    specs = _take_all_options(args, CLICommands.METRICS_FLAG)
+    interval = _take_number(args, CLICommands.METRICS_INTERVAL_FLAG, DEFAULT_REPORT_INTERVAL)
+    if interval is None:
+        raise ValueError(CLICommands.METRICS_INTERVAL_FLAG)
+    if not specs:
+        return None
+    sinks = [create_metrics_sink(spec) for spec in specs]
+    if any(isinstance(sink, LoggingSink) for sink in sinks):
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    return MetricsReporter(MetricsRegistry(), sinks, interval)
+
+
+def _raise_keyboard_interrupt(_signum, _frame) -> None:
+    raise KeyboardInterrupt
+
+
+def _install_sigterm_handler():
+    try:
+        return signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    except ValueError:  # pragma: no cover - вызов не из главного потока
+        return None
+
+
+def _restore_sigterm_handler(previous_handler) -> None:
+    if previous_handler is not None:
+        signal.signal(signal.SIGTERM, previous_handler)
+
 
 def run_cli(argv: Optional[Sequence[str]] = None) -> CLIResult:
     """Хелпер для использования без ручного создания зависимостей."""
@@ -76,5 +644,8 @@ def run_cli(argv: Optional[Sequence[str]] = None) -> CLIResult:
         validator=FileValidator(),
         unpack_service=UnpackService(),
         translator=Translator(lang=detect_system_language()),
+        service_client=ServiceClient.from_environment(),
+        cache=ExtractionCache.from_environment(),
+        profiler=UnpackProfiler.from_environment(),
     )
     return cli_app.run(argv or sys.argv)
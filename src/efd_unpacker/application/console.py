@@ -0,0 +1,117 @@
+"""
+Консольная точка входа: справка и CLI-команды обрабатываются без импорта PyQt5.
+
+GUI (и вместе с ним Qt) загружается только если аргументы не являются CLI-командой.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import urllib.parse
+from typing import Optional, Sequence
+
+from ..constants import URLSchemes
+from ..domain.file_validator import FileValidator
+from ..domain.unpack_service import UnpackService
+from ..infrastructure.extraction_cache import ExtractionCache
+from ..infrastructure.profiling import UnpackProfiler
+from ..localization.translator import Translator, create_translator
+from ..runtime import detect_system_language, install_cli_launcher
+from .cli import CLIApplication
+from .single_instance import forward_to_running_instance, single_instance_enabled
+from .worker_service import ServiceClient
+
+HELP_FLAGS = ("--help", "-h")
+
+
+def format_help_text(translator) -> str:
+    """Return localized CLI help while preserving literal command syntax."""
+    lines = [
+        translator.translate("CLIHelp", "EFD Unpacker - cross-platform EFD file unpacker"),
+        "",
+        translator.translate("CLIHelp", "CLI modes:"),
+        f"  {translator.translate('CLIHelp', '1. GUI mode: open the window and preselect the input file')}",
+        f"  {translator.translate('CLIHelp', '2. Headless mode: unpack directly in the console')}",
+        f"  {translator.translate('CLIHelp', '3. Service mode: keep a warm worker process for fast repeated unpacks')}",
+        "",
+        translator.translate("CLIHelp", "Usage:"),
+        "  efd_unpacker [--help|-h]",
+        "  efd_unpacker <input_file.efd>",
+        "  efd_unpacker unpack <input_file.efd> -tmplts <output_dir> [--no-cache] [--output text|json] [--profile cprofile|sample] [--profile-memory] [--profile-dir <dir>] [--metrics <sink>]",
+        "  efd_unpacker info <input_file.efd>",
+        "  efd_unpacker serve [--workers N] [--metrics <sink>] [--metrics-interval SEC]",
+        "  efd_unpacker cache stats|purge",
+        "  efd_unpacker pack <source_dir> <output_file.efd> [--name NAME] [--provider NAME] [--lang ru] [--level 1-9] [--workers N]",
+        "  efd_unpacker repack <input_file.efd> <output_file.efd> [--lang L]... [--include PATTERN]... [--exclude PATTERN]... [--level 1-9] [--workers N]",
+        "  efd_unpacker diff <old_file.efd> <new_file.efd> [--quick] [--output text|json]",
+        "  efd_unpacker verify <input_file.efd>... [--workers N] [--output text|json]",
+        "  efd_unpacker verify-against <input_file.efd> <dir> [--hash] [--workers N] [--output text|json]",
+        "  efd_unpacker watch <inbox_dir> [-tmplts <output_dir>] [--workers N] [--done <dir>] [--failed <dir>] [--once] [--metrics <sink>] [--metrics-interval SEC]",
+    ]
+    return "\n".join(lines)
+
+
+def resolve_file_argument(file_path: str) -> str:
+    """Путь из аргумента файла: поддерживает URL схемы; файловая система не читается."""
+    if file_path.startswith(URLSchemes.FILE):
+        parsed = urllib.parse.urlparse(file_path)
+        file_path = urllib.parse.unquote(parsed.path)
+        if parsed.netloc and parsed.netloc != "localhost":
+            file_path = f"//{parsed.netloc}{file_path}"
+        if sys.platform.startswith("win") and len(file_path) >= 3 and file_path[0] == "/" and file_path[2] == ":":
+            file_path = file_path[1:]
+    elif file_path.startswith(URLSchemes.EFD):
+        parsed = urllib.parse.urlparse(file_path)
+        file_path = parsed.path.lstrip("/")
+    return file_path
+
+
+def run_console(
+    argv: Sequence[str],
+    translator: Translator,
+    validator: FileValidator,
+    profiler: Optional[UnpackProfiler] = None,
+) -> Optional[int]:
+    """Выполняет справку или CLI-команду. Возвращает код завершения или None, если нужен GUI."""
+    if len(argv) > 1 and argv[1] in HELP_FLAGS:
+        print(format_help_text(translator))
+        return 0
+
+    cli_app = CLIApplication(
+        validator,
+        UnpackService(),
+        translator,
+        service_client=ServiceClient.from_environment(),
+        cache=ExtractionCache.from_environment(),
+        profiler=profiler,
+    )
+    cli_result = cli_app.run(argv)
+    return cli_result.exit_code if cli_result.handled else None
+
+
+def main() -> None:  # pragma: no cover - точка входа процесса
+    translator = create_translator(detect_system_language())
+    validator = FileValidator()
+    profiler = UnpackProfiler.from_environment()
+
+    exit_code = run_console(sys.argv, translator, validator, profiler)
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    # Повторный запуск GUI передаёт файлы уже открытому окну и завершается, не загружая Qt.
+    # Относительные пути разрешаются здесь: у открытого окна другой рабочий каталог.
+    if single_instance_enabled() and forward_to_running_instance(
+        [os.path.abspath(resolve_file_argument(arg)) for arg in sys.argv[1:]]
+    ):
+        return
+
+    # Регистрация launcher в PATH нужна только при запуске приложения, не в скриптах.
+    install_cli_launcher()
+    from .main import run_gui
+
+    run_gui(translator, validator, profiler)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,73 +1,60 @@
 """
-Точка входа приложения: сначала пытаемся обработать CLI, затем запускаем GUI.
+GUI приложения. Консольные команды обрабатывает application.console до импорта Qt.
 """
 
 from __future__ import annotations
 
+import os
 import sys
-import urllib.parse
 from typing import Optional
 
-from PyQt5.QtCore import QEvent, QTimer
+from PyQt5.QtCore import QEvent, Qt, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QApplication
 
-from ..constants import URLSchemes
 from ..domain.errors import FileValidationError
 from ..domain.file_validator import FileValidator
-from ..domain.unpack_service import UnpackService
+from ..domain.unpack_service import UNPACK_MODE_STREAM, UnpackService, create_reader_factory
+from ..infrastructure.profiling import UnpackProfiler
 from ..infrastructure.settings_service import SettingsService
-from ..localization.translator import create_translator
+from ..localization.translator import Translator, create_translator
 from ..presentation.ui import MainWindow
-from ..runtime import detect_system_language, install_cli_launcher
-from .cli import CLIApplication
-from .messages import format_validation_error
+from ..runtime import detect_system_language
+from .console import format_help_text, main, resolve_file_argument
+from .profiled_unpack import ProfilingUnpackService
+from .single_instance import InstanceServer, forward_to_running_instance, single_instance_enabled
+from .worker_service import ServiceAlreadyRunningError
+
+__all__ = [
+    "FileAssociationApp",
+    "format_help_text",
+    "main",
+    "process_file_argument",
+    "resolve_file_argument",
+    "run_gui",
+]
 
 
 def process_file_argument(file_path: str, validator: FileValidator) -> Optional[str]:
     """Обработать аргумент файла, поддерживая URL схемы и относительные пути."""
-    if file_path.startswith(URLSchemes.FILE):
-        parsed = urllib.parse.urlparse(file_path)
-        file_path = urllib.parse.unquote(parsed.path)
-        if parsed.netloc and parsed.netloc != "localhost":
-            file_path = f"//{parsed.netloc}{file_path}"
-        if sys.platform.startswith("win") and len(file_path) >= 3 and file_path[0] == "/" and file_path[2] == ":":
-            file_path = file_path[1:]
-    elif file_path.startswith(URLSchemes.EFD):
-        parsed = urllib.parse.urlparse(file_path)
-        file_path = parsed.path.lstrip("/")
-
     try:
-        return validator.validate_input_file(file_path)
+        return validator.validate_input_file(resolve_file_argument(file_path))
     except FileValidationError:
         return None
 
 
-def format_help_text(translator) -> str:
-    """Return localized CLI help while preserving literal command syntax."""
-    lines = [
-        translator.translate("CLIHelp", "EFD Unpacker - cross-platform EFD file unpacker"),
-        "",
-        translator.translate("CLIHelp", "CLI modes:"),
-        f"  {translator.translate('CLIHelp', '1. GUI mode: open the window and preselect the input file')}",
-        f"  {translator.translate('CLIHelp', '2. Headless mode: unpack directly in the console')}",
-        "",
-        translator.translate("CLIHelp", "Usage:"),
-        "  efd_unpacker [--help|-h]",
-        "  efd_unpacker <input_file.efd>",
-        "  efd_unpacker unpack <input_file.efd> -tmplts <output_dir>",
-    ]
-    return "\n".join(lines)
-
-
 class FileAssociationApp(QApplication):
     """Приложение с поддержкой Apple Events для файловых ассоциаций в macOS."""
 
+    # Файлы от повторных запусков; сигнал испускается из потока InstanceServer.
+    files_forwarded = pyqtSignal(list)
+
     def __init__(self, argv: list[str], validator: FileValidator) -> None:
         super().__init__(argv)
         self.validator = validator
         self.window: Optional[MainWindow] = None
         self.pending_files: list[str] = []
         self.installEventFilter(self)
+        self.files_forwarded.connect(self.open_forwarded_files)
 
         self.file_timer = QTimer()
         self.file_timer.setSingleShot(True)
@@ -79,14 +66,27 @@ class FileAssociationApp(QApplication):
             self.process_pending_files()
 
     def process_file(self, file_path: str) -> bool:
-        processed_path = process_file_argument(file_path, self.validator)
-        if processed_path and self.window:
-            try:
-                self.window.set_input_file(processed_path)
-                return True
-            except Exception:
-                return False
-        return False
+        return self.process_files([file_path]) > 0
+
+    def process_files(self, file_paths: list[str]) -> int:
+        """Передаёт файлы окну; проверка и добавление в очередь идут в фоне. Возвращает число переданных."""
+        if not self.window:
+            return 0
+        try:
+            return self.window.add_input_files([resolve_file_argument(item) for item in file_paths])
+        except Exception:
+            return 0
+
+    def open_forwarded_files(self, file_paths: list[str]) -> None:
+        if not self.window:
+            self.pending_files.extend(file_paths)
+            return
+        self.process_files(file_paths)
+        # Окно открытого экземпляра выходит на передний план, даже если файлов нет.
+        self.window.setWindowState((self.window.windowState() & ~Qt.WindowMinimized) | Qt.WindowActive)
+        self.window.show()
+        self.window.raise_()
+        self.window.activateWindow()
 
     def eventFilter(self, obj, event) -> bool:  # pragma: no cover - Qt binding
         if event.type() == QEvent.Type.FileOpen:
@@ -101,51 +101,56 @@ class FileAssociationApp(QApplication):
 
     def process_pending_files(self) -> None:
         if self.window and self.pending_files:
-            for file_path in self.pending_files:
-                if self.process_file(file_path):
-                    break
+            self.process_files(self.pending_files)
             self.pending_files.clear()
 
 
-def main() -> None:  # pragma: no cover - интеграция с PyQt
-    install_cli_launcher()
-    translator = create_translator(detect_system_language())
-
-    if len(sys.argv) > 1 and sys.argv[1] in ("--help", "-h"):
-        print(format_help_text(translator))
-        sys.exit(0)
-
-    validator = FileValidator()
-
-    cli_app = CLIApplication(validator, UnpackService(), translator)
-    cli_result = cli_app.run(sys.argv)
-    if cli_result.handled:
-        sys.exit(cli_result.exit_code)
+def run_gui(
+    translator: Translator,
+    validator: FileValidator,
+    profiler: Optional[UnpackProfiler] = None,
+) -> None:  # pragma: no cover - интеграция с PyQt
+    # Консоль определяла язык по окружению; GUI дополнительно учитывает системную локаль Qt.
+    lang = detect_system_language(use_qt=True)
+    if lang != getattr(translator, "lang", lang):
+        translator = create_translator(lang)
 
     app = FileAssociationApp(sys.argv, validator)
+    instance: Optional[InstanceServer] = None
+    if single_instance_enabled():
+        instance = InstanceServer(app.files_forwarded.emit)
+        try:
+            instance.start()
+        except ServiceAlreadyRunningError:
+            # Окно открылось одновременно с этим запуском: файлы уходят ему.
+            file_paths = [os.path.abspath(resolve_file_argument(arg)) for arg in sys.argv[1:]]
+            if forward_to_running_instance(file_paths):
+                return
+            instance = None
+        except OSError:
+            instance = None  # без сокета окно работает как раньше, только без передачи файлов
     settings_service = SettingsService(translator)
+    # Потоковый режим пишет файлы по мере разжатия, поэтому прогресс в окне идёт равномерно.
+    unpack_service = UnpackService(create_reader_factory(UNPACK_MODE_STREAM))
+    if profiler is not None:
+        unpack_service = ProfilingUnpackService(unpack_service, profiler)
     window = MainWindow(
         translator=translator,
         settings_service=settings_service,
         file_validator=validator,
-        unpack_service=UnpackService(),
+        unpack_service=unpack_service,
     )
     app.set_window(window)
 
     qt_args = app.arguments()
     if len(qt_args) > 1:
-        for arg in qt_args[1:]:
-            file_path = process_file_argument(arg, validator)
-            if file_path:
-                try:
-                    window.set_input_file(file_path)
-                    break
-                except FileValidationError as exc:
-                    error_message = format_validation_error(translator, exc)
-                    window.show_message(error_message, is_error=True)
+        window.add_input_files([resolve_file_argument(arg) for arg in qt_args[1:]])
 
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    if instance is not None:
+        instance.shutdown()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":  # pragma: no cover
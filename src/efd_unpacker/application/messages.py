@@ -4,7 +4,16 @@
 
 from __future__ import annotations
 
-from ..domain.errors import FileValidationCode, FileValidationError, UnpackError, UnpackErrorCode
+from ..domain.errors import (
+    DomainError,
+    FileValidationCode,
+    FileValidationError,
+    PackError,
+    PackErrorCode,
+    UnpackError,
+    UnpackErrorCode,
+)
+from ..domain.supply_stream import SupplyManifest
 from ..localization.translator import Translator
 
 
@@ -16,6 +25,9 @@ def format_validation_error(translator: Translator, error: FileValidationError)
         FileValidationCode.NOT_READABLE: "No permission to read file",
         FileValidationCode.EMPTY: "File is empty",
         FileValidationCode.SIZE_UNAVAILABLE: "Cannot access file size",
+        FileValidationCode.INPUT_NOT_DIRECTORY: "Directory does not exist",
+        FileValidationCode.INPUT_DIRECTORY_NOT_READABLE: "No permission to read directory",
+        FileValidationCode.INBOX_NOT_WRITABLE: "No permission to move files out of the inbox directory",
         FileValidationCode.OUTPUT_PATH_EMPTY: "Output directory path is empty",
         FileValidationCode.OUTPUT_NOT_DIRECTORY: "Output path exists but is not a directory",
         FileValidationCode.OUTPUT_NOT_WRITABLE: "No permission to write to output directory",
@@ -34,6 +46,10 @@ def format_unpack_result(translator: Translator, success: bool, error: UnpackErr
         key = "File not found"
     elif error.code is UnpackErrorCode.PERMISSION:
         key = "Permission error"
+    elif error.code is UnpackErrorCode.INVALID_FORMAT:
+        key = "Invalid EFD file format"
+    elif error.code is UnpackErrorCode.CANCELLED:
+        key = "Unpacking cancelled"
     else:
         key = "Unexpected error: %1"
 
@@ -41,3 +57,41 @@ def format_unpack_result(translator: Translator, success: bool, error: UnpackErr
     if error.code is UnpackErrorCode.UNEXPECTED and error.details:
         return message.replace("%1", error.details.get("error", ""))
     return message
+
+
+def format_pack_error(translator: Translator, error: PackError) -> str:
+    key = {
+        PackErrorCode.FILE_TOO_LARGE: "File is too large for EFD: %1",
+        PackErrorCode.SOURCE_CHANGED: "File changed while packing: %1",
+    }[error.code]
+    path = (error.details or {}).get("path", "")
+    return translator.translate("PackService", key).replace("%1", path)
+
+
+def format_domain_error(translator: Translator, error: DomainError) -> str:
+    """Сообщение для любой доменной ошибки (валидации, упаковки или распаковки)."""
+    if isinstance(error, FileValidationError):
+        return format_validation_error(translator, error)
+    if isinstance(error, PackError):
+        return format_pack_error(translator, error)
+    return format_unpack_result(translator, success=False, error=error)  # type: ignore[arg-type]
+
+
+def format_cli_message(translator: Translator, key: str, *args: object) -> str:
+    """Переводит сообщение CLI и подставляет аргументы в `%1`, `%2`, ..."""
+    message = translator.translate("CLI", key)
+    for index, value in enumerate(args, start=1):
+        message = message.replace(f"%{index}", str(value))
+    return message
+
+
+def format_supply_info(translator: Translator, manifest: SupplyManifest, preferred_lang: str | None = None) -> list[str]:
+    """Строки описания комплекта поставки для вывода `info`."""
+    languages = sorted(manifest.description, key=lambda lang: (lang != preferred_lang, lang))
+    lines = []
+    for lang in languages:
+        supply_name, provider_name, _ = manifest.description[lang]
+        lines.append(f"  {lang}: {supply_name} ({provider_name})")
+    lines.append(format_cli_message(translator, "Files: %1", len(manifest.included_files)))
+    lines.append(format_cli_message(translator, "Total size: %1 bytes", manifest.total_size))
+    return lines
@@ -0,0 +1,39 @@
+"""
+Распаковка под профилировщиком.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional
+
+from ..domain.supply_stream import SupplyManifest
+from ..domain.unpack_service import UnpackService
+from ..infrastructure.profiling import ProfileReport, UnpackProfiler
+
+
+class ProfilingUnpackService(UnpackService):
+    """
+    UnpackService, который выполняет каждую распаковку под UnpackProfiler.
+
+    Профилируемые вызовы выполняются по одному, чтобы профили и пик памяти
+    не смешивались между потоками.
+    """
+
+    def __init__(self, unpack_service: UnpackService, profiler: UnpackProfiler) -> None:
+        super().__init__()
+        self._unpack_service = unpack_service
+        self.profiler = profiler
+        self.last_report: Optional[ProfileReport] = None
+        self._lock = threading.Lock()
+
+    def unpack(self, input_file: str, output_dir: str, **options: Any) -> SupplyManifest:
+        with self._lock:
+            with self.profiler.profile(input_file, output_dir) as report:
+                try:
+                    return self._unpack_service.unpack(input_file, output_dir, **options)
+                finally:
+                    self.last_report = report
+
+    def probe(self, input_file: str) -> SupplyManifest:
+        return self._unpack_service.probe(input_file)
@@ -0,0 +1,170 @@
+"""
+Единственный экземпляр GUI: повторный запуск передаёт файлы уже открытому окну.
+
+Окно слушает локальный сокет (Unix domain socket или localhost TCP, как у фонового
+сервиса); адрес и токен публикуются в `gui.json` в каталоге данных приложения.
+Протокол — одна JSON-строка `{"token": ..., "files": [...]}` и ответ `{"ok": true}`.
+Модуль не зависит от Qt, чтобы повторный запуск завершался до импорта PyQt5.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import socketserver
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from ..runtime import get_app_data_dir
+from .worker_service import MAX_REQUEST_SIZE, ServiceAlreadyRunningError, ServiceEndpoint
+
+GUI_STATE_FILE = "gui.json"
+GUI_SOCKET_FILE = "gui.sock"
+NEW_INSTANCE_ENV = "EFD_UNPACKER_NEW_INSTANCE"
+FORWARD_TIMEOUT = 2.0
+
+FilesCallback = Callable[[List[str]], None]
+
+
+def get_gui_state_path() -> Path:
+    """Путь к файлу с адресом и токеном открытого окна."""
+    return get_app_data_dir() / GUI_STATE_FILE
+
+
+def single_instance_enabled() -> bool:
+    return not os.environ.get(NEW_INSTANCE_ENV)
+
+
+def forward_to_running_instance(file_paths: List[str], state_path: Optional[Path] = None) -> bool:
+    """
+    Передаёт файлы открытому окну. Пустой список только выводит окно на передний план.
+
+    False — окна нет или оно не ответило: вызывающий код запускает GUI сам.
+    """
+    endpoint = ServiceEndpoint.load(state_path or get_gui_state_path())
+    if endpoint is None:
+        return False
+    try:
+        sock = endpoint.connect()
+    except OSError:
+        return False
+    request = {"token": endpoint.token, "files": list(file_paths)}
+    try:
+        with sock:
+            sock.settimeout(FORWARD_TIMEOUT)
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            reply = sock.makefile("rb").readline(MAX_REQUEST_SIZE)
+        return bool(json.loads(reply).get("ok"))
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+class _FilesHandler(socketserver.StreamRequestHandler):
+    server: "_InstanceServerMixin"
+
+    def handle(self) -> None:  # pragma: no cover - проверяется через forward_to_running_instance
+        line = self.rfile.readline(MAX_REQUEST_SIZE)
+        try:
+            request = json.loads(line)
+            files = request["files"]
+            accepted = (
+                request.get("token") == self.server.instance.token
+                and isinstance(files, list)
+                and all(isinstance(item, str) for item in files)
+            )
+        except (ValueError, KeyError, TypeError):
+            accepted = False
+        if accepted:
+            self.server.instance.on_files(files)
+        try:
+            self.wfile.write(json.dumps({"ok": accepted}).encode("utf-8") + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class _InstanceServerMixin:
+    instance: "InstanceServer"
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixInstanceServer(_InstanceServerMixin, socketserver.ThreadingUnixStreamServer):  # type: ignore[name-defined]
+        pass
+
+else:  # pragma: no cover - Windows
+    _UnixInstanceServer = None  # type: ignore[assignment,misc]
+
+
+class _TCPInstanceServer(_InstanceServerMixin, socketserver.ThreadingTCPServer):
+    pass
+
+
+class InstanceServer:
+    """
+    Принимает файлы от повторных запусков и передаёт их в `on_files`.
+
+    `on_files` вызывается из потока сервера: GUI передаёт сюда `emit` Qt-сигнала,
+    чтобы файлы попали в очередь окна в его потоке.
+    """
+
+    def __init__(self, on_files: FilesCallback, state_path: Optional[Path] = None) -> None:
+        self.on_files = on_files
+        self._state_path = state_path or get_gui_state_path()
+        self._server: Optional[socketserver.BaseServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.token = ""
+        self.endpoint: Optional[ServiceEndpoint] = None
+
+    def start(self) -> ServiceEndpoint:
+        """Открывает сокет в фоновом потоке. Поднимает ServiceAlreadyRunningError, если окно уже открыто."""
+        existing = ServiceEndpoint.load(self._state_path)
+        if existing is not None:
+            try:
+                existing.connect().close()
+            except OSError:
+                pass
+            else:
+                raise ServiceAlreadyRunningError(existing.address)
+
+        self.token = secrets.token_hex(16)
+        if _UnixInstanceServer is not None:
+            socket_path = self._state_path.with_name(GUI_SOCKET_FILE)
+            socket_path.parent.mkdir(parents=True, exist_ok=True)
+            if socket_path.exists():
+                socket_path.unlink()
+            server: socketserver.BaseServer = _UnixInstanceServer(str(socket_path), _FilesHandler)
+            os.chmod(socket_path, 0o600)
+            endpoint = ServiceEndpoint("unix", str(socket_path), self.token)
+        else:  # pragma: no cover - Windows
+            server = _TCPInstanceServer(("127.0.0.1", 0), _FilesHandler)
+            host, port = server.server_address[:2]  # type: ignore[misc]
+            endpoint = ServiceEndpoint("tcp", f"{host}:{port}", self.token)
+
+        server.instance = self  # type: ignore[attr-defined]
+        self._server = server
+        self.endpoint = endpoint
+        self._thread = threading.Thread(target=server.serve_forever, name="efd-gui-instance", daemon=True)
+        self._thread.start()
+        endpoint.save(self._state_path)
+        return endpoint
+
+    def shutdown(self) -> None:
+        """Закрывает сокет и убирает файлы состояния, если они ещё принадлежат этому окну."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        if self.endpoint is not None:
+            current = ServiceEndpoint.load(self._state_path)
+            if current is not None and current.token == self.endpoint.token:
+                self._state_path.unlink(missing_ok=True)
+                if self.endpoint.family == "unix":
+                    Path(self.endpoint.address).unlink(missing_ok=True)
+        self._server = None
+        self._thread = None
+
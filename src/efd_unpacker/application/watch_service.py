@@ -0,0 +1,168 @@
+"""
+Режим наблюдения: распаковка EFD, появляющихся во входящем каталоге.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+from ..constants import FileExtensions
+from ..domain.errors import DomainError, FileValidationError, UnpackError, UnpackErrorCode
+from ..domain.file_validator import FileValidator
+from ..domain.metrics import MetricNames, MetricsRecorder
+from ..domain.unpack_service import UnpackService
+from ..infrastructure.dir_watcher import DEFAULT_SETTLE_TIME, DirectoryWatcher, create_directory_watcher
+
+DONE_DIR_NAME = "done"
+FAILED_DIR_NAME = "failed"
+POLL_TIMEOUT = 1.0
+ONCE_POLL_INTERVAL = 0.2
+
+WatchResultCallback = Callable[[str, Optional[DomainError]], None]
+
+
+class WatchService:
+    """
+    Забирает готовые файлы из входящего каталога и распаковывает их в ограниченном пуле.
+
+    Успешно обработанные файлы переносятся в `done`, неудачные — в `failed`.
+    """
+
+    def __init__(
+        self,
+        validator: FileValidator,
+        unpack_service: UnpackService,
+        inbox_dir: str,
+        output_dir: str,
+        workers: int = 2,
+        done_dir: Optional[str] = None,
+        failed_dir: Optional[str] = None,
+        on_result: Optional[WatchResultCallback] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        settle_time: float = DEFAULT_SETTLE_TIME,
+    ) -> None:
+        self._validator = validator
+        self._unpack_service = unpack_service
+        self.inbox_dir = inbox_dir
+        self.output_dir = output_dir
+        self.workers = max(1, workers)
+        self.done_dir = done_dir or os.path.join(inbox_dir, DONE_DIR_NAME)
+        self.failed_dir = failed_dir or os.path.join(inbox_dir, FAILED_DIR_NAME)
+        self._on_result = on_result
+        self._metrics = metrics
+        self.settle_time = settle_time
+        self._slots = threading.BoundedSemaphore(self.workers * 2)
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self, watcher: Optional[DirectoryWatcher] = None) -> None:
+        """Обрабатывает файлы до вызова stop() (или KeyboardInterrupt)."""
+        watcher = watcher or create_directory_watcher(self.inbox_dir, FileExtensions.EFD)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="efd-watch") as executor:
+                while not self._stop.is_set():
+                    for path in watcher.poll(POLL_TIMEOUT):
+                        self._submit(executor, path)
+        finally:
+            watcher.close()
+
+    def run_once(self) -> int:
+        """
+        Обрабатывает файлы, уже лежащие в каталоге, и возвращает их количество.
+
+        Файл берётся, когда он не менялся `settle_time` секунд: либо его mtime уже
+        старше, либо размер и mtime не изменились за время ожидания (на случай
+        расхождения часов сетевой шары). Так недокопированный файл не распаковывается.
+        """
+        submitted: Set[str] = set()
+        seen: Dict[str, Tuple[int, int, float]] = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="efd-watch") as executor:
+            while True:
+                now = time.monotonic()
+                wall_clock = time.time()
+                waiting = False
+                for path, stat_result in self._scan_inbox():
+                    if path in submitted:
+                        continue
+                    signature = (stat_result.st_size, stat_result.st_mtime_ns)
+                    previous = seen.get(path)
+                    if previous is None or previous[:2] != signature:
+                        previous = seen[path] = (*signature, now)
+                    if wall_clock - stat_result.st_mtime >= self.settle_time or now - previous[2] >= self.settle_time:
+                        submitted.add(path)
+                        self._submit(executor, path)
+                    else:
+                        waiting = True
+                if not waiting:
+                    break
+                time.sleep(min(ONCE_POLL_INTERVAL, self.settle_time))
+        return len(submitted)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _scan_inbox(self) -> Iterator[Tuple[str, os.stat_result]]:
+        with os.scandir(self.inbox_dir) as entries:
+            files = [entry for entry in entries if entry.name.lower().endswith(FileExtensions.EFD)]
+        for entry in sorted(files, key=lambda item: item.path):
+            try:
+                if entry.is_file():
+                    yield entry.path, entry.stat()
+            except OSError:
+                continue  # файл уже убрали из каталога
+
+    def _submit(self, executor: ThreadPoolExecutor, path: str) -> None:
+        with self._lock:
+            if path in self._in_flight:
+                return
+            self._in_flight.add(path)
+        self._slots.acquire()
+        executor.submit(self._process, path, time.monotonic())
+
+    def _process(self, path: str, submitted_at: float) -> None:
+        error: Optional[DomainError] = None
+        options = {}
+        if self._metrics is not None:
+            self._metrics.observe(MetricNames.QUEUE_WAIT_TIME, time.monotonic() - submitted_at)
+            options["metrics"] = self._metrics
+        try:
+            normalized = self._validator.validate_input_file(path)
+            self._unpack_service.unpack(normalized, self.output_dir, **options)
+        except (FileValidationError, UnpackError) as exc:
+            error = exc
+        except Exception as exc:
+            # Неожиданная ошибка — тоже неудача: файл уходит в failed, а не в done, и о нём сообщается.
+            error = UnpackError(UnpackErrorCode.UNEXPECTED, {"error": str(exc)})
+        try:
+            target_dir = self.failed_dir if error else self.done_dir
+            try:
+                self._move(path, target_dir)
+            except OSError as exc:
+                # Файл остаётся во входящем каталоге, и наблюдатель его повторно не отдаст: об этом нужно сообщить.
+                if error is None:
+                    error = UnpackError(UnpackErrorCode.UNEXPECTED, {"error": f"cannot move to {target_dir}: {exc}"})
+        finally:
+            with self._lock:
+                self._in_flight.discard(path)
+            self._slots.release()
+        if self._on_result is not None:
+            self._on_result(path, error)
+
+    @staticmethod
+    def _move(path: str, target_dir: str) -> str:
+        os.makedirs(target_dir, exist_ok=True)
+        name = os.path.basename(path)
+        stem, extension = os.path.splitext(name)
+        target = os.path.join(target_dir, name)
+        counter = 1
+        while os.path.exists(target):
+            target = os.path.join(target_dir, f"{stem}.{counter}{extension}")
+            counter += 1
+        shutil.move(path, target)
+        return target
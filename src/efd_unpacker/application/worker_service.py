@@ -0,0 +1,402 @@
+"""
+Фоновый сервис распаковки: тёплый процесс с пулом воркеров на локальном сокете.
+
+Протокол — JSON lines: клиент отправляет одно задание, сервис отвечает
+событиями `progress` и завершающим событием `result`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ..domain.errors import (
+    DomainError,
+    FileValidationCode,
+    FileValidationError,
+    UnpackError,
+    UnpackErrorCode,
+)
+from ..domain.file_validator import FileValidator
+from ..domain.metrics import MetricNames, MetricsRecorder
+from ..domain.supply_stream import SupplyManifest
+from ..domain.unpack_service import ProgressCallback, UnpackProgress, UnpackService, UnpackTimings
+from ..runtime import get_app_data_dir
+
+SERVICE_STATE_FILE = "service.json"
+SERVICE_SOCKET_FILE = "service.sock"
+NO_SERVICE_ENV = "EFD_UNPACKER_NO_SERVICE"
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+CONNECT_TIMEOUT = 0.5
+PROGRESS_INTERVAL = 0.2
+MAX_REQUEST_SIZE = 64 * 1024
+
+EventCallback = Callable[[Dict[str, Any]], None]
+
+
+class ServiceUnavailableError(Exception):
+    """Сервис не запущен или недоступен — вызывающий код выполняет задачу локально."""
+
+
+class ServiceAlreadyRunningError(Exception):
+    """На том же адресе уже отвечает другой экземпляр сервиса."""
+
+
+def get_service_state_path() -> Path:
+    """Путь к файлу с адресом и токеном запущенного сервиса."""
+    return get_app_data_dir() / SERVICE_STATE_FILE
+
+
+@dataclass
+class ServiceEndpoint:
+    """Адрес сервиса: Unix domain socket или localhost TCP (где AF_UNIX недоступен)."""
+
+    family: str
+    address: str
+    token: str
+
+    def connect(self, timeout: Optional[float] = CONNECT_TIMEOUT) -> socket.socket:
+        if self.family == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)  # type: ignore[attr-defined]
+            target: Any = self.address
+        else:
+            host, port = self.address.rsplit(":", 1)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            target = (host, int(port))
+        sock.settimeout(timeout)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        return sock
+
+    @classmethod
+    def load(cls, state_path: Path) -> Optional["ServiceEndpoint"]:
+        try:
+            data = json.loads(state_path.read_text(encoding="utf-8"))
+            return cls(family=data["family"], address=data["address"], token=data["token"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, state_path: Path) -> None:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = state_path.with_suffix(".tmp")
+        fd = os.open(str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(asdict(self), handle)
+        os.replace(tmp_path, state_path)
+
+
+def error_to_payload(error: DomainError) -> Dict[str, Any]:
+    """Сериализует доменную ошибку для передачи клиенту."""
+    kind = "validation" if isinstance(error, FileValidationError) else "unpack"
+    return {"kind": kind, "code": error.code.value, "details": error.details}
+
+
+def error_from_payload(payload: Dict[str, Any]) -> DomainError:
+    """Восстанавливает доменную ошибку из ответа сервиса."""
+    details = payload.get("details")
+    try:
+        if payload.get("kind") == "validation":
+            return FileValidationError(FileValidationCode(payload["code"]), details)
+        return UnpackError(UnpackErrorCode(payload["code"]), details)
+    except (KeyError, ValueError):
+        return UnpackError(UnpackErrorCode.UNEXPECTED, {"error": str(payload)})
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    server: "_ServiceServerMixin"
+
+    def handle(self) -> None:  # pragma: no cover - проверяется через клиент
+        line = self.rfile.readline(MAX_REQUEST_SIZE)
+        if not line.strip():
+            return
+        try:
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("job must be an object")
+            except ValueError as exc:
+                self._send({"event": "result", "ok": False, "error": {"kind": "protocol", "code": str(exc)}})
+                return
+            self.server.worker_service.dispatch(job, self._send)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send(self, event: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class _ServiceServerMixin:
+    worker_service: "WorkerService"
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixServer(_ServiceServerMixin, socketserver.ThreadingUnixStreamServer):  # type: ignore[name-defined]
+        pass
+
+else:  # pragma: no cover - Windows
+    _UnixServer = None  # type: ignore[assignment,misc]
+
+
+class _TCPServer(_ServiceServerMixin, socketserver.ThreadingTCPServer):
+    pass
+
+
+class WorkerService:
+    """
+    Долгоживущий процесс распаковки.
+
+    Соединения обслуживаются отдельными потоками, а сами задания выполняются
+    в ограниченном пуле, поэтому одновременно распаковывается не больше `workers` файлов.
+    """
+
+    def __init__(
+        self,
+        validator: FileValidator,
+        unpack_service: UnpackService,
+        workers: int = DEFAULT_WORKERS,
+        state_path: Optional[Path] = None,
+        metrics: Optional[MetricsRecorder] = None,
+    ) -> None:
+        self._validator = validator
+        self._unpack_service = unpack_service
+        self._metrics = metrics
+        self.workers = max(1, workers)
+        self._state_path = state_path or get_service_state_path()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[socketserver.BaseServer] = None
+        self._serving = threading.Event()
+        self.endpoint: Optional[ServiceEndpoint] = None
+
+    def start(self) -> ServiceEndpoint:
+        """Открывает сокет и публикует адрес. Поднимает ServiceAlreadyRunningError."""
+        existing = ServiceEndpoint.load(self._state_path)
+        if existing is not None:
+            try:
+                existing.connect().close()
+            except OSError:
+                pass
+            else:
+                raise ServiceAlreadyRunningError(existing.address)
+
+        token = secrets.token_hex(16)
+        if _UnixServer is not None:
+            socket_path = self._state_path.with_name(SERVICE_SOCKET_FILE)
+            socket_path.parent.mkdir(parents=True, exist_ok=True)
+            if socket_path.exists():
+                socket_path.unlink()
+            server: socketserver.BaseServer = _UnixServer(str(socket_path), _JobHandler)
+            os.chmod(socket_path, 0o600)
+            endpoint = ServiceEndpoint("unix", str(socket_path), token)
+        else:  # pragma: no cover - Windows
+            server = _TCPServer(("127.0.0.1", 0), _JobHandler)
+            host, port = server.server_address[:2]  # type: ignore[misc]
+            endpoint = ServiceEndpoint("tcp", f"{host}:{port}", token)
+
+        server.worker_service = self  # type: ignore[attr-defined]
+        self._server = server
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="efd-worker")
+        self.endpoint = endpoint
+        endpoint.save(self._state_path)
+        return endpoint
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.start()
+        assert self._server is not None
+        self._serving.set()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._serving.clear()
+
+    def shutdown(self) -> None:
+        """Останавливает приём заданий, дожидается текущих и убирает файлы состояния."""
+        if self._server is not None:
+            if self._serving.is_set():
+                self._server.shutdown()
+            self._server.server_close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self.endpoint is not None:
+            current = ServiceEndpoint.load(self._state_path)
+            if current is not None and current.token == self.endpoint.token:
+                self._state_path.unlink(missing_ok=True)
+            if self.endpoint.family == "unix":
+                Path(self.endpoint.address).unlink(missing_ok=True)
+        self._server = None
+        self._executor = None
+
+    def dispatch(self, job: Dict[str, Any], emit: EventCallback) -> None:
+        """Выполняет одно задание и отправляет события через `emit`."""
+        if self.endpoint is None or job.get("token") != self.endpoint.token:
+            emit({"event": "result", "ok": False, "error": {"kind": "protocol", "code": "unauthorized"}})
+            return
+
+        op = job.get("op")
+        if op == "ping":
+            emit({"event": "result", "ok": True, "pid": os.getpid(), "workers": self.workers})
+        elif op == "info":
+            self._run_in_pool(lambda _progress: self._info(job), emit)
+        elif op == "unpack":
+            self._run_in_pool(lambda progress: self._unpack(job, progress), emit)
+        else:
+            emit({"event": "result", "ok": False, "error": {"kind": "protocol", "code": f"unknown_op:{op}"}})
+
+    def _run_in_pool(self, task: Callable[[ProgressCallback], Dict[str, Any]], emit: EventCallback) -> None:
+        assert self._executor is not None
+        events: "queue.Queue[Optional[UnpackProgress]]" = queue.Queue()
+        submitted_at = time.monotonic()
+
+        def run() -> Dict[str, Any]:
+            if self._metrics is not None:
+                self._metrics.observe(MetricNames.QUEUE_WAIT_TIME, time.monotonic() - submitted_at)
+            try:
+                return task(events.put)
+            except (FileValidationError, UnpackError) as exc:
+                return {"event": "result", "ok": False, "error": error_to_payload(exc)}
+            except Exception as exc:
+                # Клиент должен получить ответ, а не «сервис закрыл соединение».
+                error = UnpackError(UnpackErrorCode.UNEXPECTED, {"error": str(exc)})
+                return {"event": "result", "ok": False, "error": error_to_payload(error)}
+            finally:
+                events.put(None)
+
+        future = self._executor.submit(run)
+        last_sent = 0.0
+        pending: Optional[UnpackProgress] = None
+        while True:
+            try:
+                item = events.get(timeout=PROGRESS_INTERVAL)
+            except queue.Empty:
+                item = pending
+                pending = None
+                if item is None:
+                    continue
+            else:
+                if item is None:
+                    break
+                if time.monotonic() - last_sent < PROGRESS_INTERVAL:
+                    pending = item
+                    continue
+            emit({"event": "progress", **asdict(item)})
+            last_sent = time.monotonic()
+            pending = None
+        if pending is not None:
+            emit({"event": "progress", **asdict(pending)})
+        emit(future.result())
+
+    def _info(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        input_file = self._validator.validate_input_file(str(job.get("input", "")))
+        manifest = self._unpack_service.probe(input_file)
+        return {"event": "result", "ok": True, "manifest": manifest.to_dict()}
+
+    def _unpack(self, job: Dict[str, Any], progress: ProgressCallback) -> Dict[str, Any]:
+        input_file = self._validator.validate_input_file(str(job.get("input", "")))
+        output_dir = self._validator.prepare_output_directory(str(job.get("output", "")))
+        started = time.monotonic()
+        timings = UnpackTimings()
+        options: Dict[str, Any] = {} if self._metrics is None else {"metrics": self._metrics}
+        manifest = self._unpack_service.unpack(input_file, output_dir, progress=progress, timings=timings, **options)
+        return {
+            "event": "result",
+            "ok": True,
+            "input": input_file,
+            "output": output_dir,
+            "elapsed": time.monotonic() - started,
+            "manifest": manifest.to_dict(),
+            "timings": asdict(timings),
+        }
+
+
+class ServiceClient:
+    """Тонкий клиент: отправляет задания в запущенный WorkerService."""
+
+    def __init__(self, state_path: Optional[Path] = None) -> None:
+        self._state_path = state_path or get_service_state_path()
+
+    @classmethod
+    def from_environment(cls) -> Optional["ServiceClient"]:
+        """Возвращает клиента, если использование сервиса не отключено переменной окружения."""
+        if os.environ.get(NO_SERVICE_ENV):
+            return None
+        return cls()
+
+    def ping(self) -> bool:
+        try:
+            return bool(self._request({"op": "ping"}).get("ok"))
+        except ServiceUnavailableError:
+            return False
+
+    def unpack(
+        self,
+        input_file: str,
+        output_dir: str,
+        progress: Optional[ProgressCallback] = None,
+        timings: Optional[UnpackTimings] = None,
+    ) -> SupplyManifest:
+        """Распаковывает файл в сервисе. Поднимает доменные ошибки или ServiceUnavailableError."""
+
+        def on_event(event: Dict[str, Any]) -> None:
+            if progress is not None and event.get("event") == "progress":
+                progress(UnpackProgress(**{key: event[key] for key in UnpackProgress.__dataclass_fields__}))
+
+        result = self._request({"op": "unpack", "input": input_file, "output": output_dir}, on_event)
+        self._raise_for_result(result)
+        if timings is not None:
+            timings.merge(UnpackTimings.from_dict(result.get("timings") or {}))
+        return SupplyManifest.from_dict(result.get("manifest") or {})
+
+    def probe(self, input_file: str) -> SupplyManifest:
+        result = self._request({"op": "info", "input": input_file})
+        self._raise_for_result(result)
+        return SupplyManifest.from_dict(result["manifest"])
+
+    def _request(self, job: Dict[str, Any], on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
+        endpoint = ServiceEndpoint.load(self._state_path)
+        if endpoint is None:
+            raise ServiceUnavailableError()
+        try:
+            sock = endpoint.connect()
+        except OSError as exc:
+            raise ServiceUnavailableError() from exc
+
+        with sock, sock.makefile("rwb") as stream:
+            try:
+                stream.write(json.dumps({**job, "token": endpoint.token}).encode("utf-8") + b"\n")
+                stream.flush()
+            except OSError as exc:
+                raise ServiceUnavailableError() from exc
+            for line in stream:
+                event = json.loads(line)
+                if event.get("event") == "result":
+                    return event
+                if on_event is not None:
+                    on_event(event)
+        raise UnpackError(UnpackErrorCode.UNEXPECTED, {"error": "service closed connection"})
+
+    @staticmethod
+    def _raise_for_result(result: Dict[str, Any]) -> None:
+        if result.get("ok"):
+            return
+        error = result.get("error") or {}
+        if error.get("kind") == "protocol":
+            raise ServiceUnavailableError(error.get("code"))
+        raise error_from_payload(error)
@@ -9,9 +9,10 @@ class UIConstants:
     """Константы для пользовательского интерфейса"""
     WINDOW_WIDTH = 500
     WINDOW_HEIGHT = 250
-    LOADING_ICON_SIZE = 96
     COMBO_MIN_WIDTH = 200
-    LOADING_MARGIN = 20
+    JOB_LIST_HEIGHT = 120
+    PREVIEW_TREE_HEIGHT = 140
+    UNPACK_WORKERS = 2
 
 
 class UIState(Enum):
@@ -29,17 +30,46 @@ class Styles:
     INPUT_SUCCESS = "border: 2px solid #4caf50; padding: 20px; background: #f1fff1; color: #000000;"
     MESSAGE_SUCCESS = "color: #4caf50; font-size: 16px;"
     MESSAGE_ERROR = "color: #d32f2f; font-size: 16px;"
-    LOADING_LABEL = """
-        QLabel { 
-            margin: 20px; 
-        }
-    """
+    PREVIEW_WARNING = "color: #d32f2f;"
 
 
 class CLICommands:
     """Команды командной строки"""
     UNPACK = "unpack"
+    INFO = "info"
+    SERVE = "serve"
+    WATCH = "watch"
+    CACHE = "cache"
+    CACHE_STATS = "stats"
+    CACHE_PURGE = "purge"
+    PACK = "pack"
+    REPACK = "repack"
+    DIFF = "diff"
+    VERIFY_AGAINST = "verify-against"
+    VERIFY = "verify"
+    NO_CACHE_FLAG = "--no-cache"
+    FORMAT_FLAG = "--output"
+    FORMAT_TEXT = "text"
+    FORMAT_JSON = "json"
+    PROFILE_FLAG = "--profile"
+    PROFILE_MEMORY_FLAG = "--profile-memory"
+    PROFILE_DIR_FLAG = "--profile-dir"
+    METRICS_FLAG = "--metrics"
+    METRICS_INTERVAL_FLAG = "--metrics-interval"
     OUTPUT_FLAG = "-tmplts"
+    WORKERS_FLAG = "--workers"
+    DONE_FLAG = "--done"
+    FAILED_FLAG = "--failed"
+    INTERVAL_FLAG = "--interval"
+    ONCE_FLAG = "--once"
+    NAME_FLAG = "--name"
+    PROVIDER_FLAG = "--provider"
+    LANG_FLAG = "--lang"
+    LEVEL_FLAG = "--level"
+    INCLUDE_FLAG = "--include"
+    EXCLUDE_FLAG = "--exclude"
+    QUICK_FLAG = "--quick"
+    HASH_FLAG = "--hash"
 
 
 class FileExtensions:
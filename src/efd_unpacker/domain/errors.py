@@ -18,6 +18,9 @@ class FileValidationCode(Enum):
     NOT_READABLE = "not_readable"
     EMPTY = "file_empty"
     SIZE_UNAVAILABLE = "size_unavailable"
+    INPUT_NOT_DIRECTORY = "input_not_directory"
+    INPUT_DIRECTORY_NOT_READABLE = "input_directory_not_readable"
+    INBOX_NOT_WRITABLE = "inbox_not_writable"
     OUTPUT_PATH_EMPTY = "output_path_empty"
     OUTPUT_NOT_DIRECTORY = "output_not_directory"
     OUTPUT_NOT_WRITABLE = "output_not_writable"
@@ -29,7 +32,16 @@ class UnpackErrorCode(Enum):
 
     FILE_NOT_FOUND = "unpack_file_not_found"
     PERMISSION = "unpack_permission"
+    INVALID_FORMAT = "unpack_invalid_format"
     UNEXPECTED = "unpack_unexpected"
+    CANCELLED = "unpack_cancelled"
+
+
+class PackErrorCode(Enum):
+    """Коды ошибок упаковки EFD."""
+
+    FILE_TOO_LARGE = "pack_file_too_large"
+    SOURCE_CHANGED = "pack_source_changed"
 
 
 @dataclass
@@ -56,3 +68,9 @@ class UnpackError(DomainError):
     """Исключение при распаковке."""
 
     code: UnpackErrorCode
+
+
+class PackError(DomainError):
+    """Исключение при упаковке."""
+
+    code: PackErrorCode
@@ -5,11 +5,29 @@
 from __future__ import annotations
 
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from .errors import FileValidationCode, FileValidationError
 
+# Проверка упирается в задержку файловой системы (сетевые шары), а не в CPU.
+VALIDATION_WORKERS = 16
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    """Результат проверки одного файла в validate_many."""
+
+    path: str
+    normalized: Optional[str] = None
+    error: Optional[FileValidationError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 @dataclass
 class FileValidator:
@@ -30,13 +48,19 @@ class FileValidator:
         return os.path.abspath(expanded)
 
     def validate_input_file(self, file_path: str) -> str:
-        """Возвращает нормализованный путь к файлу или выбрасывает FileValidationError."""
+        """
+        Возвращает нормализованный путь к файлу или выбрасывает FileValidationError.
+
+        Тип и размер берутся из одного `os.stat`; отдельно проверяется только право чтения.
+        """
         normalized = self.normalize_path(file_path)
 
-        if not os.path.exists(normalized):
-            raise FileValidationError(FileValidationCode.NOT_FOUND, {"path": file_path})
+        try:
+            stat_result = os.stat(normalized)
+        except (OSError, ValueError):
+            raise FileValidationError(FileValidationCode.NOT_FOUND, {"path": file_path}) from None
 
-        if not os.path.isfile(normalized):
+        if not stat.S_ISREG(stat_result.st_mode):
             raise FileValidationError(FileValidationCode.NOT_A_FILE, {"path": file_path})
 
         if not normalized.lower().endswith(self.extension):
@@ -48,14 +72,47 @@ class FileValidator:
         if not os.access(normalized, os.R_OK):
             raise FileValidationError(FileValidationCode.NOT_READABLE, {"path": file_path})
 
+        if stat_result.st_size == 0:
+            raise FileValidationError(FileValidationCode.EMPTY, {"path": file_path})
+
+        return normalized
+
+    def validate_many(self, file_paths: Iterable[str], workers: int = VALIDATION_WORKERS) -> List[ValidationResult]:
+        """
+        Проверяет файлы параллельно и возвращает результат для каждого в исходном порядке.
+
+        Ошибка одного файла не прерывает проверку остальных.
+        """
+        paths = list(file_paths)
+        if len(paths) <= 1 or workers <= 1:
+            return [self._validate_one(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths)), thread_name_prefix="efd-validate") as executor:
+            return list(executor.map(self._validate_one, paths))
+
+    def _validate_one(self, file_path: str) -> ValidationResult:
         try:
-            file_size = os.path.getsize(normalized)
-        except OSError as exc:
-            raise FileValidationError(FileValidationCode.SIZE_UNAVAILABLE, {"error": str(exc)}) from exc
+            return ValidationResult(file_path, normalized=self.validate_input_file(file_path))
+        except FileValidationError as exc:
+            return ValidationResult(file_path, error=exc)
 
-        if file_size == 0:
-            raise FileValidationError(FileValidationCode.EMPTY, {"path": file_path})
+    def validate_input_directory(self, directory: str) -> str:
+        """
+        Возвращает нормализованный путь к существующему каталогу или выбрасывает FileValidationError.
+
+        Каталог только читается (pack, verify): достаточно прав на чтение и обход.
+        """
+        normalized = self.normalize_path(directory)
+        if not directory or not os.path.isdir(normalized):
+            raise FileValidationError(FileValidationCode.INPUT_NOT_DIRECTORY, {"path": directory})
+        if not os.access(normalized, os.R_OK | os.X_OK):
+            raise FileValidationError(FileValidationCode.INPUT_DIRECTORY_NOT_READABLE, {"path": directory})
+        return normalized
 
+    def validate_inbox_directory(self, directory: str) -> str:
+        """Входящий каталог режима watch: кроме чтения нужна запись, чтобы переносить файлы в done/failed."""
+        normalized = self.validate_input_directory(directory)
+        if not os.access(normalized, os.W_OK):
+            raise FileValidationError(FileValidationCode.INBOX_NOT_WRITABLE, {"path": directory})
         return normalized
 
     def prepare_output_directory(self, output_dir: str) -> str:
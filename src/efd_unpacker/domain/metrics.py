@@ -0,0 +1,38 @@
+"""
+Интерфейс метрик распаковки: именованные счётчики и таймеры.
+"""
+
+from __future__ import annotations
+
+from typing import Protocol
+
+
+class MetricNames:
+    """Имена метрик, которые пишут сервисы распаковки."""
+
+    UNPACKS = "unpacks"
+    UNPACK_ERRORS = "unpack_errors"
+    CACHE_HITS = "cache_hits"
+    BYTES_READ = "bytes_read"
+    BYTES_INFLATED = "bytes_inflated"
+    BYTES_WRITTEN = "bytes_written"
+    FILES_WRITTEN = "files_written"
+    MAKEDIRS_CALLS = "makedirs_calls"
+    UTIME_CALLS = "utime_calls"
+
+    UNPACK_TIME = "unpack"
+    INFLATE_TIME = "inflate"
+    PARSE_TIME = "parse"
+    WRITE_TIME = "write"
+    METADATA_TIME = "metadata"
+    QUEUE_WAIT_TIME = "queue_wait"
+
+
+class MetricsRecorder(Protocol):
+    """Получатель метрик. Реализации должны быть потокобезопасными."""
+
+    def increment(self, name: str, value: float = 1) -> None:  # pragma: no cover - протокол
+        ...
+
+    def observe(self, name: str, seconds: float) -> None:  # pragma: no cover - протокол
+        ...
@@ -0,0 +1,285 @@
+"""
+Сравнение EFD без распаковки: с другим EFD или с уже распакованным каталогом.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .errors import UnpackError, UnpackErrorCode
+from .supply_stream import InflatingReader, SupplyManifest, read_supply_manifest
+from .unpack_service import POSIX_EPOCH, _translate_errors
+
+ENTRY_HASH_ALGORITHM = "blake2b"
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_VERIFY_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+MTIME_TOLERANCE = 2.0
+
+DRIFT_MISSING = "missing"
+DRIFT_SIZE = "size"
+DRIFT_MTIME = "mtime"
+DRIFT_CONTENT = "content"
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_CHANGED = "changed"
+
+
+def new_entry_digest() -> Any:
+    """Хеш содержимого вложенного файла (тот же алгоритм для EFD и файлов на диске)."""
+    return hashlib.new(ENTRY_HASH_ALGORITHM)
+
+
+@dataclass(frozen=True)
+class EntryChange:
+    """Отличие одного вложенного файла. Размер отсутствующей стороны — None."""
+
+    path: str
+    kind: str
+    old_size: Optional[int]
+    new_size: Optional[int]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "kind": self.kind, "old_size": self.old_size, "new_size": self.new_size}
+
+
+@dataclass
+class SupplyDiff:
+    """
+    Результат сравнения двух EFD.
+
+    `complete` равен False, если сравнение остановлено на первом отличии:
+    тогда `changes` содержит только найденные к этому моменту отличия.
+    """
+
+    changes: List[EntryChange] = field(default_factory=list)
+    complete: bool = True
+
+    @property
+    def identical(self) -> bool:
+        return not self.changes
+
+    def of_kind(self, kind: str) -> List[EntryChange]:
+        return [change for change in self.changes if change.kind == kind]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "identical": self.identical,
+            "complete": self.complete,
+            "changes": [change.to_dict() for change in self.changes],
+        }
+
+
+class _DiffState:
+    """Общее состояние двух потоков хеширования: заголовки, хеши и флаг остановки."""
+
+    def __init__(self, stop_on_first: bool) -> None:
+        self.stop_on_first = stop_on_first
+        self.stop = threading.Event()
+        self._lock = threading.Lock()
+        self.sizes: List[Optional[Dict[str, int]]] = [None, None]
+        self.digests: Tuple[Dict[str, bytes], Dict[str, bytes]] = ({}, {})
+
+    def publish_manifest(self, side: int, manifest: SupplyManifest) -> None:
+        with self._lock:
+            self.sizes[side] = {path: size for path, _modified_at, size in manifest.included_files}
+            other = self.sizes[1 - side]
+            if self.stop_on_first and other is not None and other != self.sizes[side]:
+                self.stop.set()
+
+    def publish_digest(self, side: int, path: str, digest: bytes) -> None:
+        with self._lock:
+            self.digests[side][path] = digest
+            other = self.digests[1 - side].get(path)
+            if self.stop_on_first and other is not None and other != digest:
+                self.stop.set()
+
+
+def diff_supplies(old_file: str, new_file: str, stop_on_first: bool = False) -> SupplyDiff:
+    """
+    Сравнивает вложенные файлы двух EFD по пути, размеру и хешу содержимого.
+
+    Оба файла разжимаются и хешируются одновременно в двух потоках, на диск
+    ничего не пишется. С `stop_on_first` чтение прекращается при первом найденном
+    отличии — достаточно для ответа «совпадают или нет». Поднимает UnpackError.
+    """
+    state = _DiffState(stop_on_first)
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="efd-diff") as executor:
+        futures = [executor.submit(_hash_entries, path, side, state) for side, path in enumerate((old_file, new_file))]
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            state.stop.set()
+    return _build_diff(state)
+
+
+def _hash_entries(input_file: str, side: int, state: _DiffState) -> None:
+    with _translate_errors():
+        with open(input_file, "rb") as handle:
+            stream = InflatingReader(handle)
+            manifest = read_supply_manifest(stream)
+            state.publish_manifest(side, manifest)
+            for path, _modified_at, size in manifest.included_files:
+                if state.stop.is_set():
+                    return
+                digest = new_entry_digest()
+                remaining = size
+                while remaining > 0:
+                    if state.stop.is_set():
+                        return
+                    chunk = stream.read(min(HASH_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise UnpackError(UnpackErrorCode.INVALID_FORMAT, {"error": "unexpected end of data"})
+                    digest.update(chunk)
+                    remaining -= len(chunk)
+                state.publish_digest(side, path, digest.digest())
+
+
+def _build_diff(state: _DiffState) -> SupplyDiff:
+    old_sizes, new_sizes = state.sizes
+    old_digests, new_digests = state.digests
+    complete = old_sizes is not None and new_sizes is not None
+    old_sizes, new_sizes = old_sizes or {}, new_sizes or {}
+    changes: List[EntryChange] = []
+    for path, size in old_sizes.items():
+        if path not in new_sizes:
+            changes.append(EntryChange(path, CHANGE_REMOVED, size, None))
+            continue
+        new_size = new_sizes[path]
+        old_digest, new_digest = old_digests.get(path), new_digests.get(path)
+        if size != new_size:
+            changes.append(EntryChange(path, CHANGE_CHANGED, size, new_size))
+        elif old_digest is None or new_digest is None:
+            complete = False
+        elif old_digest != new_digest:
+            changes.append(EntryChange(path, CHANGE_CHANGED, size, new_size))
+    for path, size in new_sizes.items():
+        if path not in old_sizes:
+            changes.append(EntryChange(path, CHANGE_ADDED, None, size))
+    return SupplyDiff(changes=changes, complete=complete)
+
+
+@dataclass(frozen=True)
+class EntryDrift:
+    """Расхождение файла на диске с записью EFD: ожидаемое и фактическое значение."""
+
+    path: str
+    kind: str
+    expected: Any = None
+    actual: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "kind": self.kind, "expected": self.expected, "actual": self.actual}
+
+
+@dataclass
+class DirectoryDrift:
+    """Результат сверки EFD с каталогом: число проверенных файлов и расхождения."""
+
+    checked: int = 0
+    drift: List[EntryDrift] = field(default_factory=list)
+
+    @property
+    def matches(self) -> bool:
+        return not self.drift
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "matches": self.matches,
+            "checked": self.checked,
+            "drift": [item.to_dict() for item in self.drift],
+        }
+
+
+def verify_against_directory(
+    input_file: str,
+    directory: str,
+    check_hash: bool = False,
+    workers: int = DEFAULT_VERIFY_WORKERS,
+) -> DirectoryDrift:
+    """
+    Сверяет вложенные файлы EFD с файлами в `directory` по размеру, mtime и, с `check_hash`, по хешу.
+
+    Без `check_hash` читается только заголовок EFD. С `check_hash` EFD разжимается
+    потоково, а файлы на диске читаются и хешируются параллельно в пуле из `workers`
+    потоков. Файлы каталога, которых нет в EFD, не проверяются: каталог шаблонов
+    обычно общий для нескольких конфигураций. Поднимает UnpackError.
+    """
+    root = os.path.abspath(directory)
+    result = DirectoryDrift()
+    with _translate_errors(), ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="efd-verify") as pool:
+        with open(input_file, "rb") as handle:
+            stream = InflatingReader(handle)
+            manifest = read_supply_manifest(stream)
+            pending: List[Tuple[str, dt.datetime, int, Future, Optional[bytes]]] = []
+            for path, modified_at, size in manifest.included_files:
+                local_path = os.path.join(root, *path.split("\\"))
+                future = pool.submit(_inspect_local_file, local_path, check_hash)
+                expected_digest = _hash_stream_entry(stream, size) if check_hash else None
+                pending.append((path, modified_at, size, future, expected_digest))
+
+        for path, modified_at, size, future, expected_digest in pending:
+            result.checked += 1
+            drift = _entry_drift(path, modified_at, size, future.result(), expected_digest)
+            if drift is not None:
+                result.drift.append(drift)
+    return result
+
+
+def _hash_stream_entry(stream: InflatingReader, size: int) -> bytes:
+    digest = new_entry_digest()
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(min(HASH_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise UnpackError(UnpackErrorCode.INVALID_FORMAT, {"error": "unexpected end of data"})
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest.digest()
+
+
+def _inspect_local_file(path: str, check_hash: bool) -> Optional[Tuple[int, float, Optional[bytes]]]:
+    """Размер, mtime и (по запросу) хеш файла на диске; None, если файла нет."""
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not check_hash:
+        return stat.st_size, stat.st_mtime, None
+    digest = new_entry_digest()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return stat.st_size, stat.st_mtime, digest.digest()
+
+
+def _entry_drift(
+    path: str,
+    modified_at: dt.datetime,
+    size: int,
+    local: Optional[Tuple[int, float, Optional[bytes]]],
+    expected_digest: Optional[bytes],
+) -> Optional[EntryDrift]:
+    if local is None:
+        return EntryDrift(path, DRIFT_MISSING)
+    local_size, local_mtime, local_digest = local
+    if local_size != size:
+        return EntryDrift(path, DRIFT_SIZE, size, local_size)
+    if expected_digest is not None and local_digest != expected_digest:
+        return EntryDrift(path, DRIFT_CONTENT, expected_digest.hex(), local_digest and local_digest.hex())
+    expected_mtime = (modified_at - POSIX_EPOCH).total_seconds()
+    if modified_at >= POSIX_EPOCH and abs(local_mtime - expected_mtime) > MTIME_TOLERANCE:
+        return EntryDrift(
+            path,
+            DRIFT_MTIME,
+            modified_at.isoformat(),
+            (POSIX_EPOCH + dt.timedelta(seconds=local_mtime)).isoformat(),
+        )
+    return None
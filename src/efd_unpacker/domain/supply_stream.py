@@ -0,0 +1,179 @@
+"""
+Потоковое чтение структуры EFD без промежуточного файла.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import struct
+import zlib
+from dataclasses import dataclass, field
+from struct import unpack
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+from onec_dtools import supply_reader as supply_reader_module
+
+from .errors import UnpackError, UnpackErrorCode
+
+SupplyDescription = Tuple[str, str, str]
+IncludedFile = Tuple[str, dt.datetime, int]
+
+SUPPLY_HEADER = 1
+INFLATE_CHUNK_SIZE = 1024 * 1024
+
+
+class InflatingReader:
+    """
+    Файлоподобная обёртка над raw deflate потоком EFD.
+
+    Разжимает данные по мере чтения и не держит в памяти больше одного блока,
+    поэтому подходит и для чтения заголовка, и для потоковой выдачи содержимого.
+    """
+
+    def __init__(self, handle: BinaryIO, chunk_size: int = INFLATE_CHUNK_SIZE) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decompressor = zlib.decompressobj(-15)
+        self._buffer = bytearray()
+        self._offset = 0
+        self._input_exhausted = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.position = 0
+
+    @property
+    def eof(self) -> bool:
+        """True, если deflate поток корректно завершён."""
+        return self._decompressor.eof
+
+    @property
+    def unused_data(self) -> bytes:
+        """Байты, оставшиеся во входе после конца deflate потока."""
+        return self._decompressor.unused_data
+
+    def read(self, size: int = -1) -> bytes:
+        """Возвращает ровно `size` байт, либо меньше только в конце потока."""
+        if size < 0:
+            while self._fill():
+                pass
+            size = len(self._buffer) - self._offset
+        else:
+            while len(self._buffer) - self._offset < size and self._fill():
+                pass
+
+        end = min(self._offset + size, len(self._buffer))
+        data = bytes(self._buffer[self._offset:end])
+        self._offset = end
+        self.position += len(data)
+        self._compact()
+        return data
+
+    def skip(self, size: int) -> int:
+        """Пропускает `size` байт без копирования. Возвращает число пропущенных байт."""
+        skipped = 0
+        while skipped < size:
+            available = len(self._buffer) - self._offset
+            if available == 0 and not self._fill():
+                break
+            step = min(size - skipped, len(self._buffer) - self._offset)
+            self._offset += step
+            skipped += step
+            self._compact()
+        self.position += skipped
+        return skipped
+
+    def _fill(self) -> bool:
+        if self._input_exhausted:
+            return False
+        if self._decompressor.eof:
+            self._input_exhausted = True
+            return False
+
+        data = self._decompressor.unconsumed_tail
+        if not data:
+            data = self._handle.read(self._chunk_size)
+            if not data:
+                self._input_exhausted = True
+                tail = self._decompressor.flush()
+                self._append(tail)
+                return bool(tail)
+            self.bytes_in += len(data)
+
+        self._append(self._decompressor.decompress(data, self._chunk_size))
+        return True
+
+    def _append(self, data: bytes) -> None:
+        if data:
+            self._buffer += data
+            self.bytes_out += len(data)
+
+    def _compact(self) -> None:
+        if self._offset >= len(self._buffer):
+            self._buffer.clear()
+            self._offset = 0
+        elif self._offset >= self._chunk_size:
+            del self._buffer[:self._offset]
+            self._offset = 0
+
+
+@dataclass
+class SupplyManifest:
+    """Заголовок EFD: описания комплекта поставки и таблица вложенных файлов."""
+
+    description: Dict[str, SupplyDescription] = field(default_factory=dict)
+    included_files: List[IncludedFile] = field(default_factory=list)
+
+    @property
+    def total_size(self) -> int:
+        return sum(size for _, _, size in self.included_files)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-совместимое представление для CLI и сервиса."""
+        return {
+            "description": {
+                lang: {"name": name, "provider": provider, "description_path": path}
+                for lang, (name, provider, path) in self.description.items()
+            },
+            "files": [
+                {"path": path, "modified": modified_at.isoformat(), "size": size}
+                for path, modified_at, size in self.included_files
+            ],
+            "total_size": self.total_size,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SupplyManifest":
+        return cls(
+            description={
+                lang: (item["name"], item["provider"], item["description_path"])
+                for lang, item in data.get("description", {}).items()
+            },
+            included_files=[
+                (item["path"], dt.datetime.fromisoformat(item["modified"]), item["size"])
+                for item in data.get("files", [])
+            ],
+        )
+
+
+def read_supply_manifest(stream: BinaryIO) -> SupplyManifest:
+    """
+    Читает заголовок и таблицу файлов из разжатого потока.
+
+    После возврата поток стоит на начале данных первого вложенного файла.
+    """
+    manifest = SupplyManifest()
+    try:
+        header, supply_info_count = unpack("II", stream.read(8))
+        if header != SUPPLY_HEADER:
+            raise UnpackError(UnpackErrorCode.INVALID_FORMAT, {"header": header})
+
+        for _ in range(supply_info_count):
+            lang, supply_name, provider_name, description_path = supply_reader_module.read_supply_info(stream)
+            manifest.description[lang] = supply_name, provider_name, description_path
+
+        included_files_count = unpack("I", stream.read(4))[0]
+        for _ in range(included_files_count):
+            manifest.included_files.append(supply_reader_module.read_included_file_info(stream))
+    except (struct.error, UnicodeDecodeError, OverflowError) as exc:
+        raise UnpackError(UnpackErrorCode.INVALID_FORMAT, {"error": str(exc)}) from exc
+    return manifest
@@ -0,0 +1,202 @@
+"""
+Структурная проверка EFD без записи файлов.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, List, Optional, Set
+
+from .supply_stream import SUPPLY_HEADER, InflatingReader
+from .unpack_service import _translate_errors
+
+ISSUE_HEADER = "header"
+ISSUE_RECORD_LENGTH = "record_length"
+ISSUE_OFFSET = "offset"
+ISSUE_UNSAFE_PATH = "unsafe_path"
+ISSUE_DUPLICATE_PATH = "duplicate_path"
+ISSUE_TRUNCATED = "truncated"
+ISSUE_TRAILING_PAYLOAD = "trailing_payload"
+ISSUE_UNTERMINATED = "unterminated_stream"
+ISSUE_TRAILING_INPUT = "trailing_input"
+ISSUE_CORRUPT_STREAM = "corrupt_stream"
+
+MB = 1024 * 1024
+MAX_STRING_CHARS = 32 * 1024
+
+
+@dataclass(frozen=True)
+class VerifyIssue:
+    """Найденная проблема: код, путь вложенного файла (если относится к файлу) и подробности."""
+
+    code: str
+    path: str = ""
+    details: Optional[Dict[str, Any]] = None
+
+    def describe(self) -> str:
+        parts = [self.code]
+        if self.path:
+            parts.append(self.path)
+        if self.details:
+            parts.append(" ".join(f"{key}={value}" for key, value in self.details.items()))
+        return " ".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"code": self.code, "path": self.path, "details": self.details or {}}
+
+
+@dataclass
+class VerifyReport:
+    """Результат проверки EFD и скорость разжатия."""
+
+    input_file: str
+    files: int = 0
+    payload_bytes: int = 0
+    compressed_bytes: int = 0
+    inflated_bytes: int = 0
+    seconds: float = 0.0
+    issues: List[VerifyIssue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.inflated_bytes / MB / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "input": self.input_file,
+            "ok": self.ok,
+            "files": self.files,
+            "payload_bytes": self.payload_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "inflated_bytes": self.inflated_bytes,
+            "seconds": self.seconds,
+            "mb_per_s": self.mb_per_s,
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
+
+
+class _StopVerify(Exception):
+    """Дальнейший разбор невозможен; `issue` — причина."""
+
+    def __init__(self, issue: VerifyIssue) -> None:
+        super().__init__(issue.code)
+        self.issue = issue
+
+
+def verify_supply(input_file: str) -> VerifyReport:
+    """
+    Разжимает EFD целиком, не сохраняя содержимое, и проверяет структуру.
+
+    Проверяются признак заголовка, длины записей описаний и таблицы файлов,
+    смещения данных (каждое равно сумме предыдущих размеров), безопасность и
+    уникальность путей, совпадение суммы размеров с объёмом данных и корректное
+    завершение deflate потока без данных после него. Проблемы формата попадают
+    в `issues`; UnpackError поднимается только для ошибок доступа к файлу.
+    """
+    report = VerifyReport(input_file=input_file)
+    started = time.perf_counter()
+    with _translate_errors():
+        with open(input_file, "rb") as handle:
+            stream = InflatingReader(handle)
+            try:
+                if _verify_table(stream, report):
+                    _verify_payload(stream, handle, report)
+            except _StopVerify as exc:
+                report.issues.append(exc.issue)
+            except zlib.error as exc:
+                report.issues.append(VerifyIssue(ISSUE_CORRUPT_STREAM, details={"error": str(exc)}))
+            report.compressed_bytes = stream.bytes_in
+            report.inflated_bytes = stream.bytes_out
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _verify_table(stream: InflatingReader, report: VerifyReport) -> bool:
+    """Проверяет заголовок и таблицу файлов. False — дальше проверять нечего."""
+    header, supply_info_count = _unpack(stream, "II")
+    if header != SUPPLY_HEADER:
+        report.issues.append(VerifyIssue(ISSUE_HEADER, details={"header": header}))
+        return False
+
+    for _ in range(supply_info_count):
+        start = stream.position
+        record_length = _unpack(stream, "I")[0]
+        lang = _read_string(stream)
+        for _field in range(3):
+            _read_string(stream)
+        _check_record_length(report, lang, record_length, stream.position - start)
+
+    seen: Set[str] = set()
+    expected_offset = 0
+    for _ in range(_unpack(stream, "I")[0]):
+        start = stream.position
+        record_length = _unpack(stream, "I")[0]
+        name = _read_string(stream)
+        _filetime, offset, size = _unpack(stream, "QII")
+        _check_record_length(report, name, record_length, stream.position - start)
+        if offset != expected_offset & 0xFFFFFFFF:
+            report.issues.append(VerifyIssue(ISSUE_OFFSET, name, {"expected": expected_offset, "actual": offset}))
+        if not _is_safe_path(name):
+            report.issues.append(VerifyIssue(ISSUE_UNSAFE_PATH, name))
+        if name.casefold() in seen:
+            report.issues.append(VerifyIssue(ISSUE_DUPLICATE_PATH, name))
+        seen.add(name.casefold())
+        expected_offset += size
+        report.files += 1
+    report.payload_bytes = expected_offset
+    return True
+
+
+def _verify_payload(stream: InflatingReader, handle: BinaryIO, report: VerifyReport) -> None:
+    if stream.skip(report.payload_bytes) != report.payload_bytes:
+        raise _StopVerify(VerifyIssue(ISSUE_TRUNCATED, details={"position": stream.position}))
+    trailing = 0
+    while True:
+        skipped = stream.skip(MB)
+        trailing += skipped
+        if skipped < MB:
+            break
+    if trailing:
+        report.issues.append(VerifyIssue(ISSUE_TRAILING_PAYLOAD, details={"bytes": trailing}))
+    if not stream.eof:
+        report.issues.append(VerifyIssue(ISSUE_UNTERMINATED))
+    elif stream.unused_data or handle.read(1):
+        report.issues.append(VerifyIssue(ISSUE_TRAILING_INPUT))
+
+
+def _check_record_length(report: VerifyReport, name: str, declared: int, actual: int) -> None:
+    if declared != actual:
+        report.issues.append(VerifyIssue(ISSUE_RECORD_LENGTH, name, {"declared": declared, "actual": actual}))
+
+
+def _is_safe_path(name: str) -> bool:
+    parts = name.split("\\")
+    if not name or any(part in ("", ".", "..") for part in parts):
+        return False
+    return "/" not in name and ":" not in name
+
+
+def _read_exact(stream: InflatingReader, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise _StopVerify(VerifyIssue(ISSUE_TRUNCATED, details={"position": stream.position}))
+    return data
+
+
+def _unpack(stream: InflatingReader, layout: str) -> tuple:
+    return struct.unpack(layout, _read_exact(stream, struct.calcsize(layout)))
+
+
+def _read_string(stream: InflatingReader) -> str:
+    length = _unpack(stream, "I")[0]
+    if length > MAX_STRING_CHARS:
+        # Длина явно повреждена: не пытаемся читать гигабайты как строку.
+        raise _StopVerify(VerifyIssue(ISSUE_RECORD_LENGTH, details={"string_length": length}))
+    return _read_exact(stream, length * 2).decode("utf-16-le", errors="replace")
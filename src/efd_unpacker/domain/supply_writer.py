@@ -0,0 +1,314 @@
+"""
+Запись EFD: заголовок, описания комплекта, таблица файлов и данные в одном raw deflate потоке.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import fnmatch
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .errors import PackError, PackErrorCode, UnpackError, UnpackErrorCode
+from .supply_stream import (
+    SUPPLY_HEADER,
+    IncludedFile,
+    InflatingReader,
+    SupplyDescription,
+    SupplyManifest,
+    read_supply_manifest,
+)
+from .unpack_service import POSIX_EPOCH, _read_exact, _translate_errors
+
+FILETIME_EPOCH = dt.datetime(1601, 1, 1)
+MAX_FILE_SIZE = 0xFFFFFFFF
+DEFAULT_LEVEL = 6
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_PACK_WORKERS = os.cpu_count() or 1
+DEFAULT_PACK_LANG = "ru"
+DICTIONARY_SIZE = 32 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class ParallelDeflate:
+    """
+    Raw deflate поток, который сжимается независимыми блоками в пуле потоков.
+
+    Каждый блок сжимается своим compressobj со словарём из последних 32 КБ предыдущего
+    блока и завершается Z_SYNC_FLUSH: выход выровнен по байту и не помечен как последний.
+    Последний блок завершается Z_FINISH, поэтому склеенные блоки — один корректный поток.
+    zlib отпускает GIL, так что блоки действительно сжимаются на нескольких ядрах.
+    """
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        level: int = DEFAULT_LEVEL,
+        workers: int = DEFAULT_PACK_WORKERS,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        self._handle = handle
+        self._level = level
+        self._block_size = block_size
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._max_pending = max(1, workers) * 2
+        self._pending: Deque[Future] = deque()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="efd-deflate")
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        self.bytes_in += len(data)
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[:self._block_size])
+            del self._buffer[:self._block_size]
+            self._submit(block, final=False)
+
+    def close(self) -> None:
+        """Сжимает остаток буфера последним блоком и дописывает все блоки по порядку."""
+        try:
+            self._submit(bytes(self._buffer), final=True)
+            self._buffer.clear()
+            while self._pending:
+                self._emit(self._pending.popleft().result())
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _submit(self, block: bytes, final: bool) -> None:
+        dictionary, self._dictionary = self._dictionary, block[-DICTIONARY_SIZE:]
+        if self._executor is None:
+            self._emit(_compress_block(block, dictionary, self._level, final))
+            return
+        self._pending.append(self._executor.submit(_compress_block, block, dictionary, self._level, final))
+        while len(self._pending) > self._max_pending:
+            self._emit(self._pending.popleft().result())
+
+    def _emit(self, data: bytes) -> None:
+        self._handle.write(data)
+        self.bytes_out += len(data)
+
+
+def _compress_block(block: bytes, dictionary: bytes, level: int, final: bool) -> bytes:
+    options = {"zdict": dictionary} if dictionary else {}
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15, **options)
+    data = compressor.compress(block)
+    return data + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class EFDWriter:
+    """Пишет EFD в той же раскладке, которую читает SafeSupplyReader."""
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        level: int = DEFAULT_LEVEL,
+        workers: int = DEFAULT_PACK_WORKERS,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        self._handle = handle
+        self._level = level
+        self._workers = workers
+        self._block_size = block_size
+
+    def write(self, manifest: SupplyManifest, payload: Iterable[bytes]) -> int:
+        """
+        Записывает заголовок по `manifest` и содержимое файлов из `payload` подряд.
+
+        Объём `payload` должен совпадать с суммой размеров в таблице файлов, иначе
+        поднимается PackError. Возвращает размер сжатого потока в байтах.
+        """
+        deflate = ParallelDeflate(self._handle, self._level, self._workers, self._block_size)
+        try:
+            deflate.write(encode_supply_header(manifest))
+            header_size = deflate.bytes_in
+            for chunk in payload:
+                deflate.write(chunk)
+            if deflate.bytes_in - header_size != manifest.total_size:
+                raise PackError(
+                    PackErrorCode.SOURCE_CHANGED,
+                    {"expected": manifest.total_size, "actual": deflate.bytes_in - header_size},
+                )
+        finally:
+            deflate.close()
+        return deflate.bytes_out
+
+
+def encode_supply_header(manifest: SupplyManifest) -> bytes:
+    """Заголовок EFD до начала данных: описания комплекта и таблица вложенных файлов."""
+    header = bytearray(struct.pack("II", SUPPLY_HEADER, len(manifest.description)))
+    for lang, description in manifest.description.items():
+        header += _supply_info(lang, description)
+    header += struct.pack("I", len(manifest.included_files))
+    offset = 0
+    for name, modified_at, size in manifest.included_files:
+        if size > MAX_FILE_SIZE:
+            raise PackError(PackErrorCode.FILE_TOO_LARGE, {"path": name, "size": size})
+        header += _included_file_info(name, modified_at, offset, size)
+        offset += size
+    return bytes(header)
+
+
+def pack_directory(
+    source_dir: str,
+    output_file: str,
+    description: Dict[str, SupplyDescription],
+    level: int = DEFAULT_LEVEL,
+    workers: int = DEFAULT_PACK_WORKERS,
+) -> SupplyManifest:
+    """
+    Упаковывает содержимое каталога в EFD и возвращает записанный заголовок.
+
+    Файл пишется во временный рядом с `output_file` и заменяет его только после
+    успешной записи. Поднимает PackError или UnpackError для системных ошибок.
+    """
+    with _translate_errors():
+        root = os.path.abspath(source_dir)
+        target = os.path.abspath(output_file)
+        manifest = SupplyManifest(description=dict(description), included_files=_collect_files(root, target))
+        with _atomic_output(target) as handle:
+            EFDWriter(handle, level, workers).write(manifest, _read_files(root, manifest.included_files))
+    return manifest
+
+
+@dataclass(frozen=True)
+class SupplyFilter:
+    """
+    Отбор описаний комплекта по языку и вложенных файлов по шаблонам пути.
+
+    Шаблоны fnmatch сравниваются без учёта регистра, разделитель — `/` или `\\`.
+    Файл остаётся, если подходит под один из `include` (или `include` пуст)
+    и не подходит ни под один из `exclude`.
+    """
+
+    languages: Tuple[str, ...] = ()
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+
+    def keeps_language(self, lang: str) -> bool:
+        return not self.languages or lang in self.languages
+
+    def keeps_file(self, path: str) -> bool:
+        normalized = _normalize_pattern(path)
+        if self.include and not any(fnmatch.fnmatchcase(normalized, _normalize_pattern(p)) for p in self.include):
+            return False
+        return not any(fnmatch.fnmatchcase(normalized, _normalize_pattern(p)) for p in self.exclude)
+
+    def apply(self, manifest: SupplyManifest) -> SupplyManifest:
+        return SupplyManifest(
+            description={lang: item for lang, item in manifest.description.items() if self.keeps_language(lang)},
+            included_files=[item for item in manifest.included_files if self.keeps_file(item[0])],
+        )
+
+
+def repack_supply(
+    input_file: str,
+    output_file: str,
+    supply_filter: SupplyFilter,
+    level: int = DEFAULT_LEVEL,
+    workers: int = DEFAULT_PACK_WORKERS,
+) -> Tuple[SupplyManifest, SupplyManifest]:
+    """
+    Переписывает EFD, оставляя отобранные `supply_filter` описания и файлы.
+
+    Входной поток читается один раз: оставленные файлы сразу передаются в EFDWriter,
+    остальные пропускаются без копирования, дерево на диск не распаковывается.
+    Возвращает исходный и записанный заголовки.
+    """
+    with _translate_errors():
+        target = os.path.abspath(output_file)
+        with _atomic_output(target) as handle, open(input_file, "rb") as source:
+            stream = InflatingReader(source)
+            original = read_supply_manifest(stream)
+            filtered = supply_filter.apply(original)
+            EFDWriter(handle, level, workers).write(filtered, _filter_payload(stream, original, supply_filter))
+    return original, filtered
+
+
+def _filter_payload(stream: InflatingReader, manifest: SupplyManifest, supply_filter: SupplyFilter) -> Iterator[bytes]:
+    for name, _modified_at, size in manifest.included_files:
+        if not supply_filter.keeps_file(name):
+            if stream.skip(size) != size:
+                raise UnpackError(UnpackErrorCode.INVALID_FORMAT, {"error": "unexpected end of data"})
+            continue
+        remaining = size
+        while remaining > 0:
+            chunk = _read_exact(stream, min(READ_CHUNK_SIZE, remaining))
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _normalize_pattern(value: str) -> str:
+    return value.replace("\\", "/").lower()
+
+
+@contextmanager
+def _atomic_output(target: str) -> Iterator[BinaryIO]:
+    """Файл для записи рядом с `target`; заменяет `target` только при успешном выходе."""
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as handle:
+            yield handle
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _collect_files(root: str, exclude: str) -> List[IncludedFile]:
+    files: List[IncludedFile] = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(directory, filename)
+            if path == exclude or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            name = os.path.relpath(path, root).replace(os.sep, "\\")
+            modified_at = POSIX_EPOCH + dt.timedelta(microseconds=stat.st_mtime_ns // 1000)
+            files.append((name, modified_at, stat.st_size))
+    return files
+
+
+def _read_files(root: str, files: List[IncludedFile]) -> Iterator[bytes]:
+    for name, _modified_at, size in files:
+        path = os.path.join(root, *name.split("\\"))
+        with open(path, "rb") as handle:
+            remaining = size
+            while remaining > 0:
+                chunk = handle.read(min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+            if remaining or handle.read(1):
+                raise PackError(PackErrorCode.SOURCE_CHANGED, {"path": name})
+
+
+def _string(value: str) -> bytes:
+    encoded = value.encode("utf-16-le")
+    return struct.pack("I", len(encoded) // 2) + encoded
+
+
+def _supply_info(lang: str, description: SupplyDescription) -> bytes:
+    supply_name, provider_name, description_path = description
+    body = _string(lang) + _string(supply_name) + _string(provider_name) + _string(description_path)
+    return struct.pack("I", len(body) + 4) + body
+
+
+def _included_file_info(name: str, modified_at: dt.datetime, offset: int, size: int) -> bytes:
+    filetime = max(0, (modified_at - FILETIME_EPOCH) // dt.timedelta(microseconds=1) * 10)
+    body = _string(name) + struct.pack("QII", filetime, offset & 0xFFFFFFFF, size)
+    return struct.pack("I", len(body) + 4) + body
@@ -8,14 +8,59 @@ import datetime as dt
 import os
 import sys
 import tempfile
+import threading
+import time
 import zlib
-from struct import unpack
-from typing import BinaryIO, Callable, Protocol
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Protocol, Set, Tuple
 
 import onec_dtools
-from onec_dtools import supply_reader as supply_reader_module
 
-from .errors import UnpackError, UnpackErrorCode
+from .errors import DomainError, UnpackError, UnpackErrorCode
+from .metrics import MetricNames, MetricsRecorder
+from .supply_stream import InflatingReader, SupplyManifest, read_supply_manifest
+
+
+@dataclass(frozen=True)
+class UnpackProgress:
+    """Снимок прогресса распаковки."""
+
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    current_file: str = ""
+
+
+ProgressCallback = Callable[[UnpackProgress], None]
+
+
+@dataclass
+class UnpackTimings:
+    """Время (в секундах), потраченное на этапы распаковки."""
+
+    validate: float = 0.0
+    inflate: float = 0.0
+    parse: float = 0.0
+    write: float = 0.0
+    metadata: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.validate + self.inflate + self.parse + self.write + self.metadata
+
+    def merge(self, other: "UnpackTimings") -> None:
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "total": self.total}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UnpackTimings":
+        return cls(**{key: float(data.get(key, 0.0)) for key in cls.__dataclass_fields__})
 
 
 class SupplyReaderProtocol(Protocol):
@@ -28,68 +73,387 @@ class SupplyReaderProtocol(Protocol):
 SupplyReaderFactory = Callable[[BinaryIO], SupplyReaderProtocol]
 POSIX_EPOCH = dt.datetime(1970, 1, 1)
 
+UNPACK_MODE_SPOOL = "spool"
+UNPACK_MODE_STREAM = "stream"
+UNPACK_MODE_POOLED = "pooled"
+UNPACK_MODES = (UNPACK_MODE_SPOOL, UNPACK_MODE_STREAM, UNPACK_MODE_POOLED)
+DEFAULT_WRITERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_PENDING_BYTES = 64 * 1024 * 1024
+
 
-def _apply_file_mtime(path: str, modified_at: dt.datetime) -> None:
+def _apply_file_mtime(path: str, modified_at: dt.datetime) -> bool:
     """
     Применяет mtime к распакованному файлу.
 
     onec_dtools хранит даты в FILETIME и может отдавать значения до 1970 года.
     На Windows `datetime.timestamp()` и `os.utime()` для таких значений падают с
     `OSError: [Errno 22] Invalid argument`, поэтому древние timestamp там пропускаем.
+    Возвращает False, если mtime не применялся.
     """
     if sys.platform.startswith("win") and modified_at < POSIX_EPOCH:
-        return
+        return False
 
     timestamp = (modified_at - POSIX_EPOCH).total_seconds()
     os.utime(path, (timestamp, timestamp))
+    return True
+
+
+def _open_new_file(path: str) -> BinaryIO:
+    """
+    Открывает файл на запись как новый inode.
+
+    Прежний файл удаляется, а не перезаписывается на месте: жёсткие ссылки на него
+    (дерево кеша распаковок и другие каталоги, разложенные из кеша) не меняются.
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    return open(path, "wb")
 
 
 class SafeSupplyReader(onec_dtools.SupplyReader):
-    """Совместимая обертка над onec_dtools с безопасной обработкой mtime на Windows."""
+    """
+    Совместимая обертка над onec_dtools с безопасной обработкой mtime на Windows.
+
+    В `created_files` накапливаются пути файлов, которых не было в каталоге до
+    распаковки: по ним UnpackService убирает частично распакованный архив при
+    ошибке или отмене. Перезаписанные файлы шаблона не удаляются.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        super().__init__(file)
+        self.created_files: List[str] = []
+
+    def _create_output_file(self, path: str) -> BinaryIO:
+        existed = os.path.lexists(path)
+        out_file = _open_new_file(path)
+        if not existed:
+            self.created_files.append(path)
+        return out_file
 
-    def unpack(self, output_dir: str) -> None:
+    def unpack(
+        self,
+        output_dir: str,
+        progress: Optional[ProgressCallback] = None,
+        timings: Optional[UnpackTimings] = None,
+        metrics: Optional[MetricsRecorder] = None,
+    ) -> None:
+        phases = timings if timings is not None else UnpackTimings()
+        clock = time.perf_counter
+        bytes_read = bytes_inflated = makedirs_calls = utime_calls = 0
         with tempfile.TemporaryFile() as buffer_file:
+            started = clock()
             decompressor = zlib.decompressobj(-15)
             while True:
                 chunk = self.file.read(self.CHUNK_SIZE)
                 if not chunk:
                     break
-                buffer_file.write(decompressor.decompress(chunk))
+                data = decompressor.decompress(chunk)
+                bytes_read += len(chunk)
+                bytes_inflated += len(data)
+                buffer_file.write(data)
             buffer_file.seek(0)
+            phases.inflate += clock() - started
 
-            header, supply_info_count = unpack("II", buffer_file.read(8))
-            assert header == 1
+            started = clock()
+            manifest = read_supply_manifest(buffer_file)
+            self.description.update(manifest.description)
+            self.included_files.extend(manifest.included_files)
+            phases.parse += clock() - started
 
-            for _ in range(supply_info_count):
-                lang, supply_name, provider_name, description_path = supply_reader_module.read_supply_info(buffer_file)
-                self.description[lang] = supply_name, provider_name, description_path
-
-            included_files_count = unpack("I", buffer_file.read(4))[0]
-            for _ in range(included_files_count):
-                self.included_files.append(supply_reader_module.read_included_file_info(buffer_file))
-
-            for src_path, modified_at, size in self.included_files:
+            files_total = len(self.included_files)
+            bytes_total = manifest.total_size
+            bytes_done = 0
+            for files_done, (src_path, modified_at, size) in enumerate(self.included_files):
+                started = clock()
                 path = os.path.join(
                     os.path.abspath(output_dir),
                     *src_path.split("\\"),
                 )
 
                 os.makedirs(os.path.dirname(path), exist_ok=True)
+                makedirs_calls += 1
 
-                with open(path, "wb") as out_file:
+                with self._create_output_file(path) as out_file:
                     remaining = size
                     while remaining > 0:
                         chunk_size = min(self.CHUNK_SIZE, remaining)
                         out_file.write(buffer_file.read(chunk_size))
                         remaining -= chunk_size
+                        bytes_done += chunk_size
+                        if progress is not None and remaining > 0:
+                            progress(UnpackProgress(files_done, files_total, bytes_done, bytes_total, src_path))
+
+                written = clock()
+                phases.write += written - started
+                utime_calls += _apply_file_mtime(path, modified_at)
+                phases.metadata += clock() - written
+                if progress is not None:
+                    progress(UnpackProgress(files_done + 1, files_total, bytes_done, bytes_total, src_path))
 
-                _apply_file_mtime(path, modified_at)
+        _record_reader_metrics(
+            metrics, bytes_read, bytes_inflated, bytes_done, files_total, makedirs_calls, utime_calls
+        )
+
+
+class StreamingSupplyReader(SafeSupplyReader):
+    """
+    Распаковка без промежуточного файла: содержимое пишется по мере разжатия.
+
+    В отличие от SafeSupplyReader не копирует разжатый поток во временный файл,
+    поэтому не требует места под копию и вдвое меньше пишет на диск.
+    """
+
+    def unpack(
+        self,
+        output_dir: str,
+        progress: Optional[ProgressCallback] = None,
+        timings: Optional[UnpackTimings] = None,
+        metrics: Optional[MetricsRecorder] = None,
+    ) -> None:
+        phases = timings if timings is not None else UnpackTimings()
+        stream = self._open_stream(phases)
+
+        files_total = len(self.included_files)
+        bytes_total = sum(size for _, _, size in self.included_files)
+        bytes_done = makedirs_calls = utime_calls = 0
+        root = os.path.abspath(output_dir)
+        for files_done, (src_path, modified_at, size) in enumerate(self.included_files):
+            path = os.path.join(root, *src_path.split("\\"))
+            started = time.perf_counter()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            makedirs_calls += 1
+            phases.write += time.perf_counter() - started
+
+            def on_chunk(length: int, remaining: int) -> None:
+                nonlocal bytes_done
+                bytes_done += length
+                if progress is not None and remaining > 0:
+                    progress(UnpackProgress(files_done, files_total, bytes_done, bytes_total, src_path))
+
+            self._write_streamed(stream, path, size, phases, on_chunk)
+            started = time.perf_counter()
+            utime_calls += _apply_file_mtime(path, modified_at)
+            phases.metadata += time.perf_counter() - started
+            if progress is not None:
+                progress(UnpackProgress(files_done + 1, files_total, bytes_done, bytes_total, src_path))
+
+        _record_reader_metrics(
+            metrics, stream.bytes_in, stream.bytes_out, bytes_done, files_total, makedirs_calls, utime_calls
+        )
+
+    def _open_stream(self, phases: UnpackTimings) -> InflatingReader:
+        """Открывает разжимающий поток и читает таблицу файлов."""
+        stream = InflatingReader(self.file, self.CHUNK_SIZE)
+        started = time.perf_counter()
+        manifest = read_supply_manifest(stream)
+        self.description.update(manifest.description)
+        self.included_files.extend(manifest.included_files)
+        phases.parse += time.perf_counter() - started
+        return stream
+
+    def _write_streamed(
+        self,
+        stream: InflatingReader,
+        path: str,
+        size: int,
+        phases: UnpackTimings,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        clock = time.perf_counter
+        started = clock()
+        with self._create_output_file(path) as out_file:
+            phases.write += clock() - started
+            remaining = size
+            while remaining > 0:
+                started = clock()
+                chunk = _read_exact(stream, min(self.CHUNK_SIZE, remaining))
+                inflated = clock()
+                out_file.write(chunk)
+                phases.inflate += inflated - started
+                phases.write += clock() - inflated
+                remaining -= len(chunk)
+                if on_chunk is not None:
+                    on_chunk(len(chunk), remaining)
+
+
+class PooledSupplyReader(StreamingSupplyReader):
+    """
+    Потоковая распаковка, в которой запись файлов и установка mtime идут в пуле потоков.
+
+    Разжатие остаётся последовательным: файлы до `max_pending_bytes` читаются
+    в память целиком и передаются писателям, суммарный объём ожидающих записи
+    данных ограничен тем же значением. Более крупные файлы пишутся потоково
+    из основного потока.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        writers: int = DEFAULT_WRITERS,
+        max_pending_bytes: int = DEFAULT_MAX_PENDING_BYTES,
+    ) -> None:
+        super().__init__(file)
+        self.writers = max(1, writers)
+        self.max_pending_bytes = max_pending_bytes
+
+    def unpack(
+        self,
+        output_dir: str,
+        progress: Optional[ProgressCallback] = None,
+        timings: Optional[UnpackTimings] = None,
+        metrics: Optional[MetricsRecorder] = None,
+    ) -> None:
+        phases = timings if timings is not None else UnpackTimings()
+        clock = time.perf_counter
+        stream = self._open_stream(phases)
+
+        files_total = len(self.included_files)
+        bytes_total = sum(size for _, _, size in self.included_files)
+        bytes_done = utime_calls = 0
+        root = os.path.abspath(output_dir)
+        created_dirs: Set[str] = set()
+        budget = threading.Condition()
+        pending_bytes = 0
+
+        def write(path: str, data: bytes, modified_at: dt.datetime) -> Tuple[float, float, bool]:
+            nonlocal pending_bytes
+            try:
+                started = clock()
+                with self._create_output_file(path) as out_file:
+                    out_file.write(data)
+                written = clock()
+                applied = _apply_file_mtime(path, modified_at)
+                return written - started, clock() - written, applied
+            finally:
+                with budget:
+                    pending_bytes -= len(data)
+                    budget.notify_all()
+
+        futures: List["Future[Tuple[float, float, bool]]"] = []
+        with ThreadPoolExecutor(max_workers=self.writers, thread_name_prefix="efd-writer") as executor:
+            for files_done, (src_path, modified_at, size) in enumerate(self.included_files):
+                path = os.path.join(root, *src_path.split("\\"))
+                directory = os.path.dirname(path)
+                if directory not in created_dirs:
+                    started = clock()
+                    os.makedirs(directory, exist_ok=True)
+                    created_dirs.add(directory)
+                    phases.write += clock() - started
+
+                if size > self.max_pending_bytes:
+                    self._write_streamed(stream, path, size, phases)
+                    started = clock()
+                    utime_calls += _apply_file_mtime(path, modified_at)
+                    phases.metadata += clock() - started
+                else:
+                    with budget:
+                        while pending_bytes and pending_bytes + size > self.max_pending_bytes:
+                            budget.wait()
+                        pending_bytes += size
+                    started = clock()
+                    data = _read_exact(stream, size)
+                    phases.inflate += clock() - started
+                    futures.append(executor.submit(write, path, data, modified_at))
+
+                bytes_done += size
+                if progress is not None:
+                    progress(UnpackProgress(files_done + 1, files_total, bytes_done, bytes_total, src_path))
+
+        for future in futures:
+            write_time, metadata_time, applied = future.result()
+            phases.write += write_time
+            phases.metadata += metadata_time
+            utime_calls += applied
+
+        _record_reader_metrics(
+            metrics, stream.bytes_in, stream.bytes_out, bytes_done, files_total, len(created_dirs), utime_calls
+        )
+
+
+class HashingReader:
+    """Обёртка над входным файлом, обновляющая хеш прочитанными байтами."""
+
+    def __init__(self, handle: BinaryIO, digest: Any) -> None:
+        self._handle = handle
+        self._digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._handle.read(size)
+        self._digest.update(data)
+        return data
+
+
+class CancellableReader:
+    """Обёртка над входным файлом, прерывающая чтение после установки `cancel`."""
+
+    def __init__(self, handle: Any, cancel: threading.Event) -> None:
+        self._handle = handle
+        self._cancel = cancel
+
+    def read(self, size: int = -1) -> bytes:
+        if self._cancel.is_set():
+            raise UnpackError(UnpackErrorCode.CANCELLED)
+        return self._handle.read(size)
+
+
+def _cancellable_progress(progress: Optional[ProgressCallback], cancel: threading.Event) -> ProgressCallback:
+    def report(snapshot: UnpackProgress) -> None:
+        if cancel.is_set():
+            raise UnpackError(UnpackErrorCode.CANCELLED)
+        if progress is not None:
+            progress(snapshot)
+
+    return report
+
+
+def _read_exact(stream: InflatingReader, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise UnpackError(UnpackErrorCode.INVALID_FORMAT, {"error": "unexpected end of data"})
+    return data
+
+
+def _record_reader_metrics(
+    metrics: Optional[MetricsRecorder],
+    bytes_read: int,
+    bytes_inflated: int,
+    bytes_written: int,
+    files_written: int,
+    makedirs_calls: int,
+    utime_calls: int,
+) -> None:
+    if metrics is None:
+        return
+    metrics.increment(MetricNames.BYTES_READ, bytes_read)
+    metrics.increment(MetricNames.BYTES_INFLATED, bytes_inflated)
+    metrics.increment(MetricNames.BYTES_WRITTEN, bytes_written)
+    metrics.increment(MetricNames.FILES_WRITTEN, files_written)
+    metrics.increment(MetricNames.MAKEDIRS_CALLS, makedirs_calls)
+    metrics.increment(MetricNames.UTIME_CALLS, utime_calls)
 
 
 def _default_reader_factory(handle: BinaryIO) -> SupplyReaderProtocol:
     return SafeSupplyReader(handle)
 
 
+def create_reader_factory(mode: str = UNPACK_MODE_SPOOL, writers: int = DEFAULT_WRITERS) -> SupplyReaderFactory:
+    """
+    Фабрика читателя для режима распаковки.
+
+    `spool` — разжатие во временный файл (поведение по умолчанию), `stream` — запись
+    по мере разжатия, `pooled` — потоковое разжатие с записью файлов в пуле из `writers` потоков.
+    """
+    if mode == UNPACK_MODE_SPOOL:
+        return _default_reader_factory
+    if mode == UNPACK_MODE_STREAM:
+        return StreamingSupplyReader
+    if mode == UNPACK_MODE_POOLED:
+        return lambda handle: PooledSupplyReader(handle, writers=writers)
+    raise ValueError(f"unknown unpack mode: {mode}")
+
+
 class UnpackService:
     """
     Выполняет распаковку с помощью onec_dtools.SupplyReader.
@@ -99,15 +463,108 @@ class UnpackService:
     def __init__(self, reader_factory: SupplyReaderFactory = _default_reader_factory) -> None:
         self._reader_factory = reader_factory
 
-    def unpack(self, input_file: str, output_dir: str) -> None:
-        """Распаковывает файл или поднимает UnpackError."""
+    def unpack(
+        self,
+        input_file: str,
+        output_dir: str,
+        progress: Optional[ProgressCallback] = None,
+        digest: Any = None,
+        timings: Optional[UnpackTimings] = None,
+        metrics: Optional[MetricsRecorder] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> SupplyManifest:
+        """
+        Распаковывает файл или поднимает UnpackError.
+
+        Если передан `digest` (объект hashlib), он обновляется байтами входного файла
+        по мере чтения — без отдельного прохода по файлу. В `timings` накапливается
+        время этапов inflate/parse/write/metadata, в `metrics` — счётчики и таймеры
+        из MetricNames. Установленный `cancel` прерывает распаковку при следующем
+        чтении входного файла или отчёте о прогрессе с UnpackErrorCode.CANCELLED.
+        При отмене или ошибке созданные этой распаковкой файлы удаляются, чтобы
+        в каталоге не оставался частично распакованный шаблон.
+        """
+        options: Dict[str, Any] = {}
+        if cancel is not None:
+            progress = _cancellable_progress(progress, cancel)
+        if progress is not None:
+            options["progress"] = progress
+        phases = timings
+        if metrics is not None:
+            phases = UnpackTimings()
+            options["metrics"] = metrics
+        if phases is not None:
+            options["timings"] = phases
+        started = time.perf_counter()
+        reader: Optional[SupplyReaderProtocol] = None
         try:
+            with _translate_errors():
+                with open(input_file, "rb") as handle:
+                    source: Any = handle if digest is None else HashingReader(handle, digest)
+                    if cancel is not None:
+                        source = CancellableReader(source, cancel)
+                    reader = self._reader_factory(source)
+                    reader.unpack(output_dir, **options)
+        except UnpackError:
+            if reader is not None:
+                _remove_partial_output(output_dir, getattr(reader, "created_files", []))
+            if metrics is not None:
+                metrics.increment(MetricNames.UNPACK_ERRORS)
+            raise
+        if metrics is not None and phases is not None:
+            _record_unpack_metrics(metrics, time.perf_counter() - started, phases)
+            if timings is not None:
+                timings.merge(phases)
+        return SupplyManifest(
+            description=dict(getattr(reader, "description", {})),
+            included_files=list(getattr(reader, "included_files", [])),
+        )
+
+    def probe(self, input_file: str) -> SupplyManifest:
+        """Читает только заголовок и таблицу файлов, не распаковывая содержимое."""
+        with _translate_errors():
             with open(input_file, "rb") as handle:
-                reader = self._reader_factory(handle)
-                reader.unpack(output_dir)
-        except FileNotFoundError as exc:
-            raise UnpackError(UnpackErrorCode.FILE_NOT_FOUND) from exc
-        except PermissionError as exc:
-            raise UnpackError(UnpackErrorCode.PERMISSION) from exc
-        except Exception as exc:  # pragma: no cover - неожиданные ошибки
-            raise UnpackError(UnpackErrorCode.UNEXPECTED, {"error": str(exc)}) from exc
+                return read_supply_manifest(InflatingReader(handle))
+
+
+def _remove_partial_output(output_dir: str, paths: List[str]) -> None:
+    """Удаляет файлы прерванной распаковки и опустевшие после этого подкаталоги `output_dir`."""
+    root = os.path.abspath(output_dir)
+    directories: Set[str] = set()
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        directories.add(os.path.dirname(path))
+    for directory in sorted(directories, key=len, reverse=True):
+        while directory.startswith(root + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+
+
+def _record_unpack_metrics(metrics: MetricsRecorder, elapsed: float, phases: UnpackTimings) -> None:
+    metrics.increment(MetricNames.UNPACKS)
+    metrics.observe(MetricNames.UNPACK_TIME, elapsed)
+    metrics.observe(MetricNames.INFLATE_TIME, phases.inflate)
+    metrics.observe(MetricNames.PARSE_TIME, phases.parse)
+    metrics.observe(MetricNames.WRITE_TIME, phases.write)
+    metrics.observe(MetricNames.METADATA_TIME, phases.metadata)
+
+
+@contextmanager
+def _translate_errors() -> Iterator[None]:
+    """Приводит системные исключения к UnpackError."""
+    try:
+        yield
+    except DomainError:
+        raise
+    except FileNotFoundError as exc:
+        raise UnpackError(UnpackErrorCode.FILE_NOT_FOUND) from exc
+    except PermissionError as exc:
+        raise UnpackError(UnpackErrorCode.PERMISSION) from exc
+    except Exception as exc:  # pragma: no cover - неожиданные ошибки
+        raise UnpackError(UnpackErrorCode.UNEXPECTED, {"error": str(exc)}) from exc
@@ -0,0 +1,207 @@
+"""
+Наблюдение за входящим каталогом: inotify на Linux, опрос на остальных системах.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Protocol, Set, Tuple
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_SETTLE_TIME = 2.0
+
+
+class DirectoryWatcher(Protocol):
+    """Источник полностью записанных файлов во входящем каталоге."""
+
+    def poll(self, timeout: float) -> List[str]:  # pragma: no cover - протокол
+        ...
+
+    def close(self) -> None:  # pragma: no cover - протокол
+        ...
+
+
+class StabilityTracker:
+    """
+    Отдаёт файл, когда его размер и mtime не менялись `settle_time` секунд.
+
+    Каждый файл отдаётся один раз, пока он остаётся в каталоге.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        extension: str,
+        settle_time: float = DEFAULT_SETTLE_TIME,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.directory = directory
+        self.extension = extension.lower()
+        self.settle_time = settle_time
+        self._clock = clock
+        self._candidates: Dict[str, Tuple[int, int, float]] = {}
+        self._reported: Set[str] = set()
+
+    def scan(self) -> List[str]:
+        now = self._clock()
+        present: Set[str] = set()
+        ready: List[str] = []
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return ready
+
+        for entry in entries:
+            if not entry.name.lower().endswith(self.extension):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat_result = entry.stat()
+            except OSError:
+                continue
+            present.add(entry.path)
+            if entry.path in self._reported:
+                continue
+
+            signature = (stat_result.st_size, stat_result.st_mtime_ns)
+            previous = self._candidates.get(entry.path)
+            if previous is None or previous[:2] != signature:
+                self._candidates[entry.path] = (*signature, now)
+                continue
+            if now - previous[2] >= self.settle_time and stat_result.st_size > 0:
+                ready.append(entry.path)
+
+        for path in ready:
+            self._candidates.pop(path, None)
+            self._reported.add(path)
+        self._candidates = {path: value for path, value in self._candidates.items() if path in present}
+        self._reported &= present
+        return sorted(ready)
+
+    def mark_reported(self, path: str) -> None:
+        self._candidates.pop(path, None)
+        self._reported.add(path)
+
+    @property
+    def has_candidates(self) -> bool:
+        return bool(self._candidates)
+
+
+class PollingWatcher:
+    """Периодически сканирует каталог и отдаёт файлы со стабильным размером."""
+
+    def __init__(
+        self,
+        directory: str,
+        extension: str,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        settle_time: float = DEFAULT_SETTLE_TIME,
+    ) -> None:
+        self.interval = interval
+        self._tracker = StabilityTracker(directory, extension, settle_time)
+        self._next_scan = 0.0
+
+    def poll(self, timeout: float) -> List[str]:
+        delay = max(0.0, self._next_scan - time.monotonic())
+        if delay > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(delay)
+        self._next_scan = time.monotonic() + self.interval
+        return self._tracker.scan()
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Ждёт IN_CLOSE_WRITE/IN_MOVED_TO через inotify, не расходуя CPU на опрос.
+
+    Файлы, лежавшие в каталоге до запуска, проходят проверку стабильности размера.
+    """
+
+    def __init__(self, directory: str, extension: str, settle_time: float = DEFAULT_SETTLE_TIME) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        watch = libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if watch < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, os.strerror(errno), directory)
+
+        self.directory = directory
+        self.extension = extension.lower()
+        self._fd = fd
+        self._tracker = StabilityTracker(directory, extension, settle_time)
+        self._tracker.scan()
+
+    def poll(self, timeout: float) -> List[str]:
+        if self._tracker.has_candidates:
+            timeout = min(timeout, self._tracker.settle_time)
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        ready: List[str] = []
+        if readable:
+            for name in self._read_events():
+                if name.lower().endswith(self.extension):
+                    path = os.path.join(self.directory, name)
+                    self._tracker.mark_reported(path)
+                    ready.append(path)
+        if self._tracker.has_candidates:
+            ready.extend(self._tracker.scan())
+        return ready
+
+    def _read_events(self) -> List[str]:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if raw_name:
+                names.append(os.fsdecode(raw_name))
+        return names
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_directory_watcher(
+    directory: str,
+    extension: str,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    settle_time: float = DEFAULT_SETTLE_TIME,
+    use_inotify: Optional[bool] = None,
+) -> DirectoryWatcher:
+    """Создаёт inotify-наблюдатель на Linux, иначе — опрашивающий."""
+    if use_inotify is None:
+        use_inotify = sys.platform.startswith("linux")
+    if use_inotify:
+        try:
+            return InotifyWatcher(directory, extension, settle_time)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, extension, interval, settle_time)
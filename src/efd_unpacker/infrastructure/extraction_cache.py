@@ -0,0 +1,378 @@
+"""
+Кеш результатов распаковки, ключом которого служит хеш содержимого EFD.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..runtime import get_app_data_dir
+
+HASH_ALGORITHM = "sha256"
+CACHE_ENV = "EFD_UNPACKER_CACHE"
+CACHE_BUDGET_ENV = "EFD_UNPACKER_CACHE_BUDGET_MB"
+DEFAULT_CACHE_BUDGET = 2048 * 1024 * 1024
+MAX_ENTRIES = 1000
+MAX_STAT_MEMO = 1000
+INDEX_VERSION = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def new_digest() -> Any:
+    return hashlib.new(HASH_ALGORITHM)
+
+
+def hash_file(path: str) -> str:
+    """Хеширует файл целиком — нужен только при совпадении размера с записью кеша."""
+    digest = new_digest()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """
+    Сведения о последней распаковке содержимого с данным хешем.
+
+    `manifest` и `files` хранятся в отдельном файле записи и читаются в `lookup`:
+    индекс, который переписывается при каждом попадании, остаётся небольшим.
+    """
+
+    content_hash: str
+    input_size: int
+    output_dir: str
+    extracted_at: float
+    last_used: float
+    tree_bytes: int = 0
+    has_tree: bool = False
+    manifest: Dict[str, Any] = field(default_factory=dict)
+    files: List[List[Any]] = field(default_factory=list)
+
+
+DETAIL_FIELDS = ("manifest", "files")
+
+
+@dataclass
+class CacheStats:
+    root: str
+    entries: int
+    trees: int
+    tree_bytes: int
+    budget_bytes: int
+
+
+class ExtractionCache:
+    """
+    Индекс распаковок и копии деревьев в пределах дискового бюджета.
+
+    Дерево файлов сохраняется только жёсткими ссылками: если каталог распаковки
+    на другом томе, дерево не создаётся, чтобы не записывать данные второй раз.
+    Деревья вытесняются по LRU, когда их суммарный размер превышает бюджет.
+    Метаданные о месте последней распаковки хранятся и без дерева.
+    """
+
+    def __init__(self, root: Path, budget_bytes: int = DEFAULT_CACHE_BUDGET) -> None:
+        self.root = Path(root)
+        self.budget_bytes = max(0, budget_bytes)
+        self._lock = threading.RLock()
+        self._entries: Dict[str, CacheEntry] = {}
+        self._stat_memo: Dict[str, List[Any]] = {}
+        self._index_mtime: Optional[int] = None
+
+    @classmethod
+    def from_environment(cls) -> Optional["ExtractionCache"]:
+        """Кеш в каталоге данных приложения, если он включён переменной окружения."""
+        if not os.environ.get(CACHE_ENV):
+            return None
+        return cls.default()
+
+    @classmethod
+    def default(cls) -> "ExtractionCache":
+        """Кеш в каталоге данных приложения с бюджетом из окружения."""
+        budget = DEFAULT_CACHE_BUDGET
+        budget_mb = os.environ.get(CACHE_BUDGET_ENV)
+        if budget_mb and budget_mb.isdigit():
+            budget = int(budget_mb) * 1024 * 1024
+        return cls(get_app_data_dir() / "cache", budget)
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def _tree_path(self, content_hash: str) -> Path:
+        return self.root / "trees" / content_hash
+
+    def _details_path(self, content_hash: str) -> Path:
+        return self.root / "entries" / f"{content_hash}.json"
+
+    def known_hash(self, input_file: str, stat_result: os.stat_result) -> Optional[str]:
+        """Хеш из памяти по (путь, размер, mtime), чтобы не читать файл повторно."""
+        with self._lock:
+            self._load()
+            memo = self._stat_memo.get(os.path.abspath(input_file))
+            if memo and memo[0] == stat_result.st_size and memo[1] == stat_result.st_mtime_ns:
+                return memo[2]
+            return None
+
+    def has_input_size(self, size: int) -> bool:
+        with self._lock:
+            self._load()
+            return any(entry.input_size == size for entry in self._entries.values())
+
+    def remember_hash(self, input_file: str, stat_result: os.stat_result, content_hash: str) -> None:
+        with self._lock:
+            self._load()
+            self._remember_hash(input_file, stat_result, content_hash)
+            self._save()
+
+    def lookup(self, content_hash: str) -> Optional[CacheEntry]:
+        """Запись вместе с манифестом и списком файлов или None."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(content_hash)
+            if entry is None:
+                return None
+            try:
+                details = json.loads(self._details_path(content_hash).read_text(encoding="utf-8"))
+                entry.manifest = dict(details["manifest"])
+                entry.files = list(details["files"])
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+            return entry
+
+    def materialize(self, entry: CacheEntry, output_dir: str) -> bool:
+        """
+        Делает `output_dir` идентичным закешированной распаковке.
+
+        Возвращает False, если ни прошлый каталог распаковки, ни дерево кеша
+        больше не совпадают с манифестом — тогда нужна обычная распаковка.
+        """
+        target = os.path.abspath(output_dir)
+        with self._lock:
+            self._load()
+            if _same_path(target, entry.output_dir) and _tree_matches(target, entry.files):
+                self._touch(entry, target)
+                return True
+
+            tree = str(self._tree_path(entry.content_hash))
+            if entry.has_tree:
+                if _tree_matches(tree, entry.files):
+                    _populate(tree, target, entry.files, link=True)
+                    self._touch(entry, target)
+                    return True
+                self._drop_tree(entry)
+
+            if _tree_matches(entry.output_dir, entry.files):
+                _populate(entry.output_dir, target, entry.files, link=False)
+                self._touch(entry, target)
+                return True
+
+            self._save()
+            return False
+
+    def record(
+        self,
+        content_hash: str,
+        input_file: str,
+        stat_result: os.stat_result,
+        output_dir: str,
+        manifest: Dict[str, Any],
+    ) -> CacheEntry:
+        """Запоминает распаковку и при наличии бюджета сохраняет дерево жёсткими ссылками."""
+        target = os.path.abspath(output_dir)
+        files = []
+        for item in manifest.get("files", []):
+            relative = item["path"].replace("\\", "/")
+            file_stat = os.stat(_join(target, relative))
+            files.append([relative, file_stat.st_size, file_stat.st_mtime_ns])
+
+        now = time.time()
+        entry = CacheEntry(
+            content_hash=content_hash,
+            input_size=stat_result.st_size,
+            output_dir=target,
+            extracted_at=now,
+            last_used=now,
+            manifest=manifest,
+            files=files,
+            tree_bytes=sum(size for _, size, _ in files),
+        )
+        with self._lock:
+            self._load()
+            previous = self._entries.get(content_hash)
+            if previous is not None and previous.has_tree:
+                self._drop_tree(previous)
+            self._save_details(entry)
+            if 0 < entry.tree_bytes <= self.budget_bytes:
+                entry.has_tree = self._store_tree(content_hash, target, files)
+            self._entries[content_hash] = entry
+            self._remember_hash(input_file, stat_result, content_hash)
+            self._evict()
+            self._save()
+        return entry
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            self._load()
+            trees = [entry for entry in self._entries.values() if entry.has_tree]
+            return CacheStats(
+                root=str(self.root),
+                entries=len(self._entries),
+                trees=len(trees),
+                tree_bytes=sum(entry.tree_bytes for entry in trees),
+                budget_bytes=self.budget_bytes,
+            )
+
+    def purge(self) -> int:
+        """Удаляет все записи и деревья. Возвращает число удалённых записей."""
+        with self._lock:
+            self._load()
+            removed = len(self._entries)
+            shutil.rmtree(self.root / "trees", ignore_errors=True)
+            shutil.rmtree(self.root / "entries", ignore_errors=True)
+            self._entries.clear()
+            self._stat_memo.clear()
+            self._save()
+            return removed
+
+    def _touch(self, entry: CacheEntry, output_dir: str) -> None:
+        entry.last_used = time.time()
+        entry.output_dir = output_dir
+        self._save()
+
+    def _remember_hash(self, input_file: str, stat_result: os.stat_result, content_hash: str) -> None:
+        key = os.path.abspath(input_file)
+        self._stat_memo.pop(key, None)
+        self._stat_memo[key] = [stat_result.st_size, stat_result.st_mtime_ns, content_hash]
+        while len(self._stat_memo) > MAX_STAT_MEMO:
+            self._stat_memo.pop(next(iter(self._stat_memo)))
+
+    def _store_tree(self, content_hash: str, source_dir: str, files: List[List[Any]]) -> bool:
+        tree = self._tree_path(content_hash)
+        partial = tree.with_name(f"{content_hash}.partial")
+        shutil.rmtree(partial, ignore_errors=True)
+        try:
+            _link_tree(source_dir, str(partial), files)
+            os.replace(partial, tree)
+        except OSError:
+            shutil.rmtree(partial, ignore_errors=True)
+            return False
+        return True
+
+    def _save_details(self, entry: CacheEntry) -> None:
+        path = self._details_path(entry.content_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        details = {"manifest": entry.manifest, "files": entry.files}
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(details, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _drop_tree(self, entry: CacheEntry) -> None:
+        shutil.rmtree(self._tree_path(entry.content_hash), ignore_errors=True)
+        entry.has_tree = False
+
+    def _evict(self) -> None:
+        by_age = sorted(self._entries.values(), key=lambda item: item.last_used)
+        used = sum(entry.tree_bytes for entry in by_age if entry.has_tree)
+        for entry in by_age:
+            if used <= self.budget_bytes:
+                break
+            if entry.has_tree:
+                self._drop_tree(entry)
+                used -= entry.tree_bytes
+        for entry in by_age[: max(0, len(by_age) - MAX_ENTRIES)]:
+            if entry.has_tree:
+                self._drop_tree(entry)
+            self._details_path(entry.content_hash).unlink(missing_ok=True)
+            del self._entries[entry.content_hash]
+
+    def _load(self) -> None:
+        try:
+            mtime = self._index_path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._index_mtime:
+            return
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                return
+            self._entries = {key: CacheEntry(**value) for key, value in data.get("entries", {}).items()}
+            self._stat_memo = dict(data.get("stat_memo", {}))
+        except (OSError, ValueError, TypeError):
+            return
+        self._index_mtime = mtime
+
+    def _save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "entries": {key: _index_fields(entry) for key, entry in self._entries.items()},
+            "stat_memo": self._stat_memo,
+        }
+        tmp_path = self._index_path.with_name(f"index.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
+        self._index_mtime = self._index_path.stat().st_mtime_ns
+
+
+def _index_fields(entry: CacheEntry) -> Dict[str, Any]:
+    data = asdict(entry)
+    for name in DETAIL_FIELDS:
+        del data[name]
+    return data
+
+
+def _join(root: str, relative: str) -> str:
+    return os.path.join(root, *relative.split("/"))
+
+
+def _same_path(left: str, right: str) -> bool:
+    return os.path.normcase(os.path.normpath(left)) == os.path.normcase(os.path.normpath(right))
+
+
+def _tree_matches(root: str, files: List[List[Any]]) -> bool:
+    for relative, size, mtime_ns in files:
+        try:
+            file_stat = os.stat(_join(root, relative))
+        except OSError:
+            return False
+        if file_stat.st_size != size or file_stat.st_mtime_ns != mtime_ns:
+            return False
+    return True
+
+
+def _link_tree(source_root: str, target_root: str, files: List[List[Any]]) -> None:
+    """Раскладывает файлы только жёсткими ссылками; OSError, если ссылку создать нельзя."""
+    for relative, _size, _mtime_ns in files:
+        target = _join(target_root, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.link(_join(source_root, relative), target)
+
+
+def _populate(source_root: str, target_root: str, files: List[List[Any]], link: bool) -> None:
+    """Раскладывает файлы жёсткими ссылками, а при невозможности — копиями с сохранением mtime."""
+    for relative, _size, mtime_ns in files:
+        source = _join(source_root, relative)
+        target = _join(target_root, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.lexists(target):
+            os.unlink(target)
+        if link:
+            try:
+                os.link(source, target)
+                continue
+            except OSError:
+                pass
+        shutil.copyfile(source, target)
+        os.utime(target, ns=(mtime_ns, mtime_ns))
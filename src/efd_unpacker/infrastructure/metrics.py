@@ -0,0 +1,218 @@
+"""
+Сбор метрик распаковки и их выгрузка: лог, JSON lines, текстовый формат Prometheus.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Protocol
+
+from ..domain.metrics import MetricNames
+
+METRICS_PREFIX = "efd_unpacker"
+DEFAULT_REPORT_INTERVAL = 10.0
+SINK_LOG = "log"
+SINK_JSONL = "jsonl"
+SINK_PROMETHEUS = "prometheus"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TimerStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+
+@dataclass
+class MetricsSnapshot:
+    """Состояние метрик на момент выгрузки."""
+
+    timestamp: float
+    uptime: float
+    counters: Dict[str, float] = field(default_factory=dict)
+    timers: Dict[str, TimerStats] = field(default_factory=dict)
+
+    @property
+    def files_per_second(self) -> float:
+        """Файлов в секунду за время, проведённое в распаковке."""
+        busy = self.timers.get(MetricNames.UNPACK_TIME)
+        if busy is None or busy.total <= 0:
+            return 0.0
+        return self.counters.get(MetricNames.FILES_WRITTEN, 0) / busy.total
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "timestamp": self.timestamp,
+            "uptime": self.uptime,
+            "counters": dict(self.counters),
+            "timers": {
+                name: {"count": stats.count, "sum": stats.total, "max": stats.max}
+                for name, stats in self.timers.items()
+            },
+            "files_per_second": self.files_per_second,
+        }
+
+
+class MetricsRegistry:
+    """Потокобезопасная реализация MetricsRecorder в памяти процесса."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._counters: Dict[str, float] = {}
+        self._timers: Dict[str, TimerStats] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                stats = self._timers[name] = TimerStats()
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            return MetricsSnapshot(
+                timestamp=time.time(),
+                uptime=time.monotonic() - self._started,
+                counters=dict(self._counters),
+                timers={name: TimerStats(stats.count, stats.total, stats.max) for name, stats in self._timers.items()},
+            )
+
+
+class MetricsSink(Protocol):
+    def write(self, snapshot: MetricsSnapshot) -> None:  # pragma: no cover - протокол
+        ...
+
+
+class LoggingSink:
+    """Пишет сводку метрик одной строкой в logging."""
+
+    def __init__(self, target: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self._logger = target or logger
+        self._level = level
+
+    def write(self, snapshot: MetricsSnapshot) -> None:
+        counters = " ".join(f"{name}={value:g}" for name, value in sorted(snapshot.counters.items()))
+        timers = " ".join(
+            f"{name}={stats.total:.3f}s/{stats.count}" for name, stats in sorted(snapshot.timers.items())
+        )
+        self._logger.log(
+            self._level,
+            "metrics %s %s files_per_second=%.1f",
+            counters,
+            timers,
+            snapshot.files_per_second,
+        )
+
+
+class JsonLinesSink:
+    """Дописывает снимок метрик JSON-строкой в файл."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, snapshot: MetricsSnapshot) -> None:
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(snapshot.to_dict(), ensure_ascii=False) + "\n")
+
+
+class PrometheusTextSink:
+    """
+    Перезаписывает файл в текстовом формате Prometheus.
+
+    Подходит для textfile collector node_exporter: файл заменяется атомарно.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, snapshot: MetricsSnapshot) -> None:
+        lines: List[str] = []
+        for name, value in sorted(snapshot.counters.items()):
+            metric = f"{METRICS_PREFIX}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        for name, stats in sorted(snapshot.timers.items()):
+            metric = f"{METRICS_PREFIX}_{name}_seconds"
+            lines += [
+                f"# TYPE {metric} summary",
+                f"{metric}_sum {stats.total:.6f}",
+                f"{metric}_count {stats.count}",
+                f"# TYPE {metric}_max gauge",
+                f"{metric}_max {stats.max:.6f}",
+            ]
+        metric = f"{METRICS_PREFIX}_files_per_second"
+        lines += [f"# TYPE {metric} gauge", f"{metric} {snapshot.files_per_second:.3f}"]
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+def create_metrics_sink(spec: str) -> MetricsSink:
+    """
+    Создаёт приёмник по описанию `log`, `jsonl:<файл>` или `prometheus:<файл>`.
+
+    Поднимает ValueError для неизвестного описания.
+    """
+    kind, _, path = spec.partition(":")
+    if kind == SINK_LOG and not path:
+        return LoggingSink()
+    if kind == SINK_JSONL and path:
+        return JsonLinesSink(os.path.expanduser(path))
+    if kind == SINK_PROMETHEUS and path:
+        return PrometheusTextSink(os.path.expanduser(path))
+    raise ValueError(f"unknown metrics sink: {spec}")
+
+
+class MetricsReporter:
+    """Периодически выгружает метрики реестра в приёмники; при остановке — финальная выгрузка."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        sinks: Iterable[MetricsSink],
+        interval: float = DEFAULT_REPORT_INTERVAL,
+    ) -> None:
+        self.registry = registry
+        self.sinks = list(sinks)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsReporter":
+        self._thread = threading.Thread(target=self._run, name="efd-metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> None:
+        snapshot = self.registry.snapshot()
+        for sink in self.sinks:
+            try:
+                sink.write(snapshot)
+            except OSError as exc:
+                logger.warning("metrics sink failed: %s", exc)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
@@ -4,7 +4,8 @@ import subprocess
 import platform
 import locale
 import re
-from typing import List
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Добавляем импорт ctypes только для Windows
 if sys.platform.startswith('win'):
@@ -22,19 +23,17 @@ def get_1c_configuration_location_default() -> str:
         home = os.path.expanduser('~')
         return os.path.join(home, '.1cv8', '1C', '1cv8', 'tmplts')
 
-def get_1c_configuration_location_from_1cestart() -> List[str]:
+CONFIG_ENCODINGS = ('utf-8-sig', 'utf-16le', 'utf-8', 'cp1251')
+CONFIG_LOCATION_KEY = 'ConfigurationTemplatesLocation='
+
+
+def get_1cestart_config_paths() -> List[str]:
     """
-    Возвращает массив значений ConfigurationTemplatesLocation из файла 1cestart.cfg.
-    
-    Проверяет все возможные расположения файла для разных ОС:
+    Возвращает возможные расположения файла 1cestart.cfg для текущей ОС:
     - Linux/macOS: ~/.1C/1cestart/1cestart.cfg
     - Windows (для пользователя): %APPDATA%\1C\1CEStart\1cestart.cfg
     - Windows (для всех пользователей): %ALLUSERSPROFILE%\1C\1CEStart\1cestart.cfg
-    
-    Returns:
-        list: Массив путей к каталогам шаблонов конфигураций
     """
-    locations = []
     config_paths = []
     if sys.platform.startswith('win'):
         appdata = os.environ.get('APPDATA')
@@ -46,22 +45,102 @@ def get_1c_configuration_location_from_1cestart() -> List[str]:
     else:
         home = os.path.expanduser('~')
         config_paths.append(os.path.join(home, '.1C', '1cestart', '1cestart.cfg'))
-    for config_path in config_paths:
-        if os.path.isfile(config_path):
-            encodings_to_try = ['utf-8-sig', 'utf-16le', 'utf-8', 'cp1251']
-            for encoding in encodings_to_try:
-                try:
-                    with open(config_path, 'r', encoding=encoding) as f:
-                        for line in f:
-                            line = line.strip()
-                            if line.startswith('ConfigurationTemplatesLocation='):
-                                value = line.split('=', 1)[1]
-                                if value and value not in locations:
-                                    locations.append(value)
-                    break
-                except (UnicodeDecodeError, IOError):
-                    continue
-    return locations
+    return config_paths
+
+
+class ConfigurationLocationsProvider:
+    """
+    Кешированный разбор ConfigurationTemplatesLocation из файлов 1cestart.cfg.
+
+    Для каждого файла запоминаются mtime и размер: пока они не изменились, файл
+    не открывается повторно, достаточно одного stat. Изменённый файл читается
+    один раз целиком, кодировка подбирается по уже прочитанным байтам.
+    """
+
+    def __init__(self, config_paths: Optional[Callable[[], List[str]]] = None) -> None:
+        self._config_paths = config_paths or get_1cestart_config_paths
+        self._cache: Dict[str, Tuple[Tuple[int, int], Optional[str], List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def locations(self) -> List[str]:
+        """Возвращает пути каталогов шаблонов из всех найденных 1cestart.cfg без повторов."""
+        locations: List[str] = []
+        for config_path in self._config_paths():
+            for value in self._read(config_path):
+                if value not in locations:
+                    locations.append(value)
+        return locations
+
+    def encoding(self, config_path: str) -> Optional[str]:
+        """Кодировка, определённая при последнем чтении файла (None — файл не прочитан)."""
+        with self._lock:
+            entry = self._cache.get(config_path)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _read(self, config_path: str) -> List[str]:
+        try:
+            stat = os.stat(config_path)
+        except OSError:
+            with self._lock:
+                self._cache.pop(config_path, None)
+            return []
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._cache.get(config_path)
+        if entry is not None and entry[0] == key:
+            return entry[2]
+        try:
+            with open(config_path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            return []
+        encoding, values = _parse_1cestart(data)
+        with self._lock:
+            self._cache[config_path] = (key, encoding, values)
+        return values
+
+
+def _parse_1cestart(data: bytes) -> Tuple[Optional[str], List[str]]:
+    for encoding in CONFIG_ENCODINGS:
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        values = []
+        for line in text.lstrip('\ufeff').splitlines():
+            line = line.strip()
+            if line.startswith(CONFIG_LOCATION_KEY):
+                value = line.split('=', 1)[1]
+                if value and value not in values:
+                    values.append(value)
+        return encoding, values
+    return None, []
+
+
+# Общий для GUI и консольных режимов: повторные обращения стоят одного stat на файл.
+configuration_locations = ConfigurationLocationsProvider()
+
+
+def get_1c_configuration_location_from_1cestart() -> List[str]:
+    """
+    Возвращает массив значений ConfigurationTemplatesLocation из файла 1cestart.cfg.
+
+    Расположения файла — см. get_1cestart_config_paths. Результат кешируется
+    по mtime и размеру каждого файла.
+
+    Returns:
+        list: Массив путей к каталогам шаблонов конфигураций
+    """
+    return configuration_locations.locations()
+
+def get_1c_configuration_location_preferred() -> str:
+    """Каталог шаблонов для консольных режимов: первый из 1cestart.cfg или путь по умолчанию."""
+    locations = get_1c_configuration_location_from_1cestart()
+    return locations[0] if locations else get_1c_configuration_location_default()
 
 def open_folder(path: str) -> bool:
     """Открывает указанный путь в системном файловом менеджере."""
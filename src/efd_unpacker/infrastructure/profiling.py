@@ -0,0 +1,187 @@
+"""
+Профилирование распаковки: cProfile или сэмплирующий профилировщик, пик памяти через tracemalloc.
+
+Модули профилировщиков загружаются только при включённом профилировании.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+PROFILE_ENV = "EFD_UNPACKER_PROFILE"
+PROFILE_MEMORY_ENV = "EFD_UNPACKER_PROFILE_MEMORY"
+PROFILE_DIR_ENV = "EFD_UNPACKER_PROFILE_DIR"
+MODE_CPROFILE = "cprofile"
+MODE_SAMPLE = "sample"
+PROFILE_MODES = (MODE_CPROFILE, MODE_SAMPLE)
+DEFAULT_SAMPLE_INTERVAL = 0.005
+PROFILE_FILE_PREFIX = "efd_unpacker-profile"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileReport:
+    """Результат профилирования одного вызова."""
+
+    paths: List[str] = field(default_factory=list)
+    peak_memory: Optional[int] = None
+    samples: int = 0
+
+
+class SamplingProfiler:
+    """
+    Периодически снимает стек указанного потока и считает одинаковые стеки.
+
+    Результат записывается в формате collapsed stacks (`a;b;c 12`), который
+    понимают flamegraph.pl, speedscope и inferno.
+    """
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="efd-profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            for stack, count in self.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+
+
+class UnpackProfiler:
+    """
+    Профилирует блок кода и сохраняет результат в `profile_dir`.
+
+    Без `profile_dir` файл записывается рядом с каталогом распаковки, а не в него:
+    каталог распаковки — это шаблон 1С, посторонние файлы в нём не нужны.
+    """
+
+    def __init__(
+        self,
+        mode: str = MODE_CPROFILE,
+        trace_memory: bool = False,
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+        profile_dir: Optional[str] = None,
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode: {mode}")
+        self.mode = mode
+        self.trace_memory = trace_memory
+        self.sample_interval = sample_interval
+        self.profile_dir = profile_dir
+
+    @classmethod
+    def from_environment(cls) -> Optional["UnpackProfiler"]:
+        """
+        Профилировщик по `EFD_UNPACKER_PROFILE=cprofile|sample` (для GUI-сборки).
+
+        `EFD_UNPACKER_PROFILE_MEMORY=1` дополнительно включает tracemalloc,
+        `EFD_UNPACKER_PROFILE_DIR` задаёт каталог для файлов профиля.
+        """
+        mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+        if not mode or mode == "0":
+            return None
+        if mode not in PROFILE_MODES:
+            mode = MODE_CPROFILE
+        return cls(
+            mode,
+            trace_memory=bool(os.environ.get(PROFILE_MEMORY_ENV)),
+            profile_dir=os.environ.get(PROFILE_DIR_ENV) or None,
+        )
+
+    @contextmanager
+    def profile(self, input_file: str, output_dir: str) -> Iterator[ProfileReport]:
+        """
+        Профилирует тело блока в текущем потоке.
+
+        Файл результата (`.prof` для cProfile, `.collapsed` для сэмплирования)
+        записывается в `profile_dir` или каталог, содержащий `output_dir`; пути —
+        в `ProfileReport.paths`. Ошибка записи профиля только логируется и не
+        подменяет исключение из тела блока.
+        """
+        report = ProfileReport()
+        directory = self.profile_dir or os.path.dirname(os.path.abspath(output_dir))
+        base_path = os.path.join(directory, _profile_file_name(input_file))
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+
+        if self.mode == MODE_SAMPLE:
+            sampler = SamplingProfiler(threading.get_ident(), self.sample_interval)
+            sampler.start()
+            try:
+                yield report
+            finally:
+                sampler.stop()
+                report.samples = sum(sampler.stacks.values())
+                self._finish_memory(report)
+                _dump(report, f"{base_path}.collapsed", sampler.write_collapsed)
+            return
+
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            self._finish_memory(report)
+            _dump(report, f"{base_path}.prof", profiler.dump_stats)
+
+    def _finish_memory(self, report: ProfileReport) -> None:
+        if not self.trace_memory:
+            return
+        import tracemalloc
+
+        report.peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+
+def _dump(report: ProfileReport, path: str, write: Callable[[str], None]) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write(path)
+    except OSError as exc:
+        logger.warning("profile dump failed: %s", exc)
+        return
+    report.paths.append(path)
+
+
+def _profile_file_name(input_file: str) -> str:
+    stem = os.path.splitext(os.path.basename(input_file))[0] or "unpack"
+    now = time.time()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+    return f"{PROFILE_FILE_PREFIX}-{stem}-{stamp}.{int(now * 1000) % 1000:03d}"
@@ -23,12 +23,19 @@ class SettingsService:
     def set_output_path(self, path: str) -> None:
         self.settings.setValue("output_path", path)
 
-    def get_output_path_items(self, manual_selected_path: Optional[str] = None) -> List[Tuple[str, str]]:
+    def get_output_path_items(
+        self,
+        manual_selected_path: Optional[str] = None,
+        from_1cestart: Optional[List[str]] = None,
+    ) -> List[Tuple[str, str]]:
         """
         Возвращает список (path, label) для комбобокса, учитывая manual_selected_path, last_used, from_1cestart и default_path.
+
+        Если пути из 1cestart.cfg уже прочитаны (GUI читает их в фоновом потоке), они передаются в `from_1cestart`.
         """
         last_used = self.get_output_path()
-        from_1cestart = get_1c_configuration_location_from_1cestart()
+        if from_1cestart is None:
+            from_1cestart = get_1c_configuration_location_from_1cestart()
         default_path = get_1c_configuration_location_default()
         seen = set()
         items = []
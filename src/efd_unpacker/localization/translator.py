@@ -1,46 +1,123 @@
 """
 Загрузчик Qt-переводов из .ts файлов.
+
+Разобранный каталог сохраняется в компактном marshal-кеше рядом с данными
+приложения, по одному файлу на язык: пока содержимое .ts не изменилось, XML
+не разбирается. Ключ — хеш содержимого, а не путь и mtime: сборка PyInstaller
+--onefile распаковывает .ts в новый временный каталог при каждом запуске.
 """
 
 from __future__ import annotations
 
+import hashlib
+import marshal
 import os
-import xml.etree.ElementTree as ET
-from typing import Dict, Tuple
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ..runtime import get_app_data_dir, resource_path
 
-from ..runtime import resource_path
+CATALOG_FORMAT = 2
+CATALOG_SUFFIX = ".catalog"
+
+Catalog = Dict[Tuple[str, str], str]
 
 
 class Translator:
-    """Простая реализация каталога переводов."""
+    """
+    Простая реализация каталога переводов.
+
+    Каталог загружается при первом переводе, а не при создании: справка и команды,
+    которые ничего не выводят через переводчик, не тратят время на чтение .ts.
+    """
 
-    def __init__(self, lang: str = "en", translations_dir: str | None = None) -> None:
+    def __init__(
+        self,
+        lang: str = "en",
+        translations_dir: str | None = None,
+        cache_dir: str | None = None,
+    ) -> None:
         self.lang = lang
         self.translations_dir = translations_dir or resource_path("translations")
-        self._translations: Dict[Tuple[str, str], str] = {}
-        self.load()
+        if cache_dir is None and translations_dir is None:
+            cache_dir = str(get_app_data_dir() / "catalogs")
+        self.cache_dir = cache_dir
+        self._translations: Optional[Catalog] = None
 
     def load(self) -> None:
         ts_path = os.path.join(self.translations_dir, f"{self.lang}.ts")
-        self._translations.clear()
-        if not os.path.isfile(ts_path):
+        cache_path = self._catalog_path()
+        if cache_path is None:
+            self._translations = _parse_ts(ts_path) if os.path.exists(ts_path) else {}
             return
-        tree = ET.parse(ts_path)
-        root = tree.getroot()
-        for ctx in root.findall("context"):
-            name_elem = ctx.find("name")
-            context_name = name_elem.text if name_elem is not None else ""
-            for msg in ctx.findall("message"):
-                source_elem = msg.find("source")
-                translation_elem = msg.find("translation")
-                source = source_elem.text if source_elem is not None else ""
-                translation = translation_elem.text if translation_elem is not None else ""
-                self._translations[(context_name, source)] = translation
+        try:
+            with open(ts_path, "rb") as handle:
+                key = hashlib.sha1(handle.read()).hexdigest()
+        except OSError:
+            self._translations = {}
+            return
+        catalog = _read_catalog(cache_path, key)
+        if catalog is None:
+            catalog = _parse_ts(ts_path)
+            _write_catalog(cache_path, key, catalog)
+        self._translations = catalog
 
     def translate(self, context: str, source: str) -> str:
+        if self._translations is None:
+            self.load()
         translation = self._translations.get((context, source))
         return translation if translation else source
 
+    def _catalog_path(self) -> Optional[Path]:
+        if not self.cache_dir:
+            return None
+        return Path(self.cache_dir) / f"{self.lang}{CATALOG_SUFFIX}"
+
+
+def _parse_ts(ts_path: str) -> Catalog:
+    import xml.etree.ElementTree as ET
+
+    catalog: Catalog = {}
+    root = ET.parse(ts_path).getroot()
+    for ctx in root.findall("context"):
+        name_elem = ctx.find("name")
+        context_name = name_elem.text if name_elem is not None else ""
+        for msg in ctx.findall("message"):
+            source_elem = msg.find("source")
+            translation_elem = msg.find("translation")
+            source = source_elem.text if source_elem is not None else ""
+            translation = translation_elem.text if translation_elem is not None else ""
+            catalog[(context_name, source)] = translation
+    return catalog
+
+
+def _read_catalog(cache_path: Path, key: str) -> Optional[Catalog]:
+    """Каталог из кеша, если он записан для .ts с тем же хешем содержимого."""
+    try:
+        data = marshal.loads(cache_path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, tuple) or len(data) != 3 or data[0] != CATALOG_FORMAT or data[1] != key:
+        return None
+    return data[2] if isinstance(data[2], dict) else None
+
+
+def _write_catalog(cache_path: Path, key: str, catalog: Catalog) -> None:
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(marshal.dumps((CATALOG_FORMAT, key, catalog)))
+        os.replace(tmp_path, cache_path)
+        # Каталоги прежнего формата назывались <lang>-<хеш пути>.catalog.
+        for stale in cache_path.parent.glob(f"{cache_path.stem}-*{CATALOG_SUFFIX}"):
+            stale.unlink()
+    except OSError:
+        # Кеш — только ускорение: без прав на запись переводы берутся из XML.
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
 
 def create_translator(lang: str) -> Translator:
     """Фабрика для удобства."""
@@ -0,0 +1,56 @@
+"""
+Данные панели предпросмотра: дерево вложенных файлов EFD с размерами.
+
+Дерево строится из таблицы файлов заголовка (UnpackService.probe) без Qt;
+окно создаёт элементы только для раскрытых узлов.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from ..domain.supply_stream import IncludedFile
+
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+@dataclass
+class FileTreeNode:
+    """Каталог или файл комплекта; для каталога `size` и `files` — суммы по вложенным файлам."""
+
+    name: str
+    size: int = 0
+    files: int = 0
+    children: Dict[str, "FileTreeNode"] = field(default_factory=dict)
+
+    @property
+    def is_file(self) -> bool:
+        return not self.children
+
+    def sorted_children(self) -> List["FileTreeNode"]:
+        """Сначала каталоги, затем файлы, внутри групп — по имени без учёта регистра."""
+        return sorted(self.children.values(), key=lambda node: (node.is_file, node.name.lower()))
+
+
+def build_file_tree(included_files: Iterable[IncludedFile]) -> FileTreeNode:
+    root = FileTreeNode("")
+    for path, _modified_at, size in included_files:
+        node = root
+        node.size += size
+        node.files += 1
+        for part in path.split("\\"):
+            node = node.children.setdefault(part, FileTreeNode(part))
+            node.size += size
+            node.files += 1
+    return root
+
+
+def split_size(size: int) -> Tuple[str, str]:
+    """Размер для отображения: число с одним знаком после запятой и единица из SIZE_UNITS."""
+    value = float(size)
+    for unit in SIZE_UNITS:
+        if value < 1024 or unit == SIZE_UNITS[-1]:
+            return (f"{int(value)}" if unit == "B" else f"{value:.1f}"), unit
+        value /= 1024
+    raise AssertionError("unreachable")
@@ -0,0 +1,71 @@
+"""
+Прогресс распаковки для GUI: ограничение частоты обновлений, скорость и оставшееся время.
+
+Без зависимости от Qt: поток распаковки решает, когда отправлять сигнал, окно —
+как показать скорость и ETA.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+PROGRESS_INTERVAL = 0.1
+RATE_WINDOW = 3.0
+MB = 1024 * 1024
+
+
+class ProgressThrottle:
+    """Пропускает не больше одного обновления за `interval` секунд; последнее пропускается всегда."""
+
+    def __init__(self, interval: float = PROGRESS_INTERVAL, clock: Callable[[], float] = time.monotonic) -> None:
+        self.interval = interval
+        self._clock = clock
+        self._last: Optional[float] = None
+
+    def ready(self, final: bool = False) -> bool:
+        now = self._clock()
+        if final or self._last is None or now - self._last >= self.interval:
+            self._last = now
+            return True
+        return False
+
+
+class TransferRate:
+    """Скорость по скользящему окну последних `window` секунд."""
+
+    def __init__(self, window: float = RATE_WINDOW, clock: Callable[[], float] = time.monotonic) -> None:
+        self.window = window
+        self._clock = clock
+        self._samples: Deque[Tuple[float, int]] = deque()
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+    def update(self, bytes_done: int) -> None:
+        now = self._clock()
+        self._samples.append((now, bytes_done))
+        # Одна точка старше окна остаётся опорной, чтобы скорость не обнулялась между обновлениями.
+        while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+            self._samples.popleft()
+
+    @property
+    def bytes_per_second(self) -> float:
+        if len(self._samples) < 2:
+            return 0.0
+        (first_time, first_bytes), (last_time, last_bytes) = self._samples[0], self._samples[-1]
+        elapsed = last_time - first_time
+        return max(0, last_bytes - first_bytes) / elapsed if elapsed > 0 else 0.0
+
+    def eta(self, remaining_bytes: int) -> Optional[float]:
+        rate = self.bytes_per_second
+        return remaining_bytes / rate if rate > 0 else None
+
+
+def format_duration(seconds: float) -> str:
+    """`m:ss` или `h:mm:ss`."""
+    total = int(round(seconds))
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
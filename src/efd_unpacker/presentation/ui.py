@@ -5,36 +5,65 @@ PyQt UI, использующий доменные сервисы и перев
 from __future__ import annotations
 
 import os
-from typing import Optional
+import shutil
+import threading
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from PyQt5 import QtWidgets
-from PyQt5.QtCore import QThread, QSize, Qt, pyqtSignal
-from PyQt5.QtGui import QCursor, QDragEnterEvent, QDropEvent, QMovie
+from PyQt5.QtCore import QThread, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QCursor, QDragEnterEvent, QDropEvent
 from PyQt5.QtWidgets import (
     QComboBox,
     QFileDialog,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
+    QListWidget,
+    QListWidgetItem,
     QMainWindow,
     QMessageBox,
+    QProgressBar,
     QPushButton,
+    QTreeWidget,
+    QTreeWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
 from ..application.messages import format_unpack_result, format_validation_error
 from ..constants import FileExtensions, Styles, UIConstants, UIState
-from ..domain.errors import FileValidationError, UnpackError
+from ..domain.errors import DomainError, FileValidationError, UnpackError, UnpackErrorCode
 from ..domain.file_validator import FileValidator
-from ..domain.unpack_service import UnpackService
-from ..infrastructure.os_utils import open_folder
+from ..domain.supply_stream import SupplyManifest
+from ..domain.unpack_service import UnpackProgress, UnpackService
+from ..infrastructure.os_utils import get_1c_configuration_location_from_1cestart, open_folder
 from ..infrastructure.settings_service import SettingsService
 from ..localization.translator import Translator
-from ..runtime import resource_path
+from .preview import FileTreeNode, build_file_tree, split_size
+from .progress import MB, ProgressThrottle, TransferRate, format_duration
+from .unpack_queue import JobStatus, UnpackJob, UnpackQueue
+
+JOB_STATUS_LABELS = {
+    JobStatus.PENDING: "Pending",
+    JobStatus.RUNNING: "Unpacking",
+    JobStatus.DONE: "Done",
+    JobStatus.FAILED: "Failed",
+    JobStatus.CANCELLED: "Cancelled",
+}
+PROGRESS_STEPS = 1000
 
 
 class UnpackThread(QThread):
+    """
+    Распаковка одного файла в отдельном потоке.
+
+    Прогресс отправляется сигналом не чаще ProgressThrottle.interval, чтобы не
+    перегружать цикл событий окна; `cancel()` прерывает распаковку.
+    """
+
     finished = pyqtSignal(bool, str)
+    progress = pyqtSignal(object)
 
     def __init__(self, unpack_service: UnpackService, translator: Translator, input_file: str, output_dir: str) -> None:
         super().__init__()
@@ -42,16 +71,109 @@ class UnpackThread(QThread):
         self.translator = translator
         self.input_file = input_file
         self.output_dir = output_dir
+        self.cancel_event = threading.Event()
+        self._throttle = ProgressThrottle()
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
 
     def run(self) -> None:  # pragma: no cover - потоковая логика
         try:
-            self.unpack_service.unpack(self.input_file, self.output_dir)
+            self.unpack_service.unpack(
+                self.input_file,
+                self.output_dir,
+                progress=self._report_progress,
+                cancel=self.cancel_event,
+            )
             message = format_unpack_result(self.translator, success=True)
             self.finished.emit(True, message)
         except UnpackError as exc:
             message = format_unpack_result(self.translator, success=False, error=exc)
             self.finished.emit(False, message)
 
+    def _report_progress(self, snapshot: UnpackProgress) -> None:
+        if self._throttle.ready(final=snapshot.files_done == snapshot.files_total):
+            self.progress.emit(snapshot)
+
+
+class ProbeThread(QThread):
+    """Читает заголовок и таблицу файлов EFD и свободное место в каталоге распаковки."""
+
+    loaded = pyqtSignal(str, object, object)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, unpack_service: UnpackService, translator: Translator, input_file: str, output_dir: str) -> None:
+        super().__init__()
+        self.unpack_service = unpack_service
+        self.translator = translator
+        self.input_file = input_file
+        self.output_dir = output_dir
+
+    def run(self) -> None:  # pragma: no cover - потоковая логика
+        try:
+            manifest = self.unpack_service.probe(self.input_file)
+        except UnpackError as exc:
+            self.failed.emit(self.input_file, format_unpack_result(self.translator, success=False, error=exc))
+            return
+        self.loaded.emit(self.input_file, manifest, free_space(self.output_dir))
+
+
+class BackgroundTask(QThread):
+    """
+    Выполняет блокирующую работу с файловой системой вне потока окна.
+
+    Любое исключение завершается сигналом `failed`: не доменные ошибки
+    передаются как UnpackError с кодом UNEXPECTED.
+    """
+
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+    def __init__(self, function: Callable[[], object]) -> None:
+        super().__init__()
+        self.function = function
+
+    def run(self) -> None:  # pragma: no cover - потоковая логика
+        try:
+            result = self.function()
+        except DomainError as exc:
+            self.failed.emit(exc)
+            return
+        except Exception as exc:
+            self.failed.emit(UnpackError(UnpackErrorCode.UNEXPECTED, {"error": str(exc)}))
+            return
+        self.succeeded.emit(result)
+
+
+def validate_input_files(
+    validator: FileValidator, file_paths: List[str]
+) -> Tuple[List[str], List[FileValidationError]]:
+    """Нормализованные пути прошедших проверку файлов и ошибки остальных."""
+    results = validator.validate_many(file_paths)
+    valid = [result.normalized for result in results if result.normalized is not None]
+    errors = [result.error for result in results if result.error is not None]
+    return valid, errors
+
+
+def free_space(path: str) -> Optional[int]:
+    """Свободное место для `path` или ближайшего существующего родительского каталога."""
+    current = os.path.abspath(path) if path else ""
+    while current:
+        if os.path.isdir(current):
+            try:
+                return shutil.disk_usage(current).free
+            except OSError:
+                return None
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return None
+
 
 class MainWindow(QMainWindow):
     def __init__(
@@ -70,17 +192,39 @@ class MainWindow(QMainWindow):
         self.output_path = self.settings_service.get_output_path()
         self.manual_selected_path: Optional[str] = None
         self.input_file: Optional[str] = None
-        self.thread: Optional[UnpackThread] = None
+        self.queue = UnpackQueue(UIConstants.UNPACK_WORKERS)
+        self.threads: Dict[int, UnpackThread] = {}
+        self.queue_running = False
+        self.transfer_rate = TransferRate()
+        self.ui_state = UIState.NORMAL
+        self.preview_file: Optional[str] = None
+        self.previews: Dict[str, Tuple[SupplyManifest, Optional[int]]] = {}
+        self.probe_threads: Dict[str, ProbeThread] = {}
+        self.tasks: List[BackgroundTask] = []
+        self.validating = 0
+        self.preparing_output = False
+        self.config_locations: List[str] = []
+        self.locations_task: Optional[BackgroundTask] = None
+        self.closing = False
+        self.secondary_widgets_ready = False
+        self.deferred_init_scheduled = False
 
         self._init_window_properties()
         self._init_ui_elements()
         self._init_layout()
         self._connect_signals()
-        self.update_output_paths_combobox()
+        # Пути из 1cestart.cfg и скрытые виджеты появляются после первой отрисовки (_init_deferred).
+        self._fill_output_paths()
 
     def _t(self, context: str, text: str) -> str:
         return self.translator.translate(context, text)
 
+    def _tf(self, text: str, *args: object) -> str:
+        message = self._t("MainWindow", text)
+        for index, value in enumerate(args, start=1):
+            message = message.replace(f"%{index}", str(value))
+        return message
+
     def _init_window_properties(self) -> None:
         self.setWindowTitle(self._t("MainWindow", "EFD Unpacker"))
         self.resize(UIConstants.WINDOW_WIDTH, UIConstants.WINDOW_HEIGHT)
@@ -102,14 +246,29 @@ class MainWindow(QMainWindow):
         self.btn_unpack = QPushButton(self._t("MainWindow", "Unpack"))
         self.btn_unpack.setEnabled(False)
 
-        self.loading_label = QLabel()
-        self.loading_movie = QMovie(resource_path("resources", "loading.gif"))
-        self.loading_movie.setCacheMode(QMovie.CacheAll)
-        self.loading_movie.setScaledSize(QSize(UIConstants.LOADING_ICON_SIZE, UIConstants.LOADING_ICON_SIZE))
-        self.loading_label.setMovie(self.loading_movie)
-        self.loading_label.setAlignment(Qt.AlignCenter)
-        self.loading_label.setStyleSheet(Styles.LOADING_LABEL)
-        self.loading_label.setVisible(False)
+        self.list_jobs = QListWidget()
+        self.list_jobs.setMaximumHeight(UIConstants.JOB_LIST_HEIGHT)
+        self.list_jobs.setVisible(False)
+        self.btn_job_up = QPushButton(self._t("MainWindow", "Move Up"))
+        self.btn_job_down = QPushButton(self._t("MainWindow", "Move Down"))
+        self.btn_job_remove = QPushButton(self._t("MainWindow", "Remove"))
+        for button in (self.btn_job_up, self.btn_job_down, self.btn_job_remove):
+            button.setVisible(False)
+
+    def _init_secondary_widgets(self) -> None:
+        """Виджеты распаковки, результата и предпросмотра: до первой отрисовки окна они не нужны."""
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, PROGRESS_STEPS)
+        self.progress_bar.setVisible(False)
+        self.label_progress = QLabel()
+        self.label_progress.setAlignment(Qt.AlignCenter)
+        self.label_progress.setWordWrap(True)
+        self.label_progress.setVisible(False)
+        self.label_rate = QLabel()
+        self.label_rate.setAlignment(Qt.AlignCenter)
+        self.label_rate.setVisible(False)
+        self.btn_cancel = QPushButton(self._t("MainWindow", "Cancel"))
+        self.btn_cancel.setVisible(False)
 
         self.label_message = QLabel()
         self.label_message.setAlignment(Qt.AlignCenter)
@@ -125,6 +284,54 @@ class MainWindow(QMainWindow):
         self.btn_close = QPushButton(self._t("MainWindow", "Close"))
         self.btn_close.setVisible(False)
 
+        self.label_preview = QLabel()
+        self.label_preview.setWordWrap(True)
+        self.label_preview.setVisible(False)
+        self.tree_preview = QTreeWidget()
+        self.tree_preview.setHeaderLabels([self._t("MainWindow", "Name"), self._t("MainWindow", "Size")])
+        self.tree_preview.setMinimumHeight(UIConstants.PREVIEW_TREE_HEIGHT)
+        self.tree_preview.header().setStretchLastSection(False)
+        self.tree_preview.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree_preview.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.tree_preview.setVisible(False)
+
+        self.preview_layout.addWidget(self.label_preview)
+        self.preview_layout.addWidget(self.tree_preview)
+        self.status_layout.addWidget(self.progress_bar)
+        self.status_layout.addWidget(self.label_progress)
+        self.status_layout.addWidget(self.label_rate)
+        self.status_layout.addWidget(self.btn_cancel)
+        self.status_layout.addWidget(self.label_message)
+        self.status_layout.addWidget(self.btn_retry)
+        success_buttons_layout = QHBoxLayout()
+        success_buttons_layout.addWidget(self.btn_open_folder)
+        success_buttons_layout.addWidget(self.btn_close)
+        self.status_layout.addLayout(success_buttons_layout)
+
+        self.btn_retry.clicked.connect(self.reset_ui)
+        self.btn_open_folder.clicked.connect(self.open_output_folder)
+        self.btn_close.clicked.connect(self.close)
+        self.btn_cancel.clicked.connect(self.cancel_unpack)
+        self.tree_preview.itemExpanded.connect(self._populate_tree_item)
+
+    def _ensure_secondary_widgets(self) -> None:
+        if not self.secondary_widgets_ready:
+            self.secondary_widgets_ready = True
+            self._init_secondary_widgets()
+
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if not self.deferred_init_scheduled:
+            # Всё, без чего окно можно показать, выполняется после первой отрисовки.
+            self.deferred_init_scheduled = True
+            QTimer.singleShot(0, self._init_deferred)
+
+    def _init_deferred(self) -> None:
+        if self.closing:
+            return
+        self._ensure_secondary_widgets()
+        self.update_output_paths_combobox()
+
     def _init_layout(self) -> None:
         layout = QVBoxLayout()
         layout.addWidget(self.label_input)
@@ -134,15 +341,19 @@ class MainWindow(QMainWindow):
         output_layout.addWidget(self.btn_browse)
         layout.addLayout(output_layout)
 
-        layout.addWidget(self.btn_unpack)
-        layout.addWidget(self.loading_label)
-        layout.addWidget(self.label_message)
-        layout.addWidget(self.btn_retry)
+        layout.addWidget(self.list_jobs)
+        job_buttons_layout = QHBoxLayout()
+        job_buttons_layout.addWidget(self.btn_job_up)
+        job_buttons_layout.addWidget(self.btn_job_down)
+        job_buttons_layout.addWidget(self.btn_job_remove)
+        layout.addLayout(job_buttons_layout)
 
-        success_buttons_layout = QHBoxLayout()
-        success_buttons_layout.addWidget(self.btn_open_folder)
-        success_buttons_layout.addWidget(self.btn_close)
-        layout.addLayout(success_buttons_layout)
+        # Заполняются в _init_secondary_widgets.
+        self.preview_layout = QVBoxLayout()
+        layout.addLayout(self.preview_layout)
+        layout.addWidget(self.btn_unpack)
+        self.status_layout = QVBoxLayout()
+        layout.addLayout(self.status_layout)
 
         container = QWidget()
         container.setLayout(layout)
@@ -152,17 +363,65 @@ class MainWindow(QMainWindow):
         self.combo_output_paths.activated.connect(self.on_output_path_selected)
         self.btn_browse.clicked.connect(self.browse_output_path)
         self.btn_unpack.clicked.connect(self.unpack_file)
-        self.btn_retry.clicked.connect(self.reset_ui)
-        self.btn_open_folder.clicked.connect(self.open_output_folder)
-        self.btn_close.clicked.connect(self.close)
+        self.btn_job_up.clicked.connect(lambda: self.move_selected_job(-1))
+        self.btn_job_down.clicked.connect(lambda: self.move_selected_job(1))
+        self.btn_job_remove.clicked.connect(self.remove_selected_job)
+        self.list_jobs.currentRowChanged.connect(self.on_job_selected)
+
+    def _run_task(
+        self,
+        function: Callable[[], object],
+        on_success: Callable[[object], None],
+        on_failure: Callable[[object], None],
+    ) -> BackgroundTask:
+        task = BackgroundTask(function)
+        task.succeeded.connect(partial(self._deliver_task_result, on_success))
+        task.failed.connect(partial(self._deliver_task_result, on_failure))
+        task.finished.connect(partial(self._release_task, task))
+        self.tasks.append(task)
+        task.start()
+        return task
+
+    def _deliver_task_result(self, callback: Callable[[object], None], result: object) -> None:
+        # Результат, пришедший после закрытия окна, уже некому показывать.
+        if not self.closing:
+            callback(result)
+
+    def _release_task(self, task: BackgroundTask) -> None:
+        if task in self.tasks:
+            self.tasks.remove(task)
+            task.wait()
+
+    def _format_task_error(self, exc: DomainError) -> str:
+        if isinstance(exc, FileValidationError):
+            return format_validation_error(self.translator, exc)
+        return format_unpack_result(self.translator, False, exc if isinstance(exc, UnpackError) else None)
 
     def update_output_paths_combobox(self) -> None:
+        """Список заполняется сразу по уже известным путям; 1cestart.cfg перечитывается в фоне."""
+        self._fill_output_paths()
+        if self.locations_task is None:
+            self.locations_task = self._run_task(
+                get_1c_configuration_location_from_1cestart, self._on_locations_loaded, self._on_locations_failed
+            )
+
+    def _on_locations_loaded(self, locations: List[str]) -> None:
+        self.locations_task = None
+        if locations != self.config_locations:
+            self.config_locations = locations
+            self._fill_output_paths(self.combo_output_paths.currentData())
+
+    def _on_locations_failed(self, _exc: DomainError) -> None:
+        # Пути из 1cestart.cfg — только подсказка: список остаётся с уже известными путями.
+        self.locations_task = None
+
+    def _fill_output_paths(self, selected_path: Optional[str] = None) -> None:
         self.combo_output_paths.clear()
-        items = self.settings_service.get_output_path_items(self.manual_selected_path)
+        items = self.settings_service.get_output_path_items(self.manual_selected_path, self.config_locations)
         for path, label in items:
             self.combo_output_paths.addItem(label, path)
 
-        current_path = self.manual_selected_path or self.settings_service.get_output_path()
+        current_path = selected_path or self.manual_selected_path or self.settings_service.get_output_path()
         if current_path:
             idx = self.combo_output_paths.findData(current_path)
             if idx != -1:
@@ -177,29 +436,44 @@ class MainWindow(QMainWindow):
                 self.update_output_paths_combobox()
 
     def set_ui_state(self, state: UIState) -> None:
+        self._ensure_secondary_widgets()
         for widget in [
             self.label_input,
             self.combo_output_paths,
             self.btn_browse,
             self.btn_unpack,
-            self.loading_label,
+            self.progress_bar,
+            self.label_progress,
+            self.label_rate,
+            self.btn_cancel,
             self.label_message,
             self.btn_retry,
             self.btn_open_folder,
             self.btn_close,
+            self.list_jobs,
+            self.btn_job_up,
+            self.btn_job_down,
+            self.btn_job_remove,
+            self.label_preview,
+            self.tree_preview,
         ]:
             widget.setVisible(False)
 
-        self.loading_movie.stop()
-
+        self.ui_state = state
+        # Список заданий виден в любом состоянии, если в очереди больше одного файла.
+        self.list_jobs.setVisible(len(self.queue) > 1)
         if state == UIState.NORMAL:
             self.label_input.setVisible(True)
             self.combo_output_paths.setVisible(True)
             self.btn_browse.setVisible(True)
             self.btn_unpack.setVisible(True)
+            for button in (self.btn_job_up, self.btn_job_down, self.btn_job_remove):
+                button.setVisible(len(self.queue) > 1)
+            self.label_preview.setVisible(self.preview_file is not None)
+            self.tree_preview.setVisible(self.preview_file in self.previews)
         elif state == UIState.LOADING:
-            self.loading_label.setVisible(True)
-            self.loading_movie.start()
+            for widget in (self.progress_bar, self.label_progress, self.label_rate, self.btn_cancel):
+                widget.setVisible(True)
         elif state == UIState.SUCCESS:
             self.label_message.setVisible(True)
             self.btn_open_folder.setVisible(True)
@@ -209,16 +483,24 @@ class MainWindow(QMainWindow):
             self.btn_retry.setVisible(True)
 
     def show_message(self, text: str, is_error: bool = False) -> None:
+        self._ensure_secondary_widgets()
         self.label_message.setText(text)
         self.label_message.setStyleSheet(Styles.MESSAGE_ERROR if is_error else Styles.MESSAGE_SUCCESS)
         self.set_ui_state(UIState.ERROR if is_error else UIState.SUCCESS)
 
     def reset_ui(self) -> None:
-        self.input_file = None
-        self.label_input.setText(self._t("MainWindow", "Drag .efd file here or click to choose"))
-        self.label_input.setStyleSheet(Styles.INPUT_NORMAL)
+        # Успешные задания убираются, неудачные можно запустить снова.
+        self.queue.requeue_failed()
+        self.input_file = self.queue.pending[-1].input_file if self.queue.pending else None
+        if self.input_file:
+            self.label_input.setText(self.input_file)
+            self.label_input.setStyleSheet(Styles.INPUT_SUCCESS)
+        else:
+            self.label_input.setText(self._t("MainWindow", "Drag .efd file here or click to choose"))
+            self.label_input.setStyleSheet(Styles.INPUT_NORMAL)
+        self.refresh_job_list()
         self.set_ui_state(UIState.NORMAL)
-        self.btn_unpack.setEnabled(False)
+        self.btn_unpack.setEnabled(bool(self.queue.pending))
         self.btn_browse.setEnabled(True)
         self.combo_output_paths.setEnabled(True)
 
@@ -239,10 +521,11 @@ class MainWindow(QMainWindow):
         self._set_drag_active(False)
         mime = event.mimeData()
         if mime and hasattr(mime, "urls"):
-            for url in mime.urls():
-                if url.isLocalFile() and url.toLocalFile().lower().endswith(FileExtensions.EFD):
-                    self.set_input_file(url.toLocalFile())
-                    break
+            self.add_input_files(
+                url.toLocalFile()
+                for url in mime.urls()
+                if url.isLocalFile() and url.toLocalFile().lower().endswith(FileExtensions.EFD)
+            )
 
     def _set_drag_active(self, active: bool) -> None:
         if active:
@@ -253,18 +536,198 @@ class MainWindow(QMainWindow):
             self.label_input.setStyleSheet(Styles.INPUT_NORMAL)
 
     def set_input_file(self, file_path: str) -> None:
-        try:
-            normalized = self.file_validator.validate_input_file(file_path)
-        except FileValidationError as exc:
-            message = format_validation_error(self.translator, exc)
-            QMessageBox.warning(self, self._t("MainWindow", "Error"), message)
-            self.btn_unpack.setEnabled(False)
-            return
+        self.add_input_files([file_path])
+
+    def add_input_files(self, file_paths: Iterable[str]) -> int:
+        """
+        Проверяет файлы в фоновом потоке и добавляет их в очередь; ошибки показываются одним сообщением.
+
+        Возвращает число файлов, переданных на проверку.
+        """
+        paths = list(file_paths)
+        if not paths:
+            return 0
+        self.validating += 1
+        self.label_input.setText(self._t("MainWindow", "Checking files..."))
+        self.label_input.setStyleSheet(Styles.INPUT_NORMAL)
+        self._run_task(
+            partial(validate_input_files, self.file_validator, paths),
+            self._on_files_validated,
+            self._on_validation_failed,
+        )
+        return len(paths)
+
+    def _on_files_validated(self, result: Tuple[List[str], List[FileValidationError]]) -> None:
+        valid, errors = result
+        self.validating -= 1
+        busy = self.queue_running or self.preparing_output
+        if not busy:
+            # Новый набор файлов после завершённого запуска: прежние результаты больше не нужны.
+            self.queue.clear_finished()
+        added: List[UnpackJob] = []
+        for normalized in valid:
+            job = self.queue.add(normalized)
+            if job is not None:
+                added.append(job)
+            self.input_file = normalized
+
+        if errors:
+            messages = [format_validation_error(self.translator, exc) for exc in errors]
+            QMessageBox.warning(self, self._t("MainWindow", "Error"), "\n".join(messages))
+        self._restore_input_label()
+        self.btn_unpack.setEnabled(bool(self.queue.pending) and not busy)
+        if added and self.queue_running:
+            # Файлы, добавленные во время распаковки, попадают в текущий запуск.
+            self.queue.assign_output(self.output_path)
+            self._start_pending_jobs()
+        self.refresh_job_list()
+        if added and not busy:
+            self.set_ui_state(UIState.NORMAL)
+            self.show_preview(added[-1].input_file)
+
+    def _on_validation_failed(self, exc: DomainError) -> None:
+        self.validating -= 1
+        QMessageBox.warning(self, self._t("MainWindow", "Error"), self._format_task_error(exc))
+        self._restore_input_label()
+        busy = self.queue_running or self.preparing_output
+        self.btn_unpack.setEnabled(bool(self.queue.pending) and not busy)
+
+    def _restore_input_label(self) -> None:
+        if self.validating:
+            return  # пока проверяются другие файлы, метка «Проверка файлов...» остаётся на месте
+        if self.input_file:
+            self.label_input.setText(self.input_file)
+            self.label_input.setStyleSheet(Styles.INPUT_SUCCESS)
+        else:
+            self.label_input.setText(self._t("MainWindow", "Drag .efd file here or click to choose"))
 
-        self.input_file = normalized
-        self.label_input.setText(normalized)
-        self.label_input.setStyleSheet(Styles.INPUT_SUCCESS)
-        self.btn_unpack.setEnabled(True)
+    def refresh_job_list(self) -> None:
+        row = self.list_jobs.currentRow()
+        self.list_jobs.clear()
+        for job in self.queue.jobs:
+            status = self._t("MainWindow", JOB_STATUS_LABELS[job.status])
+            if job.status == JobStatus.RUNNING:
+                status = f"{status} {int(job.fraction * 100)}%"
+            item = QListWidgetItem(f"{status}: {job.input_file}")
+            if job.message:
+                item.setToolTip(job.message)
+            self.list_jobs.addItem(item)
+        if self.list_jobs.count():
+            self.list_jobs.setCurrentRow(min(max(row, 0), self.list_jobs.count() - 1))
+        self.list_jobs.setVisible(len(self.queue) > 1)
+        self._update_job_buttons()
+
+    def on_job_selected(self, row: int) -> None:
+        self._update_job_buttons()
+        if 0 <= row < len(self.queue) and not self.queue_running:
+            self.show_preview(self.queue.jobs[row].input_file)
+
+    def show_preview(self, input_file: str) -> None:
+        """Показывает заголовок файла; если он ещё не прочитан, читает его в фоновом потоке."""
+        self._ensure_secondary_widgets()
+        self.preview_file = input_file
+        if input_file in self.previews:
+            self._render_preview(input_file)
+            return
+        self.label_preview.setText(self._t("MainWindow", "Reading archive..."))
+        self.label_preview.setStyleSheet("")
+        self.tree_preview.clear()
+        self.tree_preview.setVisible(False)
+        self.label_preview.setVisible(self.ui_state == UIState.NORMAL)
+        if input_file in self.probe_threads:
+            return
+        thread = ProbeThread(self.unpack_service, self.translator, input_file, self.combo_output_paths.currentData() or "")
+        thread.loaded.connect(self._on_preview_loaded)
+        thread.failed.connect(self._on_preview_failed)
+        self.probe_threads[input_file] = thread
+        thread.start()
+
+    def _on_preview_loaded(self, input_file: str, manifest: SupplyManifest, free: Optional[int]) -> None:
+        self._release_probe_thread(input_file)
+        self.previews[input_file] = (manifest, free)
+        if input_file == self.preview_file:
+            self._render_preview(input_file)
+
+    def _on_preview_failed(self, input_file: str, message: str) -> None:
+        self._release_probe_thread(input_file)
+        if input_file == self.preview_file:
+            self.label_preview.setText(message)
+            self.label_preview.setStyleSheet(Styles.PREVIEW_WARNING)
+
+    def _release_probe_thread(self, input_file: str) -> None:
+        thread = self.probe_threads.pop(input_file, None)
+        if thread is not None:
+            thread.wait()
+
+    def _render_preview(self, input_file: str) -> None:
+        manifest, free = self.previews[input_file]
+        lang = getattr(self.translator, "lang", None)
+        lines = []
+        for code in sorted(manifest.description, key=lambda item: (item != lang, item)):
+            supply_name, provider_name, _description_path = manifest.description[code]
+            lines.append(f"{code}: {supply_name} ({provider_name})")
+        lines.append(
+            self._tf("Files: %1, total size: %2", len(manifest.included_files), self._format_size(manifest.total_size))
+        )
+        enough_space = free is None or free >= manifest.total_size
+        if free is not None:
+            lines.append(self._tf("Free space in output folder: %1", self._format_size(free)))
+        if not enough_space:
+            lines.append(self._t("MainWindow", "Not enough free space in output folder"))
+        self.label_preview.setText("\n".join(lines))
+        self.label_preview.setStyleSheet("" if enough_space else Styles.PREVIEW_WARNING)
+
+        self.tree_preview.clear()
+        self._add_tree_children(self.tree_preview.invisibleRootItem(), build_file_tree(manifest.included_files))
+        visible = self.ui_state == UIState.NORMAL
+        self.label_preview.setVisible(visible)
+        self.tree_preview.setVisible(visible)
+
+    def _add_tree_children(self, parent: QTreeWidgetItem, node: FileTreeNode) -> None:
+        for child in node.sorted_children():
+            item = QTreeWidgetItem([child.name, self._format_size(child.size)])
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            if not child.is_file:
+                # Вложенные элементы создаются при первом раскрытии каталога.
+                item.setData(0, Qt.UserRole, child)
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            parent.addChild(item)
+
+    def _populate_tree_item(self, item: QTreeWidgetItem) -> None:
+        node = item.data(0, Qt.UserRole)
+        if node is not None and item.childCount() == 0:
+            self._add_tree_children(item, node)
+            item.setData(0, Qt.UserRole, None)
+
+    def _format_size(self, size: int) -> str:
+        value, unit = split_size(size)
+        return f"{value} {self._t('MainWindow', unit)}"
+
+    def move_selected_job(self, offset: int) -> None:
+        row = self.list_jobs.currentRow()
+        if self.queue.move(row, offset):
+            self.refresh_job_list()
+            self.list_jobs.setCurrentRow(row + offset)
+
+    def remove_selected_job(self) -> None:
+        if self.queue.remove(self.list_jobs.currentRow()):
+            if self.input_file and not any(job.input_file == self.input_file for job in self.queue.jobs):
+                self.input_file = self.queue.jobs[-1].input_file if self.queue.jobs else None
+                if self.input_file is None:
+                    self.reset_ui()
+                    return
+                self.label_input.setText(self.input_file)
+            self.btn_unpack.setEnabled(bool(self.queue.pending))
+            self.refresh_job_list()
+            self.set_ui_state(UIState.NORMAL)
+
+    def _update_job_buttons(self) -> None:
+        row = self.list_jobs.currentRow()
+        jobs = self.queue.jobs
+        pending = 0 <= row < len(jobs) and jobs[row].status == JobStatus.PENDING
+        self.btn_job_up.setEnabled(pending and row > 0 and jobs[row - 1].status == JobStatus.PENDING)
+        self.btn_job_down.setEnabled(pending and row + 1 < len(jobs) and jobs[row + 1].status == JobStatus.PENDING)
+        self.btn_job_remove.setEnabled(0 <= row < len(jobs) and jobs[row].status != JobStatus.RUNNING)
 
     def browse_output_path(self) -> None:
         directory = QFileDialog.getExistingDirectory(
@@ -292,27 +755,115 @@ class MainWindow(QMainWindow):
             self.set_input_file(file_path)
 
     def unpack_file(self) -> None:
-        if not self.input_file:
+        if not self.queue.pending:
             QMessageBox.warning(self, self._t("MainWindow", "Error"), self._t("MainWindow", "No .efd file selected"))
             return
 
-        try:
-            prepared_output = self.file_validator.prepare_output_directory(self.combo_output_paths.currentData())
-        except FileValidationError as exc:
-            message = format_validation_error(self.translator, exc)
-            QMessageBox.warning(self, self._t("MainWindow", "Error"), message)
-            return
-
-        self.output_path = prepared_output
+        # Каталог (возможно, на сетевом диске) создаётся в фоне; до этого окно показывает подготовку.
+        self._ensure_secondary_widgets()
+        self.preparing_output = True
+        self.transfer_rate.reset()
+        self.progress_bar.setValue(0)
+        self.label_progress.setText(self._t("MainWindow", "Preparing output folder..."))
+        self.label_rate.clear()
+        self.btn_cancel.setEnabled(False)
 
         self.set_ui_state(UIState.LOADING)
         self.btn_unpack.setEnabled(False)
         self.btn_browse.setEnabled(False)
         self.combo_output_paths.setEnabled(False)
 
-        self.thread = UnpackThread(self.unpack_service, self.translator, self.input_file, prepared_output)
-        self.thread.finished.connect(self.unpack_finished)
-        self.thread.start()
+        self._run_task(
+            partial(self.file_validator.prepare_output_directory, self.combo_output_paths.currentData()),
+            self._on_output_prepared,
+            self._on_output_failed,
+        )
+
+    def _on_output_prepared(self, prepared_output: str) -> None:
+        self.preparing_output = False
+        if not self.queue.pending:
+            self.reset_ui()  # все ожидающие задания удалены, пока готовился каталог
+            return
+        self.output_path = prepared_output
+        self.queue.assign_output(prepared_output)
+        self.queue_running = True
+        self.label_progress.setText(self._t("MainWindow", "Preparing..."))
+        self.btn_cancel.setEnabled(True)
+
+        self._start_pending_jobs()
+        self.refresh_job_list()
+
+    def _on_output_failed(self, exc: DomainError) -> None:
+        self.preparing_output = False
+        QMessageBox.warning(self, self._t("MainWindow", "Error"), self._format_task_error(exc))
+        self.reset_ui()
+
+    def _start_pending_jobs(self) -> None:
+        for job in self.queue.start_next():
+            thread = UnpackThread(self.unpack_service, self.translator, job.input_file, job.output_dir or self.output_path)
+            thread.finished.connect(partial(self.job_finished, job))
+            thread.progress.connect(partial(self.job_progress, job))
+            self.threads[id(job)] = thread
+            thread.start()
+
+    def job_progress(self, job: UnpackJob, snapshot: UnpackProgress) -> None:
+        if job.status != JobStatus.RUNNING:
+            return  # запоздавший сигнал уже завершённого задания
+        job.progress = snapshot
+        self.update_progress(job)
+
+    def update_progress(self, current: Optional[UnpackJob] = None) -> None:
+        summary = self.queue.progress()
+        self.transfer_rate.update(summary.bytes_done)
+        self.progress_bar.setValue(int(summary.fraction * PROGRESS_STEPS))
+
+        lines = []
+        if summary.jobs_total > 1:
+            lines.append(self._tf("Archive %1 of %2", min(summary.jobs_done + 1, summary.jobs_total), summary.jobs_total))
+        if current is not None and current.progress is not None:
+            snapshot = current.progress
+            lines.append(self._tf("Files: %1 of %2", snapshot.files_done, snapshot.files_total))
+            lines.append(snapshot.current_file)
+        self.label_progress.setText("\n".join(lines))
+
+        rate = self.transfer_rate.bytes_per_second
+        eta = self.transfer_rate.eta(summary.remaining_bytes)
+        text = self._tf("%1 MB written, %2 MB/s", f"{summary.bytes_done / MB:.1f}", f"{rate / MB:.1f}")
+        if eta is not None:
+            text += ", " + self._tf("%1 left", format_duration(eta))
+        self.label_rate.setText(text)
+
+    def cancel_unpack(self) -> None:
+        """Отменяет ожидающие задания и прерывает выполняющиеся."""
+        self.btn_cancel.setEnabled(False)
+        self.label_progress.setText(self._t("MainWindow", "Cancelling..."))
+        self.queue.cancel_pending()
+        for thread in self.threads.values():
+            thread.cancel()
+        self.refresh_job_list()
+
+    def job_finished(self, job: UnpackJob, success: bool, message: str) -> None:
+        thread = self.threads.pop(id(job), None)
+        if thread is not None:
+            thread.wait()
+        self.queue.finish(job, success, message, cancelled=thread is not None and thread.cancelled and not success)
+        self._start_pending_jobs()
+        self.refresh_job_list()
+        if self.queue.running:
+            self.update_progress()
+            return
+
+        self.queue_running = False
+        finished = [item for item in self.queue.jobs if item.finished]
+        failed = self.queue.of_status(JobStatus.FAILED)
+        if self.queue.of_status(JobStatus.CANCELLED):
+            self.unpack_finished(False, format_unpack_result(self.translator, False, UnpackError(UnpackErrorCode.CANCELLED)))
+        elif len(finished) == 1:
+            self.unpack_finished(success, message)
+        elif failed:
+            self.unpack_finished(False, self._tf("Failed to unpack %1 of %2 files", len(failed), len(finished)))
+        else:
+            self.unpack_finished(True, self._tf("Unpacked %1 files", len(finished)))
 
     def unpack_finished(self, success: bool, message: str) -> None:
         self.btn_unpack.setEnabled(True)
@@ -327,6 +878,15 @@ class MainWindow(QMainWindow):
         else:
             self.show_message(f"[ERROR] {message}", is_error=True)
 
+    def closeEvent(self, event) -> None:
+        # Потоки не должны пережить окно: распаковки отменяются, остальные дожидаются конца.
+        self.closing = True
+        for thread in self.threads.values():
+            thread.cancel()
+        for thread in [*self.threads.values(), *self.probe_threads.values(), *self.tasks]:
+            thread.wait()
+        super().closeEvent(event)
+
     def open_output_folder(self) -> None:
         if self.output_path:
             open_folder(self.output_path)
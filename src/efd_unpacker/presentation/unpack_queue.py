@@ -0,0 +1,172 @@
+"""
+Очередь распаковки GUI: список заданий, их статусы и порядок запуска.
+
+Модель не зависит от Qt: окно только отображает задания и запускает потоки
+для тех, что вернул `start_next`.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional
+
+from ..domain.unpack_service import UnpackProgress
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class UnpackJob:
+    input_file: str
+    status: JobStatus = JobStatus.PENDING
+    output_dir: Optional[str] = None
+    message: str = ""
+    progress: Optional[UnpackProgress] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    @property
+    def fraction(self) -> float:
+        """Доля выполненной работы по байтам: 1 для завершённых, 0 — пока нет прогресса."""
+        if self.finished:
+            return 1.0
+        if self.progress is None or not self.progress.bytes_total:
+            return 0.0
+        return min(1.0, self.progress.bytes_done / self.progress.bytes_total)
+
+
+@dataclass(frozen=True)
+class QueueProgress:
+    """Прогресс текущего запуска очереди: доля, записанные байты и оценка оставшихся."""
+
+    fraction: float
+    bytes_done: int
+    remaining_bytes: int
+    jobs_done: int
+    jobs_total: int
+
+
+class UnpackQueue:
+    """
+    Задания в порядке добавления; одновременно выполняется не больше `max_workers`.
+
+    Ожидающие задания можно переставлять и удалять, выполняющиеся — нет.
+    Файл, который уже ждёт или распаковывается, повторно не добавляется.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
+        self.max_workers = max(1, max_workers)
+        self.jobs: List[UnpackJob] = []
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def add(self, input_file: str) -> Optional[UnpackJob]:
+        key = os.path.normcase(os.path.abspath(input_file))
+        for job in self.jobs:
+            if not job.finished and os.path.normcase(os.path.abspath(job.input_file)) == key:
+                return None
+        job = UnpackJob(input_file)
+        self.jobs.append(job)
+        return job
+
+    def remove(self, index: int) -> bool:
+        if not 0 <= index < len(self.jobs) or self.jobs[index].status == JobStatus.RUNNING:
+            return False
+        del self.jobs[index]
+        return True
+
+    def move(self, index: int, offset: int) -> bool:
+        """Сдвигает ожидающее задание на `offset` позиций среди ожидающих."""
+        target = index + offset
+        if not (0 <= index < len(self.jobs) and 0 <= target < len(self.jobs)):
+            return False
+        if self.jobs[index].status != JobStatus.PENDING or self.jobs[target].status != JobStatus.PENDING:
+            return False
+        self.jobs.insert(target, self.jobs.pop(index))
+        return True
+
+    def assign_output(self, output_dir: str) -> None:
+        """Каталог распаковки для всех ещё не запущенных заданий."""
+        for job in self.pending:
+            job.output_dir = output_dir
+
+    def start_next(self) -> List[UnpackJob]:
+        """Переводит в RUNNING ожидающие задания в пределах свободных мест и возвращает их."""
+        started = []
+        free = self.max_workers - len(self.running)
+        for job in self.pending:
+            if free <= 0:
+                break
+            job.status = JobStatus.RUNNING
+            started.append(job)
+            free -= 1
+        return started
+
+    def finish(self, job: UnpackJob, success: bool, message: str, cancelled: bool = False) -> None:
+        if success:
+            job.status = JobStatus.DONE
+        else:
+            job.status = JobStatus.CANCELLED if cancelled else JobStatus.FAILED
+        job.message = message
+
+    def cancel_pending(self) -> None:
+        for job in self.pending:
+            if job.output_dir is not None:
+                job.status = JobStatus.CANCELLED
+
+    def clear_finished(self) -> None:
+        self.jobs = [job for job in self.jobs if not job.finished]
+
+    def requeue_failed(self) -> None:
+        """Убирает успешно выполненные задания, неудачные и отменённые снова ставит в ожидание."""
+        self.jobs = [job for job in self.jobs if job.status != JobStatus.DONE]
+        for job in self.jobs:
+            if job.finished:
+                job.status = JobStatus.PENDING
+                job.message = ""
+            job.output_dir = None
+            job.progress = None
+
+    def progress(self) -> QueueProgress:
+        """
+        Прогресс заданий текущего запуска (с назначенным каталогом распаковки).
+
+        Каждое задание весит одинаково, поэтому доля растёт монотонно даже когда
+        размер ещё не запущенных заданий неизвестен. Их объём для оценки оставшихся
+        байт принимается равным среднему размеру уже начатых.
+        """
+        run = [job for job in self.jobs if job.output_dir is not None]
+        known = [job.progress.bytes_total for job in run if job.progress is not None]
+        average = sum(known) // len(known) if known else 0
+        bytes_done = remaining = 0
+        for job in run:
+            if job.progress is not None:
+                bytes_done += job.progress.bytes_done
+                if not job.finished:
+                    remaining += max(0, job.progress.bytes_total - job.progress.bytes_done)
+            elif not job.finished:
+                remaining += average
+        fraction = sum(job.fraction for job in run) / len(run) if run else 0.0
+        return QueueProgress(fraction, bytes_done, remaining, sum(job.finished for job in run), len(run))
+
+    @property
+    def pending(self) -> List[UnpackJob]:
+        return [job for job in self.jobs if job.status == JobStatus.PENDING]
+
+    @property
+    def running(self) -> List[UnpackJob]:
+        return [job for job in self.jobs if job.status == JobStatus.RUNNING]
+
+    def of_status(self, status: JobStatus) -> List[UnpackJob]:
+        return [job for job in self.jobs if job.status == status]
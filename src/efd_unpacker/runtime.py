@@ -16,15 +16,16 @@ try:
 except ImportError:  # pragma: no cover - unavailable on Windows
     pwd = None  # type: ignore[assignment]
 
-try:
-    from PyQt5.QtCore import QLocale
-except ImportError:  # pragma: no cover - PyQt5 is available in app runtime
-    QLocale = None  # type: ignore[assignment]
+# QLocale is imported lazily (see `_qt_locale`) so the headless CLI never loads PyQt5.
+QLocale = None
 
 CLI_LAUNCHER_NAME = "efd_unpacker"
 CLI_LAUNCHER_MARKER = "# Managed by EFD Unpacker"
 CLI_PROFILE_START = "# >>> EFD Unpacker PATH >>>"
 CLI_PROFILE_END = "# <<< EFD Unpacker PATH <<<"
+CLI_LAUNCHER_STAMP = "launcher.stamp"
+# Bump when the launcher script or profile block changes so existing stamps are refreshed.
+CLI_LAUNCHER_FORMAT = 1
 
 
 def _normalized_path_text(path: Path) -> str:
@@ -32,9 +33,27 @@ def _normalized_path_text(path: Path) -> str:
     return str(path.resolve(strict=False)).replace("\\", "/")
 
 
-def detect_system_language(default: str = "en") -> str:
-    """Return `ru` for Russian systems, otherwise the provided default."""
-    if QLocale is not None and QLocale.system().language() == QLocale.Language.Russian:
+def _qt_locale():
+    """Import and cache QLocale on first use; None when PyQt5 is unavailable."""
+    global QLocale
+    if QLocale is None:
+        try:
+            from PyQt5.QtCore import QLocale as qt_locale
+        except ImportError:  # pragma: no cover - PyQt5 is available in app runtime
+            return None
+        QLocale = qt_locale
+    return QLocale
+
+
+def detect_system_language(default: str = "en", use_qt: bool = False) -> str:
+    """
+    Return `ru` for Russian systems, otherwise the provided default.
+
+    The Qt system locale is consulted when `use_qt` is set (GUI startup) or when
+    QLocale has already been loaded; otherwise only the environment is used.
+    """
+    qt_locale = _qt_locale() if use_qt else QLocale
+    if qt_locale is not None and qt_locale.system().language() == qt_locale.Language.Russian:
         return "ru"
 
     locale_name = (
@@ -66,48 +85,100 @@ def install_cli_launcher() -> bool:
     profile adds that directory to PATH only while both the launcher and its
     target application still exist.
     """
-    target = resolve_cli_launcher_target()
-    if target is None:
+    source = _cli_launcher_source()
+    if source is None:
         return False
 
     launcher_dir = get_cli_launcher_dir()
     launcher_path = launcher_dir / CLI_LAUNCHER_NAME
-    profile_path = get_shell_profile_path()
+    stamp_path = get_app_data_dir() / CLI_LAUNCHER_STAMP
 
+    # Repeat starts: one stamp read plus stats of the launcher and profile it records.
+    stored_stamp = _read_cli_launcher_stamp(stamp_path)
+    if stored_stamp is not None:
+        stored_profile = _stamp_profile_path(stored_stamp)
+        if stored_profile is not None and stored_stamp == _cli_launcher_stamp(source, launcher_path, stored_profile):
+            return False
+
+    target = Path(source).expanduser().resolve(strict=False)
+    profile_path = get_shell_profile_path()
     try:
         launcher_dir.mkdir(parents=True, exist_ok=True)
         launcher_changed = _write_cli_launcher(launcher_path, target)
         profile_changed = _ensure_shell_profile_exports_path(profile_path, launcher_dir, target)
         legacy_changed = _cleanup_legacy_cli_registration(profile_path)
+        stamp = _cli_launcher_stamp(source, launcher_path, profile_path)
+        if stamp is not None:
+            stamp_path.write_text(stamp, encoding="utf-8")
     except OSError:
         return False
 
     return launcher_changed or profile_changed or legacy_changed
 
 
-def resolve_cli_launcher_target() -> Path | None:
-    """Return the stable executable path that should back the CLI launcher."""
+def _cli_launcher_stamp(source: str, launcher_path: Path, profile_path: Path) -> str | None:
+    """Describe the registration state: bundle path, shell and stats of the launcher and profile."""
+    try:
+        launcher_stat = launcher_path.lstat()
+        profile_stat = profile_path.stat()
+    except OSError:
+        return None
+    return (
+        f"format={CLI_LAUNCHER_FORMAT}\n"
+        f"source={source}\n"
+        f"shell={os.environ.get('SHELL', '')}\n"
+        f"launcher={launcher_stat.st_mtime_ns}:{launcher_stat.st_size}\n"
+        f"profile={profile_stat.st_mtime_ns}:{profile_stat.st_size}:{profile_path}\n"
+    )
+
+
+def _stamp_profile_path(stamp: str) -> Path | None:
+    for line in stamp.splitlines():
+        if line.startswith("profile="):
+            parts = line[len("profile="):].split(":", 2)
+            return Path(parts[2]) if len(parts) == 3 else None
+    return None
+
+
+def _read_cli_launcher_stamp(stamp_path: Path) -> str | None:
+    try:
+        return stamp_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _cli_launcher_source() -> str | None:
+    """Return the bundled executable path as reported by the runtime, before resolving links."""
     if sys.platform == "darwin":
-        executable = Path(sys.executable)
-        executable_str = str(executable).replace("\\", "/")
+        executable_str = sys.executable.replace("\\", "/")
         if executable_str.startswith("/Volumes/"):
             return None
         if ".app/Contents/MacOS/" in executable_str:
-            return executable.resolve(strict=False)
+            return sys.executable
         return None
 
     if sys.platform.startswith("linux"):
-        appimage = os.environ.get("APPIMAGE")
-        if not appimage:
-            return None
-        return Path(appimage).expanduser().resolve(strict=False)
+        return os.environ.get("APPIMAGE") or None
 
     return None
 
 
+def resolve_cli_launcher_target() -> Path | None:
+    """Return the stable executable path that should back the CLI launcher."""
+    source = _cli_launcher_source()
+    if source is None:
+        return None
+    return Path(source).expanduser().resolve(strict=False)
+
+
+def get_app_data_dir() -> Path:
+    """Return the per-user directory for application state (launcher, service, caches)."""
+    return Path.home() / ".local" / "share" / "efd_unpacker"
+
+
 def get_cli_launcher_dir() -> Path:
     """Return the per-user directory used for CLI launcher registration."""
-    return Path.home() / ".local" / "share" / "efd_unpacker" / "bin"
+    return get_app_data_dir() / "bin"
 
 
 def get_shell_profile_path() -> Path:
@@ -25,7 +25,7 @@ class DummySettingsService:
     def set_output_path(self, path: str) -> None:
         self.path = path
 
-    def get_output_path_items(self, manual_selected_path=None):
+    def get_output_path_items(self, manual_selected_path=None, from_1cestart=None):
         base = manual_selected_path or self.path
         return [(base, base)]
 
@@ -34,7 +34,7 @@ class DummyUnpackService(UnpackService):
     def __init__(self) -> None:
         pass
 
-    def unpack(self, input_file: str, output_dir: str) -> None:
+    def unpack(self, input_file: str, output_dir: str, **_options) -> None:
         self.last_call = (input_file, output_dir)
 
 
@@ -72,3 +72,210 @@ def test_unpack_finished_persists_actual_output_path(qtbot, monkeypatch):
     window.unpack_finished(True, "done")
 
     assert settings.path == chosen_output
+
+
+def test_main_window_unpacks_queue_of_files(qtbot, tmp_path, monkeypatch):
+    source = os.path.join(os.path.dirname(__file__), "..", "data", "1cv8.efd")
+    files = []
+    for name in ("first.efd", "second.efd", "third.efd"):
+        target = tmp_path / name
+        target.write_bytes(open(source, "rb").read())
+        files.append(str(target))
+    unpack_service = DummyUnpackService()
+    calls = []
+    unpack_service.unpack = lambda input_file, output_dir, **_options: calls.append(input_file)
+    settings = DummySettingsService()
+    settings.path = str(tmp_path / "out")
+
+    window = MainWindow(
+        translator=DummyTranslator(),
+        settings_service=settings,
+        file_validator=FileValidator(),
+        unpack_service=unpack_service,
+    )
+    qtbot.addWidget(window)
+    messages = []
+    monkeypatch.setattr(window, "show_message", lambda text, is_error=False: messages.append((text, is_error)))
+
+    assert window.add_input_files(files) == 3
+    qtbot.waitUntil(lambda: window.list_jobs.count() == 3, timeout=5000)
+    window.list_jobs.setCurrentRow(2)
+    window.move_selected_job(-1)
+    assert [job.input_file for job in window.queue.jobs][1] == files[2]
+
+    window.unpack_file()
+    qtbot.waitUntil(lambda: bool(messages), timeout=5000)
+
+    assert sorted(calls) == sorted(files)
+    assert messages == [("[OK] Unpacked 3 files", False)]
+
+
+def test_main_window_cancel_stops_running_and_pending_jobs(qtbot, tmp_path, monkeypatch):
+    import threading
+
+    from efd_unpacker.domain.errors import UnpackError, UnpackErrorCode
+    from efd_unpacker.presentation.unpack_queue import JobStatus
+
+    source = os.path.join(os.path.dirname(__file__), "..", "data", "1cv8.efd")
+    files = []
+    for index in range(4):
+        target = tmp_path / f"{index}.efd"
+        target.write_bytes(open(source, "rb").read())
+        files.append(str(target))
+    started = threading.Semaphore(0)
+
+    def blocking_unpack(input_file, output_dir, progress=None, cancel=None, **_options):
+        started.release()
+        cancel.wait(5)
+        raise UnpackError(UnpackErrorCode.CANCELLED)
+
+    unpack_service = DummyUnpackService()
+    unpack_service.unpack = blocking_unpack
+    settings = DummySettingsService()
+    settings.path = str(tmp_path / "out")
+    window = MainWindow(
+        translator=DummyTranslator(),
+        settings_service=settings,
+        file_validator=FileValidator(),
+        unpack_service=unpack_service,
+    )
+    qtbot.addWidget(window)
+    messages = []
+    monkeypatch.setattr(window, "show_message", lambda text, is_error=False: messages.append((text, is_error)))
+
+    window.add_input_files(files)
+    qtbot.waitUntil(lambda: len(window.queue) == 4, timeout=5000)
+    window.unpack_file()
+    qtbot.waitUntil(lambda: window.queue_running, timeout=5000)
+    assert started.acquire(timeout=5) and started.acquire(timeout=5)
+    window.cancel_unpack()
+    qtbot.waitUntil(lambda: not window.queue_running, timeout=5000)
+
+    assert [job.status for job in window.queue.jobs] == [JobStatus.CANCELLED] * 4
+    assert messages == [("[ERROR] Unpacking cancelled", True)]
+
+
+def test_main_window_previews_archive_contents(qtbot, tmp_path):
+    source = os.path.join(os.path.dirname(__file__), "..", "data", "1cv8.efd")
+    window = MainWindow(
+        translator=DummyTranslator(),
+        settings_service=DummySettingsService(),
+        file_validator=FileValidator(),
+        unpack_service=UnpackService(),
+    )
+    qtbot.addWidget(window)
+
+    window.set_input_file(source)
+    qtbot.waitUntil(lambda: window.input_file in window.previews, timeout=5000)
+
+    manifest, _free = window.previews[window.input_file]
+    assert len(manifest.included_files) == 4
+    assert "Files: 4" in window.label_preview.text()
+    assert window.tree_preview.topLevelItemCount() > 0
+
+
+def test_main_window_validates_files_and_prepares_output_in_background(qtbot, tmp_path, monkeypatch):
+    import threading
+
+    source = os.path.join(os.path.dirname(__file__), "..", "data", "1cv8.efd")
+    target = tmp_path / "slow.efd"
+    target.write_bytes(open(source, "rb").read())
+    release = threading.Event()
+
+    class SlowValidator(FileValidator):
+        def validate_input_file(self, file_path):
+            release.wait(5)
+            return super().validate_input_file(file_path)
+
+        def prepare_output_directory(self, output_dir):
+            release.wait(5)
+            return super().prepare_output_directory(output_dir)
+
+    unpack_service = DummyUnpackService()
+    calls = []
+    unpack_service.unpack = lambda input_file, output_dir, **_options: calls.append(output_dir)
+    settings = DummySettingsService()
+    settings.path = str(tmp_path / "out")
+    window = MainWindow(
+        translator=DummyTranslator(),
+        settings_service=settings,
+        file_validator=SlowValidator(),
+        unpack_service=unpack_service,
+    )
+    qtbot.addWidget(window)
+    monkeypatch.setattr(window, "show_message", lambda *args, **kwargs: None)
+
+    window.set_input_file(str(target))
+    assert window.label_input.text() == "Checking files..."
+    assert len(window.queue) == 0
+    release.set()
+    qtbot.waitUntil(lambda: len(window.queue) == 1, timeout=5000)
+    assert window.label_input.text() == str(target)
+
+    release.clear()
+    window.unpack_file()
+    assert window.label_progress.text() == "Preparing output folder..."
+    assert not window.queue_running
+    release.set()
+    qtbot.waitUntil(lambda: bool(calls), timeout=5000)
+    assert calls == [str(tmp_path / "out")]
+
+
+def test_main_window_recovers_from_unexpected_background_errors(qtbot, tmp_path, monkeypatch):
+    from efd_unpacker.presentation import ui
+
+    class BrokenValidator(FileValidator):
+        def validate_many(self, file_paths):
+            raise RuntimeError("disk gone")
+
+        def prepare_output_directory(self, output_dir):
+            raise RuntimeError("share gone")
+
+    window = MainWindow(
+        translator=DummyTranslator(),
+        settings_service=DummySettingsService(),
+        file_validator=BrokenValidator(),
+        unpack_service=DummyUnpackService(),
+    )
+    qtbot.addWidget(window)
+    warnings = []
+    monkeypatch.setattr(ui.QMessageBox, "warning", lambda _parent, _title, text: warnings.append(text))
+
+    window.set_input_file(str(tmp_path / "a.efd"))
+    qtbot.waitUntil(lambda: bool(warnings), timeout=5000)
+    assert warnings == ["Unexpected error: disk gone"]
+    assert window.validating == 0
+    assert window.label_input.text() == "Drag .efd file here or click to choose"
+
+    window.queue.add(str(tmp_path / "a.efd"))
+    window.unpack_file()
+    qtbot.waitUntil(lambda: len(warnings) == 2, timeout=5000)
+    assert warnings[1] == "Unexpected error: share gone"
+    assert not window.preparing_output
+    assert window.btn_unpack.isEnabled()
+    assert window.combo_output_paths.isEnabled()
+
+    def broken_locations():
+        raise RuntimeError("cfg gone")
+
+    monkeypatch.setattr(ui, "get_1c_configuration_location_from_1cestart", broken_locations)
+    window.update_output_paths_combobox()
+    qtbot.waitUntil(lambda: window.locations_task is None, timeout=5000)
+    assert window.combo_output_paths.count() == 1
+
+
+def test_main_window_defers_secondary_widgets_until_first_paint(qtbot):
+    window = MainWindow(
+        translator=DummyTranslator(),
+        settings_service=DummySettingsService(),
+        file_validator=FileValidator(),
+        unpack_service=DummyUnpackService(),
+    )
+    qtbot.addWidget(window)
+    assert not window.secondary_widgets_ready
+    assert window.locations_task is None
+
+    window.show()
+    qtbot.waitUntil(lambda: window.secondary_widgets_ready, timeout=5000)
+    assert not window.progress_bar.isVisible()
+    assert window.combo_output_paths.count() == 1
@@ -0,0 +1,117 @@
+import importlib
+import sys
+from pathlib import Path
+
+from efd_unpacker.domain.unpack_service import UnpackService
+
+BENCH_DIR = Path(__file__).resolve().parents[2] / "benchmarks"
+
+
+def load_benchmark_module(name: str):
+    if str(BENCH_DIR) not in sys.path:
+        sys.path.insert(0, str(BENCH_DIR))
+    return importlib.import_module(name)
+
+
+def test_generated_efd_matches_requested_shape(tmp_path):
+    synthetic = load_benchmark_module("synthetic_efd")
+    shape = synthetic.EFDShape(files=12, mean_size=5000, depth=2, compressibility=0.0, seed=7)
+
+    generated = synthetic.generate_efd(str(tmp_path / "bench.efd"), shape)
+    manifest = UnpackService().probe(generated.path)
+
+    assert generated.files == len(manifest.included_files) == 12
+    assert generated.payload_bytes == manifest.total_size
+    assert generated.compressed_bytes >= generated.payload_bytes
+    assert all(path.count("\\") == 3 for path, _modified, _size in manifest.included_files)
+    assert manifest.description["ru"][0] == "Benchmark"
+
+
+def test_size_distributions_are_deterministic():
+    synthetic = load_benchmark_module("synthetic_efd")
+    import random
+
+    for distribution in synthetic.SIZE_DISTRIBUTIONS:
+        shape = synthetic.EFDShape(files=50, mean_size=1000, size_distribution=distribution)
+        first = synthetic.file_sizes(shape, random.Random(1))
+        assert first == synthetic.file_sizes(shape, random.Random(1))
+        assert all(size >= 0 for size in first)
+
+
+def test_run_single_reports_throughput_inputs(tmp_path):
+    synthetic = load_benchmark_module("synthetic_efd")
+    runner = load_benchmark_module("run_benchmarks")
+    generated = synthetic.generate_efd(str(tmp_path / "bench.efd"), synthetic.EFDShape(files=5, mean_size=1000))
+
+    result = runner.run_single(generated.path, str(tmp_path / "out"), "pooled", 2)
+    summary = runner.summarize("tiny", "pooled", generated, [result])
+
+    assert result["files"] == 5
+    assert result["bytes"] == generated.payload_bytes
+    assert summary["mb_per_s"] > 0
+    assert summary["files_per_s"] > 0
+
+
+def _report(calibration, mb_per_s, peak_rss, startup):
+    return {
+        "environment": {"calibration_seconds": calibration},
+        "results": [{"scenario": "mixed", "mode": "stream", "mb_per_s": mb_per_s, "peak_rss": peak_rss}],
+        "startup": {"help": startup},
+    }
+
+
+def test_compare_reports_normalizes_for_machine_speed():
+    regression = load_benchmark_module("regression")
+    baseline = _report(calibration=0.1, mb_per_s=100.0, peak_rss=1000, startup=0.2)
+    slower_machine = _report(calibration=0.2, mb_per_s=50.0, peak_rss=1100, startup=0.4)
+
+    comparisons = regression.compare_reports(baseline, slower_machine, tolerance=0.25)
+
+    assert [item.metric for item in comparisons] == ["mb_per_s", "peak_rss", "seconds"]
+    assert not any(item.regressed for item in comparisons)
+
+
+def test_compare_reports_flags_regressions_beyond_tolerance():
+    regression = load_benchmark_module("regression")
+    baseline = _report(calibration=0.1, mb_per_s=100.0, peak_rss=1000, startup=0.2)
+    current = _report(calibration=0.1, mb_per_s=70.0, peak_rss=1300, startup=0.3)
+
+    comparisons = regression.compare_reports(baseline, current, tolerance=0.25)
+
+    assert [item.regressed for item in comparisons] == [True, True, True]
+    assert not any(item.regressed for item in regression.compare_reports(baseline, current, tolerance=0.6))
+    assert regression.calibrate(rounds=1) > 0
+
+
+def test_parse_importtime_reads_nesting_and_skips_header():
+    startup = load_benchmark_module("startup")
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   _abc",
+            "import time:       300 |        420 | abc",
+            "import time:        50 |         50 | json",
+        ]
+    )
+
+    records = startup.parse_importtime(stderr)
+    summary = startup.summarize_imports(records, top=1)
+
+    assert [(record.module, record.depth) for record in records] == [("_abc", 1), ("abc", 0), ("json", 0)]
+    assert summary["modules"] == 3
+    assert summary["milliseconds"] == 0.47
+    assert summary["top"][0]["module"] == "abc"
+
+
+def test_parse_gui_stages_reads_last_line():
+    startup = load_benchmark_module("startup")
+    stdout = 'Qt warning\n{"window": 0.08, "first_paint": 0.09, "ready": 0.1}\n'
+
+    assert startup.parse_gui_stages(stdout) == {"window": 0.08, "first_paint": 0.09, "ready": 0.1}
+
+
+def test_console_entry_point_stays_within_import_budget():
+    startup = load_benchmark_module("startup")
+
+    for module, budget in startup.IMPORT_BUDGETS.items():
+        assert startup.check_import_budget(module, budget) == []
@@ -2,8 +2,10 @@ import unittest
 from typing import List
 
 from efd_unpacker.application.cli import CLIApplication, CLIResult
+from efd_unpacker.application.worker_service import ServiceUnavailableError
 from efd_unpacker.domain.errors import FileValidationError, FileValidationCode, UnpackError, UnpackErrorCode
 from efd_unpacker.domain.file_validator import FileValidator
+from efd_unpacker.domain.supply_stream import SupplyManifest
 from efd_unpacker.domain.unpack_service import UnpackService
 
 
@@ -31,8 +33,29 @@ class StubUnpackService(UnpackService):
     def __init__(self) -> None:
         pass
 
-    def unpack(self, input_file: str, output_dir: str) -> None:
+    def unpack(self, input_file: str, output_dir: str, timings=None) -> SupplyManifest:
         self.last_call = (input_file, output_dir)
+        if timings is not None:
+            timings.write = 0.5
+        return self.probe(input_file)
+
+    def probe(self, input_file: str) -> SupplyManifest:
+        self.last_probe = input_file
+        return SupplyManifest(
+            description={"en": ("Test", "Vendor", "")},
+            included_files=[("a\\b.txt", None, 10), ("c.txt", None, 5)],
+        )
+
+
+class StubServiceClient:
+    def __init__(self, available: bool = True) -> None:
+        self.available = available
+        self.calls = []
+
+    def unpack(self, input_file: str, output_dir: str) -> None:
+        if not self.available:
+            raise ServiceUnavailableError()
+        self.calls.append((input_file, output_dir))
 
 
 class TestCLIApplication(unittest.TestCase):
@@ -42,12 +65,14 @@ class TestCLIApplication(unittest.TestCase):
         self.unpack_service = StubUnpackService()
         self.messages: List[str] = []
 
-    def _create_app(self) -> CLIApplication:
+    def _create_app(self, service_client=None, cache=None) -> CLIApplication:
         return CLIApplication(
             validator=self.validator,
             unpack_service=self.unpack_service,
             translator=self.translator,
             output=self.messages.append,
+            service_client=service_client,
+            cache=cache,
         )
 
     def test_run_returns_unhandled_when_no_args(self) -> None:
@@ -98,6 +123,309 @@ class TestCLIApplication(unittest.TestCase):
         self.assertTrue(result.handled)
         self.assertTrue(self.messages[0].startswith("[ERROR]"))
 
+    def test_run_unpack_uses_running_service(self) -> None:
+        client = StubServiceClient()
+        app = self._create_app(service_client=client)
+        result = app.run(["efd_unpacker", "unpack", "input.efd", "-tmplts", "out"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(client.calls, [("input.efd", "out")])
+        self.assertFalse(hasattr(self.unpack_service, "last_call"))
+
+    def test_run_unpack_falls_back_when_service_unavailable(self) -> None:
+        app = self._create_app(service_client=StubServiceClient(available=False))
+        result = app.run(["efd_unpacker", "unpack", "input.efd", "-tmplts", "out"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(self.unpack_service.last_call, ("input.efd", "out"))
+
+    def test_run_info_prints_manifest_summary(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "info", "input.efd"])
+        self.assertEqual(result, CLIResult(exit_code=0, handled=True))
+        self.assertEqual(self.unpack_service.last_probe, "input.efd")
+        self.assertIn("  en: Test (Vendor)", self.messages)
+        self.assertIn("Files: 2", self.messages)
+        self.assertIn("Total size: 15 bytes", self.messages)
+
+    def test_run_info_without_file_is_usage_error(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "info"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+        self.assertTrue(self.messages[0].startswith("[ERROR]"))
+
+    def test_run_serve_rejects_invalid_workers(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "serve", "--workers", "many"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_watch_once_reports_failures(self) -> None:
+        import os
+        import tempfile
+
+        inbox = tempfile.mkdtemp()
+        with open(os.path.join(inbox, "one.efd"), "wb") as handle:
+            handle.write(b"payload")
+        os.utime(os.path.join(inbox, "one.efd"), (0, 0))
+
+        class FailingUnpack(StubUnpackService):
+            def unpack(self, input_file: str, output_dir: str) -> None:
+                raise UnpackError(UnpackErrorCode.PERMISSION)
+
+        self.unpack_service = FailingUnpack()
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "watch", inbox, "-tmplts", "out", "--once"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+        self.assertTrue(os.path.exists(os.path.join(inbox, "failed", "one.efd")))
+        self.assertTrue(self.messages[-1].startswith("[ERROR]"))
+
+    def test_run_watch_requires_directory_argument(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "watch", "--once"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_unpack_no_cache_bypasses_service(self) -> None:
+        client = StubServiceClient()
+        app = self._create_app(service_client=client)
+        result = app.run(["efd_unpacker", "unpack", "input.efd", "-tmplts", "out", "--no-cache"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(client.calls, [])
+        self.assertEqual(self.unpack_service.last_call, ("input.efd", "out"))
+
+    def test_run_unpack_json_output(self) -> None:
+        import json
+        import tempfile
+
+        with tempfile.NamedTemporaryFile(suffix=".efd", delete=False) as handle:
+            handle.write(b"payload")
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "unpack", handle.name, "-tmplts", "out", "--output", "json"])
+        self.assertEqual(result, CLIResult(exit_code=0, handled=True))
+        payload = json.loads(self.messages[0])
+        self.assertTrue(payload["ok"])
+        self.assertEqual(payload["input_size"], 7)
+        self.assertEqual((payload["files"], payload["bytes"]), (2, 15))
+        self.assertIsNone(payload["error"])
+        self.assertEqual(payload["timings"]["write"], 0.5)
+        self.assertEqual(
+            set(payload["timings"]), {"validate", "inflate", "parse", "write", "metadata", "total"}
+        )
+
+    def test_run_unpack_json_output_reports_error_code(self) -> None:
+        import json
+
+        class FailingValidator(StubValidator):
+            def validate_input_file(self, file_path: str) -> str:
+                raise FileValidationError(FileValidationCode.NOT_FOUND)
+
+        self.validator = FailingValidator()
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "unpack", "missing.efd", "-tmplts", "out", "--output", "json"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+        payload = json.loads(self.messages[0])
+        self.assertFalse(payload["ok"])
+        self.assertEqual(payload["error"]["code"], "file_not_found")
+
+    def test_run_unpack_rejects_unknown_output_format(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "unpack", "input.efd", "-tmplts", "out", "--output", "xml"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_unpack_rejects_unknown_profile_mode(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "unpack", "input.efd", "-tmplts", "out", "--profile", "perf"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_unpack_rejects_profile_dir_without_value(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "unpack", "input.efd", "-tmplts", "out", "--profile-dir"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_unpack_rejects_unknown_metrics_sink(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "unpack", "input.efd", "-tmplts", "out", "--metrics", "statsd"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_cache_stats_and_purge(self) -> None:
+        import tempfile
+
+        from efd_unpacker.infrastructure.extraction_cache import ExtractionCache
+
+        cache = ExtractionCache(tempfile.mkdtemp(), budget_bytes=1024)
+        app = self._create_app(cache=cache)
+        self.assertEqual(app.run(["efd_unpacker", "cache", "stats"]), CLIResult(exit_code=0, handled=True))
+        self.assertIn("Entries: 0", self.messages)
+        self.assertIn("Disk usage: 0 of 1024 bytes", self.messages)
+        self.assertEqual(app.run(["efd_unpacker", "cache", "purge"]), CLIResult(exit_code=0, handled=True))
+        self.assertEqual(self.messages[-1], "[OK] Cache entries removed: 0")
+
+    def test_run_cache_rejects_unknown_action(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "cache", "clear"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_pack_writes_efd_readable_by_probe(self) -> None:
+        import os
+        import tempfile
+
+        source = tempfile.mkdtemp()
+        with open(os.path.join(source, "file.txt"), "wb") as handle:
+            handle.write(b"payload")
+        output = os.path.join(tempfile.mkdtemp(), "out.efd")
+
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "pack", source, output, "--name", "Supply", "--level", "9", "--workers", "2"])
+
+        self.assertEqual(result, CLIResult(exit_code=0, handled=True))
+        self.assertEqual(self.messages[-1], f"[OK] Packed 1 files (7 bytes) into {output}")
+        manifest = UnpackService().probe(output)
+        self.assertEqual(manifest.description, {"ru": ("Supply", "", "")})
+        self.assertEqual([name for name, _modified, _size in manifest.included_files], ["file.txt"])
+
+    def test_run_repack_reports_kept_files(self) -> None:
+        import os
+        import tempfile
+
+        from efd_unpacker.domain.supply_writer import pack_directory
+
+        work = tempfile.mkdtemp()
+        source = os.path.join(work, "src")
+        os.makedirs(os.path.join(source, "opt"))
+        for name in ("main.cf", os.path.join("opt", "extra.epf")):
+            with open(os.path.join(source, name), "wb") as handle:
+                handle.write(b"data")
+        pack_directory(source, os.path.join(work, "in.efd"), {"ru": ("S", "", ""), "en": ("S", "", "")})
+        output = os.path.join(work, "out.efd")
+
+        app = self._create_app()
+        result = app.run(
+            ["efd_unpacker", "repack", os.path.join(work, "in.efd"), output, "--lang", "en", "--exclude", "opt/*"]
+        )
+
+        self.assertEqual(result, CLIResult(exit_code=0, handled=True))
+        self.assertEqual(self.messages[-1], f"[OK] Repacked 1 of 2 files (4 bytes) into {output}")
+        self.assertEqual(list(UnpackService().probe(output).description), ["en"])
+
+    def test_run_diff_exit_code_reflects_differences(self) -> None:
+        import json
+        import os
+        import tempfile
+
+        from efd_unpacker.domain.supply_writer import pack_directory
+
+        work = tempfile.mkdtemp()
+        source = os.path.join(work, "src")
+        os.makedirs(source)
+        with open(os.path.join(source, "a.txt"), "wb") as handle:
+            handle.write(b"first")
+        old_file, new_file = os.path.join(work, "old.efd"), os.path.join(work, "new.efd")
+        pack_directory(source, old_file, {"ru": ("S", "", "")})
+        with open(os.path.join(source, "b.txt"), "wb") as handle:
+            handle.write(b"second")
+        pack_directory(source, new_file, {"ru": ("S", "", "")})
+
+        app = self._create_app()
+        self.assertEqual(app.run(["efd_unpacker", "diff", old_file, old_file]), CLIResult(exit_code=0, handled=True))
+        self.assertEqual(self.messages[-1], "[OK] Files are identical")
+        result = app.run(["efd_unpacker", "diff", old_file, new_file, "--output", "json"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+        report = json.loads(self.messages[-1])
+        self.assertEqual(report["changes"], [{"path": "b.txt", "kind": "added", "old_size": None, "new_size": 6}])
+
+    def test_run_verify_against_reports_matching_directory(self) -> None:
+        import os
+        import tempfile
+
+        from efd_unpacker.domain.supply_writer import pack_directory
+
+        source = tempfile.mkdtemp()
+        with open(os.path.join(source, "a.txt"), "wb") as handle:
+            handle.write(b"data")
+        efd = os.path.join(tempfile.mkdtemp(), "in.efd")
+        pack_directory(source, efd, {"ru": ("S", "", "")})
+
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "verify-against", efd, source, "--hash"])
+
+        self.assertEqual(result, CLIResult(exit_code=0, handled=True))
+        self.assertEqual(self.messages[-1], "[OK] Directory matches EFD (1 files)")
+
+    def test_run_verify_against_accepts_read_only_directory(self) -> None:
+        import os
+        import stat
+        import tempfile
+        from unittest.mock import patch
+
+        from efd_unpacker.domain.supply_writer import pack_directory
+
+        source = tempfile.mkdtemp()
+        with open(os.path.join(source, "a.txt"), "wb") as handle:
+            handle.write(b"data")
+        efd = os.path.join(tempfile.mkdtemp(), "in.efd")
+        pack_directory(source, efd, {"ru": ("S", "", "")})
+        os.chmod(source, stat.S_IRUSR | stat.S_IXUSR)
+        real_access = os.access
+
+        def no_write(path, mode):
+            # Под root chmod не отнимает права, поэтому отказ в записи имитируется явно.
+            return not mode & os.W_OK and real_access(path, mode)
+
+        app = self._create_app()
+        try:
+            with patch("efd_unpacker.domain.file_validator.os.access", side_effect=no_write):
+                result = app.run(["efd_unpacker", "verify-against", efd, source])
+        finally:
+            os.chmod(source, stat.S_IRWXU)
+
+        self.assertEqual(result, CLIResult(exit_code=0, handled=True))
+        self.assertEqual(self.messages[-1], "[OK] Directory matches EFD (1 files)")
+
+    def test_run_verify_checks_every_file(self) -> None:
+        import os
+        import tempfile
+        from pathlib import Path
+
+        sample = str(Path(__file__).resolve().parents[1] / "data" / "1cv8.efd")
+        broken = os.path.join(tempfile.mkdtemp(), "broken.efd")
+        with open(sample, "rb") as source, open(broken, "wb") as target:
+            target.write(source.read()[:-100])
+
+        app = self._create_app()
+        self.assertEqual(app.run(["efd_unpacker", "verify", sample]), CLIResult(exit_code=0, handled=True))
+        self.assertTrue(self.messages[-1].startswith(f"[OK] {sample}: 4 files, 138462 bytes"))
+        result = app.run(["efd_unpacker", "verify", sample, broken, "--workers", "2"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+        self.assertEqual(self.messages[-1], f"[ERROR] {broken}: problems found: 1")
+
+    def test_run_pack_rejects_invalid_level(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "pack", "src", "out.efd", "--level", "12"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_pack_rejects_negative_level_and_zero_workers(self) -> None:
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "pack", "src", "out.efd", "--level", "-1"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+        result = app.run(["efd_unpacker", "pack", "src", "out.efd", "--workers", "0"])
+        self.assertEqual(result, CLIResult(exit_code=1, handled=True))
+
+    def test_run_pack_accepts_store_level(self) -> None:
+        import os
+        import tempfile
+
+        source = tempfile.mkdtemp()
+        with open(os.path.join(source, "file.txt"), "wb") as handle:
+            handle.write(b"payload" * 100)
+        work = tempfile.mkdtemp()
+        output = os.path.join(work, "out.efd")
+
+        app = self._create_app()
+        result = app.run(["efd_unpacker", "pack", source, output, "--level", "0"])
+
+        self.assertEqual(result, CLIResult(exit_code=0, handled=True))
+        self.assertGreater(os.path.getsize(output), 700)
+        UnpackService().unpack(output, os.path.join(work, "out"))
+        with open(os.path.join(work, "out", "file.txt"), "rb") as handle:
+            self.assertEqual(handle.read(), b"payload" * 100)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from efd_unpacker.application.console import run_console
+from efd_unpacker.domain.file_validator import FileValidator
+
+ROOT = Path(__file__).resolve().parents[2]
+SAMPLE = ROOT / "tests" / "data" / "1cv8.efd"
+
+
+class DummyTranslator:
+    def translate(self, _context: str, source: str) -> str:
+        return source
+
+
+def test_run_console_returns_none_for_gui_arguments(tmp_path):
+    assert run_console(["efd_unpacker"], DummyTranslator(), FileValidator()) is None
+    assert run_console(["efd_unpacker", str(SAMPLE)], DummyTranslator(), FileValidator()) is None
+    assert run_console(["efd_unpacker", "info", str(SAMPLE)], DummyTranslator(), FileValidator()) == 0
+
+
+def test_headless_commands_never_import_pyqt5(tmp_path):
+    # Отдельный процесс: в процессе pytest PyQt5 уже загружен плагином pytest-qt.
+    script = f"""
+import sys
+sys.argv = ["efd_unpacker", "unpack", {str(SAMPLE)!r}, "-tmplts", {str(tmp_path / "out")!r}, "--no-cache"]
+from efd_unpacker.application import console
+for argv in (["efd_unpacker", "--help"], ["efd_unpacker", "info", {str(SAMPLE)!r}], sys.argv):
+    sys.argv = argv
+    try:
+        console.main()
+    except SystemExit as exc:
+        assert exc.code == 0, (argv, exc.code)
+loaded = sorted(name for name in sys.modules if name.split(".")[0] == "PyQt5")
+assert not loaded, loaded
+print("headless-ok")
+"""
+    env = {"PYTHONPATH": str(ROOT / "src"), "PATH": "", "HOME": str(tmp_path)}
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().endswith("headless-ok")
+    assert (tmp_path / "out" / "IngvarConsulting" / "Test" / "1cv8.mft").is_file()
@@ -0,0 +1,79 @@
+import sys
+
+import pytest
+
+from efd_unpacker.infrastructure import dir_watcher
+from efd_unpacker.infrastructure.dir_watcher import PollingWatcher, StabilityTracker, create_directory_watcher
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_stability_tracker_waits_until_size_is_stable(tmp_path):
+    clock = FakeClock()
+    tracker = StabilityTracker(str(tmp_path), ".efd", settle_time=2.0, clock=clock)
+    target = tmp_path / "incoming.efd"
+    target.write_bytes(b"part")
+    (tmp_path / "notes.txt").write_text("skip", encoding="utf-8")
+
+    assert tracker.scan() == []
+    clock.now = 1.0
+    with open(target, "ab") as handle:
+        handle.write(b"more")
+    assert tracker.scan() == []
+    clock.now = 2.5
+    assert tracker.scan() == []
+    clock.now = 3.5
+    assert tracker.scan() == [str(target)]
+    clock.now = 10.0
+    assert tracker.scan() == []
+
+
+def test_stability_tracker_reports_file_again_after_it_reappears(tmp_path):
+    clock = FakeClock()
+    tracker = StabilityTracker(str(tmp_path), ".efd", settle_time=0.0, clock=clock)
+    target = tmp_path / "a.efd"
+    target.write_bytes(b"data")
+
+    tracker.scan()
+    assert tracker.scan() == [str(target)]
+    target.unlink()
+    assert tracker.scan() == []
+    target.write_bytes(b"data2")
+    tracker.scan()
+    assert tracker.scan() == [str(target)]
+
+
+def test_polling_watcher_returns_settled_files(tmp_path):
+    (tmp_path / "a.efd").write_bytes(b"data")
+    watcher = PollingWatcher(str(tmp_path), ".efd", interval=0.01, settle_time=0.0)
+
+    ready = []
+    for _ in range(5):
+        ready.extend(watcher.poll(0.05))
+
+    assert ready == [str(tmp_path / "a.efd")]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_reports_closed_files(tmp_path):
+    watcher = create_directory_watcher(str(tmp_path), ".efd")
+    try:
+        assert isinstance(watcher, dir_watcher.InotifyWatcher)
+        (tmp_path / "new.efd").write_bytes(b"payload")
+        (tmp_path / "other.txt").write_bytes(b"payload")
+
+        assert watcher.poll(1.0) == [str(tmp_path / "new.efd")]
+    finally:
+        watcher.close()
+
+
+def test_create_directory_watcher_falls_back_to_polling(tmp_path):
+    watcher = create_directory_watcher(str(tmp_path), ".efd", use_inotify=False)
+
+    assert isinstance(watcher, PollingWatcher)
@@ -0,0 +1,212 @@
+import hashlib
+import os
+import threading
+import zlib
+from pathlib import Path
+
+import pytest
+
+from efd_unpacker.application.cached_unpack import CachedUnpackService
+from efd_unpacker.domain.errors import UnpackError, UnpackErrorCode
+from efd_unpacker.domain.unpack_service import UnpackService
+from efd_unpacker.infrastructure.extraction_cache import ExtractionCache
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+PAYLOAD_SIZE = 138462
+DT_FILE = Path("IngvarConsulting") / "Test" / "1Cv8.dt"
+
+
+class CountingUnpackService(UnpackService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+        self.options = {}
+
+    def unpack(self, input_file, output_dir, **options):
+        self.calls += 1
+        self.options = options
+        return super().unpack(input_file, output_dir, **options)
+
+
+def _recompressed_sample(target: Path, level: int) -> Path:
+    payload = zlib.decompress(SAMPLE.read_bytes(), -15)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    target.write_bytes(compressor.compress(payload) + compressor.flush())
+    return target
+
+
+@pytest.fixture
+def service(tmp_path):
+    inner = CountingUnpackService()
+    return CachedUnpackService(inner, ExtractionCache(tmp_path / "cache")), inner
+
+
+def test_repeated_unpack_into_same_directory_is_noop(service, tmp_path):
+    cached, inner = service
+    output_dir = tmp_path / "out"
+
+    cached.unpack(str(SAMPLE), str(output_dir))
+    manifest = cached.unpack(str(SAMPLE), str(output_dir))
+
+    assert inner.calls == 1
+    assert manifest.total_size == PAYLOAD_SIZE
+    assert cached.cache.stats().entries == 1
+
+
+def test_same_content_under_other_name_is_linked_from_tree(service, tmp_path):
+    cached, inner = service
+    copy = tmp_path / "renamed.efd"
+    copy.write_bytes(SAMPLE.read_bytes())
+
+    cached.unpack(str(SAMPLE), str(tmp_path / "first"))
+    cached.unpack(str(copy), str(tmp_path / "second"))
+
+    assert inner.calls == 1
+    assert (tmp_path / "second" / DT_FILE).stat().st_size == 29215
+    assert cached.cache.stats().trees == 1
+
+
+def test_unpack_over_linked_output_keeps_cached_tree(service, tmp_path):
+    cached, _inner = service
+    cached.unpack(str(SAMPLE), str(tmp_path / "out"))
+    tree_file = next((tmp_path / "cache" / "trees").iterdir()) / DT_FILE
+    assert os.path.samefile(tree_file, tmp_path / "out" / DT_FILE)
+
+    UnpackService().unpack(str(SAMPLE), str(tmp_path / "out"))
+
+    assert not os.path.samefile(tree_file, tmp_path / "out" / DT_FILE)
+    assert tree_file.stat().st_size == 29215
+
+
+def test_without_budget_copies_from_last_output(tmp_path):
+    inner = CountingUnpackService()
+    cached = CachedUnpackService(inner, ExtractionCache(tmp_path / "cache", budget_bytes=0))
+
+    cached.unpack(str(SAMPLE), str(tmp_path / "first"))
+    cached.unpack(str(SAMPLE), str(tmp_path / "second"))
+
+    assert inner.calls == 1
+    assert cached.cache.stats().trees == 0
+    first = tmp_path / "first" / DT_FILE
+    second = tmp_path / "second" / DT_FILE
+    assert second.read_bytes() == first.read_bytes()
+    assert not os.path.samefile(first, second)
+
+
+def test_modified_output_without_tree_is_extracted_again(tmp_path):
+    inner = CountingUnpackService()
+    cached = CachedUnpackService(inner, ExtractionCache(tmp_path / "cache", budget_bytes=0))
+    output_dir = tmp_path / "out"
+
+    cached.unpack(str(SAMPLE), str(output_dir))
+    (output_dir / DT_FILE).write_bytes(b"changed")
+    cached.unpack(str(SAMPLE), str(output_dir))
+
+    assert inner.calls == 2
+    assert (output_dir / DT_FILE).stat().st_size == 29215
+
+
+def test_tree_is_not_copied_when_hardlinks_are_unavailable(tmp_path, monkeypatch):
+    def no_link(source, target):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr("efd_unpacker.infrastructure.extraction_cache.os.link", no_link)
+    inner = CountingUnpackService()
+    cached = CachedUnpackService(inner, ExtractionCache(tmp_path / "cache"))
+
+    cached.unpack(str(SAMPLE), str(tmp_path / "first"))
+    cached.unpack(str(SAMPLE), str(tmp_path / "second"))
+
+    assert inner.calls == 1
+    assert cached.cache.stats().trees == 0
+    assert not list((tmp_path / "cache").glob("trees/*"))
+    assert (tmp_path / "second" / DT_FILE).stat().st_size == 29215
+
+
+def test_index_keeps_file_lists_in_entry_files(service, tmp_path):
+    cached, _inner = service
+    cached.unpack(str(SAMPLE), str(tmp_path / "out"))
+    index = (tmp_path / "cache" / "index.json").read_text(encoding="utf-8")
+
+    cached.unpack(str(SAMPLE), str(tmp_path / "out"))
+
+    assert "1Cv8.dt" not in index
+    assert "1Cv8.dt" not in (tmp_path / "cache" / "index.json").read_text(encoding="utf-8")
+    assert len(list((tmp_path / "cache" / "entries").glob("*.json"))) == 1
+
+
+def test_trees_are_evicted_least_recently_used_first(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", budget_bytes=PAYLOAD_SIZE + 1)
+    cached = CachedUnpackService(CountingUnpackService(), cache)
+    first = _recompressed_sample(tmp_path / "first.efd", 1)
+    second = _recompressed_sample(tmp_path / "second.efd", 9)
+
+    cached.unpack(str(first), str(tmp_path / "out1"))
+    cached.unpack(str(second), str(tmp_path / "out2"))
+
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.trees == 1
+    assert stats.tree_bytes <= stats.budget_bytes
+    assert not (tmp_path / "cache" / "trees" / cache.known_hash(str(first), first.stat())).exists()
+
+
+def test_index_is_shared_between_instances_and_purge_clears_it(service, tmp_path):
+    cached, _inner = service
+    cached.unpack(str(SAMPLE), str(tmp_path / "out"))
+
+    other = ExtractionCache(tmp_path / "cache")
+    assert other.stats().entries == 1
+    assert other.purge() == 1
+    assert other.stats().entries == 0
+    assert not (tmp_path / "cache" / "trees").exists()
+    assert not (tmp_path / "cache" / "entries").exists()
+
+
+def test_from_environment_is_opt_in(monkeypatch):
+    monkeypatch.delenv("EFD_UNPACKER_CACHE", raising=False)
+    assert ExtractionCache.from_environment() is None
+
+    monkeypatch.setenv("EFD_UNPACKER_CACHE", "1")
+    assert ExtractionCache.from_environment() is not None
+
+
+def test_digest_and_cancel_are_passed_through(service, tmp_path):
+    cached, inner = service
+    expected = hashlib.sha256(SAMPLE.read_bytes()).hexdigest()
+
+    cancel = threading.Event()
+    for name in ("first", "second"):
+        digest = hashlib.sha256()
+        cached.unpack(str(SAMPLE), str(tmp_path / name), digest=digest, cancel=cancel)
+        assert digest.hexdigest() == expected
+
+    assert inner.options["cancel"] is cancel
+    cancel.set()
+    with pytest.raises(UnpackError) as exc_info:
+        cached.unpack(str(SAMPLE), str(tmp_path / "third"), cancel=cancel)
+
+    assert exc_info.value.code == UnpackErrorCode.CANCELLED
+    assert inner.calls == 1
+    assert not (tmp_path / "third").exists()
+
+
+def test_broken_cache_falls_back_to_regular_unpack(tmp_path, monkeypatch):
+    (tmp_path / "cache").write_text("not a directory")
+    inner = CountingUnpackService()
+    cached = CachedUnpackService(inner, ExtractionCache(tmp_path / "cache"))
+
+    def denied(*_args):
+        raise PermissionError("cache is read-only")
+
+    cached.unpack(str(SAMPLE), str(tmp_path / "first"))
+    monkeypatch.setattr(cached.cache, "known_hash", denied)
+    manifest = cached.unpack(str(SAMPLE), str(tmp_path / "second"))
+
+    assert inner.calls == 2
+    assert manifest.total_size == PAYLOAD_SIZE
+    assert (tmp_path / "second" / DT_FILE).stat().st_size == 29215
+
+    with pytest.raises(UnpackError) as exc_info:
+        cached.unpack(str(tmp_path / "missing.efd"), str(tmp_path / "third"))
+    assert exc_info.value.code == UnpackErrorCode.FILE_NOT_FOUND
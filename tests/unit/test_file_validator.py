@@ -48,6 +48,29 @@ class TestFileValidator(unittest.TestCase):
             self.validator.validate_input_file(empty)
         self.assertEqual(ctx.exception.code, FileValidationCode.EMPTY)
 
+    def test_validate_input_file_uses_single_stat(self) -> None:
+        with patch("efd_unpacker.domain.file_validator.os.stat", wraps=os.stat) as stat_mock:
+            self.validator.validate_input_file(self.valid_file)
+        self.assertEqual(stat_mock.call_count, 1)
+
+    def test_validate_input_file_directory(self) -> None:
+        directory = os.path.join(self.temp_dir, "folder.efd")
+        os.mkdir(directory)
+        with self.assertRaises(FileValidationError) as ctx:
+            self.validator.validate_input_file(directory)
+        self.assertEqual(ctx.exception.code, FileValidationCode.NOT_A_FILE)
+
+    def test_validate_many_returns_result_per_file(self) -> None:
+        missing = os.path.join(self.temp_dir, "missing.efd")
+        paths = [self.valid_file, missing] * 20
+
+        results = self.validator.validate_many(paths, workers=4)
+
+        self.assertEqual([result.path for result in results], paths)
+        self.assertTrue(all(result.ok for result in results[::2]))
+        self.assertEqual(results[0].normalized, os.path.abspath(self.valid_file))
+        self.assertEqual({result.error.code for result in results[1::2]}, {FileValidationCode.NOT_FOUND})
+
     def test_prepare_output_directory_existing(self) -> None:
         output = os.path.join(self.temp_dir, "output")
         os.makedirs(output)
@@ -76,6 +99,37 @@ class TestFileValidator(unittest.TestCase):
                 self.validator.prepare_output_directory(tmp)
             self.assertEqual(ctx.exception.code, FileValidationCode.OUTPUT_NOT_WRITABLE)
 
+    def test_validate_input_directory_accepts_read_only(self) -> None:
+        real_access = os.access
+
+        def no_write(path, mode):
+            return not mode & os.W_OK and real_access(path, mode)
+
+        with patch("efd_unpacker.domain.file_validator.os.access", side_effect=no_write):
+            self.assertEqual(self.validator.validate_input_directory(self.temp_dir), os.path.abspath(self.temp_dir))
+        with patch("efd_unpacker.domain.file_validator.os.access", return_value=False):
+            with self.assertRaises(FileValidationError) as ctx:
+                self.validator.validate_input_directory(self.temp_dir)
+        self.assertEqual(ctx.exception.code, FileValidationCode.INPUT_DIRECTORY_NOT_READABLE)
+
+    def test_validate_inbox_directory_requires_write(self) -> None:
+        self.assertEqual(self.validator.validate_inbox_directory(self.temp_dir), os.path.abspath(self.temp_dir))
+        real_access = os.access
+
+        def no_write(path, mode):
+            return not mode & os.W_OK and real_access(path, mode)
+
+        with patch("efd_unpacker.domain.file_validator.os.access", side_effect=no_write):
+            with self.assertRaises(FileValidationError) as ctx:
+                self.validator.validate_inbox_directory(self.temp_dir)
+        self.assertEqual(ctx.exception.code, FileValidationCode.INBOX_NOT_WRITABLE)
+
+    def test_validate_input_directory(self) -> None:
+        self.assertEqual(self.validator.validate_input_directory(self.temp_dir), os.path.abspath(self.temp_dir))
+        with self.assertRaises(FileValidationError) as ctx:
+            self.validator.validate_input_directory(self.valid_file)
+        self.assertEqual(ctx.exception.code, FileValidationCode.INPUT_NOT_DIRECTORY)
+
     def test_get_file_info(self) -> None:
         info = self.validator.get_file_info(self.valid_file)
         self.assertIsNotNone(info)
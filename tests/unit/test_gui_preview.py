@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from efd_unpacker.presentation.preview import build_file_tree, split_size
+
+
+def test_build_file_tree_sums_sizes_by_directory():
+    modified = datetime(2024, 1, 1)
+    root = build_file_tree(
+        [
+            ("1cv8.cf", modified, 100),
+            ("Docs\\readme.txt", modified, 10),
+            ("Docs\\img\\logo.png", modified, 5),
+            ("apply.txt", modified, 1),
+        ]
+    )
+
+    assert (root.size, root.files) == (116, 4)
+    assert [node.name for node in root.sorted_children()] == ["Docs", "1cv8.cf", "apply.txt"]
+    docs = root.children["Docs"]
+    assert not docs.is_file
+    assert (docs.size, docs.files) == (15, 2)
+    assert docs.children["img"].children["logo.png"].is_file
+
+
+def test_split_size_picks_unit():
+    assert split_size(0) == ("0", "B")
+    assert split_size(1023) == ("1023", "B")
+    assert split_size(1536) == ("1.5", "KB")
+    assert split_size(138462) == ("135.2", "KB")
+    assert split_size(5 * 1024 ** 5) == ("5120.0", "TB")
@@ -0,0 +1,59 @@
+from efd_unpacker.domain.unpack_service import UnpackProgress
+from efd_unpacker.presentation.progress import ProgressThrottle, TransferRate, format_duration
+from efd_unpacker.presentation.unpack_queue import JobStatus, UnpackQueue
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_progress_throttle_limits_updates_but_passes_final():
+    clock = FakeClock()
+    throttle = ProgressThrottle(interval=0.1, clock=clock)
+
+    assert throttle.ready()
+    clock.now = 0.05
+    assert not throttle.ready()
+    assert throttle.ready(final=True)
+    clock.now = 0.2
+    assert throttle.ready()
+
+
+def test_transfer_rate_uses_sliding_window_and_estimates_eta():
+    clock = FakeClock()
+    rate = TransferRate(window=2.0, clock=clock)
+    assert rate.eta(100) is None
+
+    for second, done in enumerate([0, 10, 20, 60, 100]):
+        clock.now = float(second)
+        rate.update(done)
+
+    assert rate.bytes_per_second == 40.0
+    assert rate.eta(200) == 5.0
+    assert format_duration(65) == "1:05"
+    assert format_duration(3725) == "1:02:05"
+
+
+def test_queue_progress_weights_jobs_equally_and_estimates_pending_size():
+    queue = UnpackQueue(max_workers=1)
+    for name in ("a.efd", "b.efd", "c.efd"):
+        queue.add(name)
+    queue.assign_output("/out")
+    first = queue.start_next()[0]
+    first.progress = UnpackProgress(1, 2, 300, 400, "x")
+
+    summary = queue.progress()
+    assert summary.fraction == 0.25
+    assert summary.bytes_done == 300
+    assert summary.remaining_bytes == 100 + 400 + 400
+
+    queue.finish(first, True, "ok")
+    queue.cancel_pending()
+    summary = queue.progress()
+    assert summary.fraction == 1.0
+    assert summary.remaining_bytes == 0
+    assert [job.status for job in queue.jobs] == [JobStatus.DONE, JobStatus.CANCELLED, JobStatus.CANCELLED]
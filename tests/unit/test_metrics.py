@@ -0,0 +1,80 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from efd_unpacker.domain.metrics import MetricNames
+from efd_unpacker.domain.unpack_service import UnpackService, UnpackTimings
+from efd_unpacker.infrastructure.metrics import (
+    JsonLinesSink,
+    LoggingSink,
+    MetricsRegistry,
+    MetricsReporter,
+    PrometheusTextSink,
+    create_metrics_sink,
+)
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+
+
+def test_unpack_records_counters_and_timers(tmp_path) -> None:
+    registry = MetricsRegistry()
+    timings = UnpackTimings()
+
+    UnpackService().unpack(str(SAMPLE), str(tmp_path), timings=timings, metrics=registry)
+
+    snapshot = registry.snapshot()
+    assert snapshot.counters[MetricNames.UNPACKS] == 1
+    assert snapshot.counters[MetricNames.BYTES_READ] == SAMPLE.stat().st_size
+    assert snapshot.counters[MetricNames.BYTES_WRITTEN] == 138462
+    assert snapshot.counters[MetricNames.FILES_WRITTEN] == 4
+    assert snapshot.counters[MetricNames.MAKEDIRS_CALLS] == 4
+    assert snapshot.counters[MetricNames.UTIME_CALLS] == 4
+    assert snapshot.timers[MetricNames.INFLATE_TIME].total == pytest.approx(timings.inflate)
+    assert snapshot.files_per_second > 0
+
+
+def test_unpack_error_is_counted(tmp_path) -> None:
+    registry = MetricsRegistry()
+    broken = tmp_path / "broken.efd"
+    broken.write_bytes(b"\x00" * 16)
+
+    with pytest.raises(Exception):
+        UnpackService().unpack(str(broken), str(tmp_path / "out"), metrics=registry)
+
+    assert registry.snapshot().counters == {MetricNames.UNPACK_ERRORS: 1}
+
+
+def test_sinks_write_snapshot(tmp_path, caplog) -> None:
+    registry = MetricsRegistry()
+    registry.increment(MetricNames.FILES_WRITTEN, 10)
+    registry.observe(MetricNames.UNPACK_TIME, 2.0)
+    registry.observe(MetricNames.UNPACK_TIME, 3.0)
+    jsonl = tmp_path / "metrics.jsonl"
+    prom = tmp_path / "metrics.prom"
+    reporter = MetricsReporter(registry, [JsonLinesSink(str(jsonl)), PrometheusTextSink(str(prom)), LoggingSink()])
+
+    with caplog.at_level(logging.INFO):
+        reporter.flush()
+        reporter.stop()
+
+    records = [json.loads(line) for line in jsonl.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 2
+    assert records[0]["timers"]["unpack"] == {"count": 2, "sum": 5.0, "max": 3.0}
+    assert records[0]["files_per_second"] == 2.0
+    text = prom.read_text(encoding="utf-8")
+    assert "efd_unpacker_files_written_total 10" in text
+    assert "efd_unpacker_unpack_seconds_count 2" in text
+    assert "efd_unpacker_files_per_second 2.000" in text
+    assert "files_written=10" in caplog.text
+
+
+def test_create_metrics_sink_parses_spec(tmp_path) -> None:
+    assert isinstance(create_metrics_sink("log"), LoggingSink)
+    assert isinstance(create_metrics_sink(f"jsonl:{tmp_path}/m.jsonl"), JsonLinesSink)
+    assert isinstance(create_metrics_sink(f"prometheus:{tmp_path}/m.prom"), PrometheusTextSink)
+    with pytest.raises(ValueError):
+        create_metrics_sink("statsd:localhost")
+    with pytest.raises(ValueError):
+        create_metrics_sink("jsonl")
@@ -30,3 +30,39 @@ def test_open_folder_windows_uses_startfile(monkeypatch, tmp_path):
 
     assert os_utils.open_folder(str(target)) is True
     startfile.assert_called_once_with(str(target))
+
+
+def test_configuration_locations_provider_reads_file_once_until_it_changes(tmp_path, monkeypatch):
+    config = tmp_path / "1cestart.cfg"
+    config.write_text("ConfigurationTemplatesLocation=/srv/tmplts\nOther=1\n", encoding="cp1251")
+    provider = os_utils.ConfigurationLocationsProvider(lambda: [str(config), str(tmp_path / "missing.cfg")])
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda path, *args, **kwargs: opened.append(path) or real_open(path, *args, **kwargs))
+
+    assert provider.locations() == ["/srv/tmplts"]
+    assert provider.locations() == ["/srv/tmplts"]
+    assert opened == [str(config)]
+
+    config.write_text("ConfigurationTemplatesLocation=/srv/новые\n", encoding="utf-8")
+    os.utime(config, ns=(0, os.stat(config).st_mtime_ns + 10**9))
+    assert provider.locations() == ["/srv/новые"]
+    assert provider.encoding(str(config)) == "utf-8-sig"
+    assert len(opened) == 2
+
+
+def test_configuration_locations_provider_merges_files_and_forgets_removed(tmp_path):
+    user_config = tmp_path / "user.cfg"
+    shared_config = tmp_path / "shared.cfg"
+    user_config.write_bytes(b"\xff\xfe" + "ConfigurationTemplatesLocation=C:\\tmplts\r\n".encode("utf-16le"))
+    shared_config.write_text(
+        "ConfigurationTemplatesLocation=C:\\tmplts\nConfigurationTemplatesLocation=D:\\shared\n", encoding="utf-8-sig"
+    )
+    provider = os_utils.ConfigurationLocationsProvider(lambda: [str(user_config), str(shared_config)])
+
+    assert provider.locations() == ["C:\\tmplts", "D:\\shared"]
+    assert provider.encoding(str(user_config)) == "utf-16le"
+
+    user_config.unlink()
+    assert provider.locations() == ["C:\\tmplts", "D:\\shared"]
+    assert provider.encoding(str(user_config)) is None
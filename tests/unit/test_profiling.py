@@ -0,0 +1,71 @@
+import pstats
+import time
+from pathlib import Path
+
+import pytest
+
+from efd_unpacker.application.profiled_unpack import ProfilingUnpackService
+from efd_unpacker.domain.errors import UnpackError, UnpackErrorCode
+from efd_unpacker.domain.unpack_service import UnpackService
+from efd_unpacker.infrastructure.profiling import MODE_SAMPLE, UnpackProfiler
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def test_cprofile_writes_loadable_stats(tmp_path) -> None:
+    service = ProfilingUnpackService(UnpackService(), UnpackProfiler(trace_memory=True))
+
+    manifest = service.unpack(str(SAMPLE), str(tmp_path / "out"))
+
+    report = service.last_report
+    assert len(manifest.included_files) == 4
+    assert len(report.paths) == 1 and report.paths[0].endswith(".prof")
+    assert Path(report.paths[0]).parent == tmp_path
+    assert not list((tmp_path / "out").glob("efd_unpacker-profile-*"))
+    assert report.peak_memory > 0
+    stats = pstats.Stats(report.paths[0])
+    assert any(name == "unpack" for _file, _line, name in stats.stats)
+
+
+def test_sampling_profiler_writes_collapsed_stacks(tmp_path) -> None:
+    profiler = UnpackProfiler(MODE_SAMPLE, sample_interval=0.001, profile_dir=str(tmp_path / "profiles"))
+
+    with profiler.profile("input.efd", str(tmp_path / "out")) as report:
+        _busy(0.1)
+
+    assert report.samples > 0
+    assert Path(report.paths[0]).parent == tmp_path / "profiles"
+    assert report.peak_memory is None
+    lines = Path(report.paths[0]).read_text(encoding="utf-8").splitlines()
+    assert any("_busy (test_profiling.py:" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_profile_dump_error_does_not_replace_unpack_error(tmp_path) -> None:
+    (tmp_path / "profiles").write_text("not a directory")
+    service = ProfilingUnpackService(UnpackService(), UnpackProfiler(profile_dir=str(tmp_path / "profiles")))
+
+    with pytest.raises(UnpackError) as exc_info:
+        service.unpack(str(tmp_path / "missing.efd"), str(tmp_path / "out"))
+
+    assert exc_info.value.code is UnpackErrorCode.FILE_NOT_FOUND
+    assert service.last_report.paths == []
+
+
+def test_from_environment(monkeypatch) -> None:
+    monkeypatch.delenv("EFD_UNPACKER_PROFILE", raising=False)
+    assert UnpackProfiler.from_environment() is None
+
+    monkeypatch.setenv("EFD_UNPACKER_PROFILE", "sample")
+    monkeypatch.setenv("EFD_UNPACKER_PROFILE_MEMORY", "1")
+    monkeypatch.setenv("EFD_UNPACKER_PROFILE_DIR", "/tmp/profiles")
+    profiler = UnpackProfiler.from_environment()
+    assert profiler.mode == MODE_SAMPLE
+    assert profiler.trace_memory
+    assert profiler.profile_dir == "/tmp/profiles"
@@ -121,6 +121,39 @@ def test_install_cli_launcher_registers_appimage(monkeypatch, tmp_path):
     assert 'EFD_UNPACKER_BIN="$HOME/.local/share/efd_unpacker/bin"' in profile_text
 
 
+def test_install_cli_launcher_skips_repeat_starts_by_stamp(monkeypatch, tmp_path):
+    home = tmp_path / "home"
+    home.mkdir()
+    _patch_runtime_home(monkeypatch, home)
+    monkeypatch.setattr(runtime.sys, "platform", "linux")
+    monkeypatch.setenv("APPIMAGE", str(tmp_path / "efd-unpacker.AppImage"))
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("SHELL", "/bin/bash")
+
+    assert runtime.install_cli_launcher() is True
+    assert (home / ".local" / "share" / "efd_unpacker" / runtime.CLI_LAUNCHER_STAMP).exists()
+
+    def fail(*_args):
+        raise AssertionError("registration must be skipped")
+
+    # The fast path neither looks up the profile nor rebuilds or resolves the launcher target.
+    monkeypatch.setattr(runtime, "_ensure_shell_profile_exports_path", fail)
+    monkeypatch.setattr(runtime, "get_shell_profile_path", fail)
+    monkeypatch.setattr(runtime, "_cli_launcher_script", fail)
+    monkeypatch.setattr(runtime, "resolve_cli_launcher_target", fail)
+    assert runtime.install_cli_launcher() is False
+
+    profile_path = home / ".profile"
+    profile_path.write_text("# user edit\n", encoding="utf-8")
+    monkeypatch.undo()
+    _patch_runtime_home(monkeypatch, home)
+    monkeypatch.setattr(runtime.sys, "platform", "linux")
+    monkeypatch.setenv("APPIMAGE", str(tmp_path / "efd-unpacker.AppImage"))
+    monkeypatch.setenv("SHELL", "/bin/bash")
+    assert runtime.install_cli_launcher() is True
+    assert runtime.CLI_PROFILE_START in profile_path.read_text(encoding="utf-8")
+
+
 def test_install_cli_launcher_does_not_override_unmanaged_launcher(monkeypatch, tmp_path):
     home = tmp_path / "home"
     _patch_runtime_home(monkeypatch, home)
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from efd_unpacker.application.console import resolve_file_argument
+from efd_unpacker.application.single_instance import InstanceServer, forward_to_running_instance
+from efd_unpacker.application.worker_service import ServiceAlreadyRunningError, ServiceEndpoint
+
+
+@pytest.fixture
+def running_instance(tmp_path):
+    state_path = tmp_path / "gui.json"
+    received = []
+    delivered = threading.Event()
+
+    def on_files(files):
+        received.append(files)
+        delivered.set()
+
+    instance = InstanceServer(on_files, state_path)
+    instance.start()
+    yield instance, state_path, received, delivered
+    instance.shutdown()
+
+
+def test_second_launch_forwards_files_to_running_instance(running_instance):
+    _instance, state_path, received, delivered = running_instance
+
+    assert forward_to_running_instance(["/data/a.efd", "/data/b.efd"], state_path)
+    assert delivered.wait(5)
+    assert received == [["/data/a.efd", "/data/b.efd"]]
+
+
+def test_instance_rejects_foreign_token_and_second_server(running_instance, tmp_path):
+    instance, state_path, received, _delivered = running_instance
+    forged = tmp_path / "forged.json"
+    endpoint = ServiceEndpoint.load(state_path)
+    ServiceEndpoint(endpoint.family, endpoint.address, "wrong").save(forged)
+
+    assert not forward_to_running_instance(["/data/a.efd"], forged)
+    assert received == []
+    with pytest.raises(ServiceAlreadyRunningError):
+        InstanceServer(lambda _files: None, state_path).start()
+
+
+def test_forward_fails_without_running_instance(tmp_path):
+    state_path = tmp_path / "gui.json"
+    assert not forward_to_running_instance(["/data/a.efd"], state_path)
+
+    instance = InstanceServer(lambda _files: None, state_path)
+    instance.start()
+    instance.shutdown()
+
+    assert not state_path.exists()
+    assert not forward_to_running_instance(["/data/a.efd"], state_path)
+
+
+def test_resolve_file_argument_decodes_file_url():
+    assert resolve_file_argument("file:///data/My%20Supply.efd") == "/data/My Supply.efd"
+    assert resolve_file_argument("/data/plain.efd") == "/data/plain.efd"
@@ -0,0 +1,75 @@
+import datetime as dt
+import os
+
+from efd_unpacker.domain.supply_diff import CHANGE_ADDED, CHANGE_CHANGED, CHANGE_REMOVED, EntryChange, diff_supplies
+from efd_unpacker.domain.supply_stream import SupplyManifest
+from efd_unpacker.domain.supply_writer import EFDWriter
+
+
+def _write_efd(path, files):
+    manifest = SupplyManifest(
+        description={"ru": ("Test", "", "")},
+        included_files=[(name, dt.datetime(2024, 1, 1), len(data)) for name, data in files.items()],
+    )
+    with open(path, "wb") as handle:
+        EFDWriter(handle, workers=1).write(manifest, files.values())
+    return str(path)
+
+
+def test_diff_reports_added_removed_and_changed_entries(tmp_path):
+    old = _write_efd(tmp_path / "old.efd", {"a.txt": b"same", "b.txt": b"before", "c.txt": b"gone", "d": b"x" * 10})
+    new = _write_efd(tmp_path / "new.efd", {"a.txt": b"same", "b.txt": b"after!", "d": b"x" * 12, "e.txt": b"new"})
+
+    diff = diff_supplies(old, new)
+
+    assert diff.complete and not diff.identical
+    assert sorted(diff.changes, key=lambda change: change.path) == [
+        EntryChange("b.txt", CHANGE_CHANGED, 6, 6),
+        EntryChange("c.txt", CHANGE_REMOVED, 4, None),
+        EntryChange("d", CHANGE_CHANGED, 10, 12),
+        EntryChange("e.txt", CHANGE_ADDED, None, 3),
+    ]
+
+
+def test_diff_identical_and_quick_mode(tmp_path):
+    files = {f"dir\\file{index}.bin": bytes([index]) * 1000 for index in range(20)}
+    old = _write_efd(tmp_path / "old.efd", files)
+    same = _write_efd(tmp_path / "same.efd", files)
+    changed = _write_efd(tmp_path / "changed.efd", {**files, "dir\\file0.bin": b"\xff" * 1000})
+
+    assert diff_supplies(old, same, stop_on_first=True).identical
+    quick = diff_supplies(old, changed, stop_on_first=True)
+    assert [change.path for change in quick.changes] == ["dir\\file0.bin"]
+
+
+def test_verify_against_directory_reports_drift(tmp_path):
+    from efd_unpacker.domain.supply_diff import DRIFT_CONTENT, DRIFT_MISSING, DRIFT_MTIME, DRIFT_SIZE
+    from efd_unpacker.domain.supply_diff import verify_against_directory
+    from efd_unpacker.domain.unpack_service import UnpackService
+
+    files = {f"Tmpl\\f{index}.txt": f"content {index}".encode() for index in range(5)}
+    efd = _write_efd(tmp_path / "in.efd", files)
+    tree = tmp_path / "tree"
+    UnpackService().unpack(efd, str(tree))
+    assert verify_against_directory(efd, str(tree), check_hash=True).matches
+
+    (tree / "Tmpl" / "f0.txt").unlink()
+    (tree / "Tmpl" / "f1.txt").write_bytes(b"longer content 1")
+    (tree / "Tmpl" / "f2.txt").write_bytes(b"CONTENT 2")
+    os.utime(tree / "Tmpl" / "f2.txt", (1_704_067_200, 1_704_067_200))
+    os.utime(tree / "Tmpl" / "f3.txt", (1_000_000_000, 1_000_000_000))
+    (tree / "Tmpl" / "extra.txt").write_bytes(b"not in efd")
+
+    result = verify_against_directory(efd, str(tree), check_hash=True, workers=3)
+    assert result.checked == 5
+    assert [(item.path, item.kind) for item in result.drift] == [
+        ("Tmpl\\f0.txt", DRIFT_MISSING),
+        ("Tmpl\\f1.txt", DRIFT_SIZE),
+        ("Tmpl\\f2.txt", DRIFT_CONTENT),
+        ("Tmpl\\f3.txt", DRIFT_MTIME),
+    ]
+    assert [item.kind for item in verify_against_directory(efd, str(tree)).drift] == [
+        DRIFT_MISSING,
+        DRIFT_SIZE,
+        DRIFT_MTIME,
+    ]
@@ -0,0 +1,73 @@
+import io
+import zlib
+from pathlib import Path
+
+import pytest
+
+from efd_unpacker.domain.errors import UnpackError, UnpackErrorCode
+from efd_unpacker.domain.supply_stream import InflatingReader, SupplyManifest, read_supply_manifest
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+
+
+def _deflate(payload: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return compressor.compress(payload) + compressor.flush()
+
+
+def test_inflating_reader_returns_exact_sizes_across_chunks():
+    payload = bytes(range(256)) * 1000
+    reader = InflatingReader(io.BytesIO(_deflate(payload)), chunk_size=1024)
+
+    parts = [reader.read(1000) for _ in range(256)]
+
+    assert b"".join(parts) == payload
+    assert reader.read(10) == b""
+    assert reader.eof
+    assert reader.unused_data == b""
+    assert reader.position == len(payload)
+
+
+def test_inflating_reader_skip_and_trailing_data():
+    payload = b"a" * 5000 + b"tail"
+    reader = InflatingReader(io.BytesIO(_deflate(payload) + b"garbage"), chunk_size=512)
+
+    assert reader.skip(5000) == 5000
+    assert reader.read() == b"tail"
+    assert reader.unused_data == b"garbage"
+
+
+def test_read_supply_manifest_from_sample():
+    with open(SAMPLE, "rb") as handle:
+        manifest = read_supply_manifest(InflatingReader(handle))
+
+    assert set(manifest.description) == {"en", "ru"}
+    assert manifest.description["en"][0] == "Test"
+    assert len(manifest.included_files) == 4
+    assert manifest.included_files[0][0] == "IngvarConsulting\\Test\\1Cv8snc.1CD"
+    assert manifest.total_size == 138462
+
+
+def test_manifest_roundtrips_through_dict():
+    with open(SAMPLE, "rb") as handle:
+        manifest = read_supply_manifest(InflatingReader(handle))
+
+    assert SupplyManifest.from_dict(manifest.to_dict()) == manifest
+
+
+def test_read_supply_manifest_rejects_unknown_header():
+    stream = InflatingReader(io.BytesIO(_deflate(b"\x02\x00\x00\x00\x00\x00\x00\x00")))
+
+    with pytest.raises(UnpackError) as ctx:
+        read_supply_manifest(stream)
+
+    assert ctx.value.code is UnpackErrorCode.INVALID_FORMAT
+
+
+def test_read_supply_manifest_rejects_truncated_table():
+    stream = InflatingReader(io.BytesIO(_deflate(b"\x01\x00\x00\x00\x01\x00\x00\x00")))
+
+    with pytest.raises(UnpackError) as ctx:
+        read_supply_manifest(stream)
+
+    assert ctx.value.code is UnpackErrorCode.INVALID_FORMAT
@@ -0,0 +1,75 @@
+import datetime as dt
+import struct
+import zlib
+from pathlib import Path
+
+from efd_unpacker.domain.supply_stream import SupplyManifest
+from efd_unpacker.domain.supply_verify import (
+    ISSUE_DUPLICATE_PATH,
+    ISSUE_OFFSET,
+    ISSUE_TRAILING_INPUT,
+    ISSUE_TRAILING_PAYLOAD,
+    ISSUE_TRUNCATED,
+    ISSUE_UNSAFE_PATH,
+    ISSUE_UNTERMINATED,
+    verify_supply,
+)
+from efd_unpacker.domain.supply_writer import encode_supply_header
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+
+
+def _raw_efd(path, files, payload=None, finish=True):
+    manifest = SupplyManifest(
+        description={"ru": ("Test", "", "")},
+        included_files=[(name, dt.datetime(2024, 1, 1), size) for name, size in files],
+    )
+    data = encode_supply_header(manifest) + (payload if payload is not None else bytes(manifest.total_size))
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+    path.write_bytes(compressed)
+    return str(path), compressed
+
+
+def _codes(report):
+    return [issue.code for issue in report.issues]
+
+
+def test_verify_accepts_sample_and_reports_throughput():
+    report = verify_supply(str(SAMPLE))
+
+    assert report.ok, report.issues
+    assert report.files == 4
+    assert report.payload_bytes == 138462
+    assert report.compressed_bytes == SAMPLE.stat().st_size
+    assert report.mb_per_s > 0
+
+
+def test_verify_detects_payload_and_stream_problems(tmp_path):
+    files = [("a\\b.txt", 10), ("c.txt", 5)]
+
+    path, _ = _raw_efd(tmp_path / "short.efd", files, payload=bytes(12))
+    assert _codes(verify_supply(path)) == [ISSUE_TRUNCATED]
+
+    path, _ = _raw_efd(tmp_path / "long.efd", files, payload=bytes(20))
+    assert _codes(verify_supply(path)) == [ISSUE_TRAILING_PAYLOAD]
+
+    path, _ = _raw_efd(tmp_path / "open.efd", files, finish=False)
+    assert _codes(verify_supply(path)) == [ISSUE_UNTERMINATED]
+
+    path, compressed = _raw_efd(tmp_path / "garbage.efd", files)
+    Path(path).write_bytes(compressed + b"garbage")
+    assert _codes(verify_supply(path)) == [ISSUE_TRAILING_INPUT]
+
+
+def test_verify_detects_table_problems(tmp_path):
+    path, _ = _raw_efd(tmp_path / "paths.efd", [("..\\evil.txt", 1), ("Dir\\A.txt", 1), ("dir\\a.TXT", 1)])
+    report = verify_supply(path)
+    assert _codes(report) == [ISSUE_UNSAFE_PATH, ISSUE_DUPLICATE_PATH]
+
+    data = bytearray(zlib.decompress(SAMPLE.read_bytes(), -15))
+    second_offset = data.index("1cv8.mft".encode("utf-16-le")) + len("1cv8.mft".encode("utf-16-le")) + 8
+    data[second_offset:second_offset + 4] = struct.pack("I", 1)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    (tmp_path / "offset.efd").write_bytes(compressor.compress(bytes(data)) + compressor.flush())
+    assert _codes(verify_supply(str(tmp_path / "offset.efd"))) == [ISSUE_OFFSET]
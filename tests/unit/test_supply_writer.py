@@ -0,0 +1,107 @@
+import datetime as dt
+import io
+import os
+import zlib
+
+import pytest
+
+from efd_unpacker.domain.errors import PackError, PackErrorCode
+from efd_unpacker.domain.supply_stream import SupplyManifest
+from efd_unpacker.domain.supply_writer import (
+    EFDWriter,
+    ParallelDeflate,
+    SupplyFilter,
+    encode_supply_header,
+    pack_directory,
+    repack_supply,
+)
+from efd_unpacker.domain.unpack_service import UnpackService
+
+
+def test_parallel_deflate_produces_single_raw_stream():
+    payload = b"".join(os.urandom(700) + bytes(300) for _ in range(300))
+    sink = io.BytesIO()
+    deflate = ParallelDeflate(sink, workers=4, block_size=16 * 1024)
+    for start in range(0, len(payload), 5000):
+        deflate.write(payload[start:start + 5000])
+    deflate.close()
+
+    decompressor = zlib.decompressobj(-15)
+    assert decompressor.decompress(sink.getvalue()) == payload
+    assert decompressor.eof
+    assert decompressor.unused_data == b""
+    assert deflate.bytes_out == len(sink.getvalue())
+
+
+def test_writer_roundtrips_through_unpack(tmp_path):
+    modified_at = dt.datetime(2023, 5, 17, 10, 30, 15, 123456)
+    files = {"Root\\a.txt": b"hello", "Root\\sub\\b.bin": os.urandom(50000), "Root\\empty": b""}
+    manifest = SupplyManifest(
+        description={"ru": ("Комплект", "Поставщик", "Root\\readme.txt"), "en": ("Supply", "Vendor", "")},
+        included_files=[(name, modified_at, len(data)) for name, data in files.items()],
+    )
+    efd = tmp_path / "out.efd"
+    with open(efd, "wb") as handle:
+        EFDWriter(handle, workers=2, block_size=4096).write(manifest, files.values())
+
+    service = UnpackService()
+    assert service.probe(str(efd)) == manifest
+    service.unpack(str(efd), str(tmp_path / "tree"))
+    assert (tmp_path / "tree" / "Root" / "sub" / "b.bin").read_bytes() == files["Root\\sub\\b.bin"]
+    assert (tmp_path / "tree" / "Root" / "empty").read_bytes() == b""
+
+
+def test_writer_rejects_payload_size_mismatch_and_huge_files():
+    manifest = SupplyManifest(description={}, included_files=[("a", dt.datetime(2024, 1, 1), 10)])
+    with pytest.raises(PackError) as exc_info:
+        EFDWriter(io.BytesIO(), workers=1).write(manifest, [b"short"])
+    assert exc_info.value.code is PackErrorCode.SOURCE_CHANGED
+
+    huge = SupplyManifest(description={}, included_files=[("a", dt.datetime(2024, 1, 1), 1 << 32)])
+    with pytest.raises(PackError) as exc_info:
+        encode_supply_header(huge)
+    assert exc_info.value.code is PackErrorCode.FILE_TOO_LARGE
+
+
+def test_pack_directory_preserves_tree_and_mtime(tmp_path):
+    source = tmp_path / "src"
+    (source / "nested").mkdir(parents=True)
+    (source / "one.txt").write_bytes(b"1" * 1000)
+    (source / "nested" / "two.bin").write_bytes(os.urandom(3000))
+    os.utime(source / "one.txt", (1_700_000_000, 1_700_000_000))
+
+    manifest = pack_directory(str(source), str(tmp_path / "out.efd"), {"ru": ("Test", "", "")}, workers=2)
+    UnpackService().unpack(str(tmp_path / "out.efd"), str(tmp_path / "tree"))
+
+    assert [name for name, _modified, _size in manifest.included_files] == ["one.txt", "nested\\two.bin"]
+    assert (tmp_path / "tree" / "nested" / "two.bin").read_bytes() == (source / "nested" / "two.bin").read_bytes()
+    assert os.path.getmtime(tmp_path / "tree" / "one.txt") == 1_700_000_000
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_repack_filters_languages_and_paths_in_one_pass(tmp_path):
+    modified_at = dt.datetime(2024, 2, 1)
+    files = {
+        "Cfg\\1cv8.cf": os.urandom(20000),
+        "Cfg\\Docs\\readme.TXT": b"docs",
+        "Cfg\\Ext\\opt.epf": b"optional" * 1000,
+    }
+    manifest = SupplyManifest(
+        description={"ru": ("Комплект", "П", ""), "en": ("Supply", "V", ""), "uk": ("Комплект", "П", "")},
+        included_files=[(name, modified_at, len(data)) for name, data in files.items()],
+    )
+    source = tmp_path / "in.efd"
+    with open(source, "wb") as handle:
+        EFDWriter(handle, workers=1).write(manifest, files.values())
+
+    supply_filter = SupplyFilter(languages=("ru", "en"), exclude=("cfg/ext/*", "*.txt"))
+    original, filtered = repack_supply(str(source), str(tmp_path / "out.efd"), supply_filter, workers=2)
+    written = UnpackService().probe(str(tmp_path / "out.efd"))
+
+    assert original == manifest
+    assert written == filtered
+    assert sorted(written.description) == ["en", "ru"]
+    assert [name for name, _modified, _size in written.included_files] == ["Cfg\\1cv8.cf"]
+    UnpackService().unpack(str(tmp_path / "out.efd"), str(tmp_path / "tree"))
+    assert (tmp_path / "tree" / "Cfg" / "1cv8.cf").read_bytes() == files["Cfg\\1cv8.cf"]
+    assert SupplyFilter(include=("*\\docs\\*",)).keeps_file("Cfg\\Docs\\readme.TXT")
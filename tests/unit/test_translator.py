@@ -1,6 +1,7 @@
 import os
 import xml.etree.ElementTree as ET
 
+from efd_unpacker.localization import translator as translator_module
 from efd_unpacker.localization.translator import Translator
 
 
@@ -36,3 +37,68 @@ def test_translator_falls_back_for_empty_translation(tmp_path):
     create_ts(tmp_path, "ru", "TestContext", "Hello", "")
     translator = Translator(lang="ru", translations_dir=str(tmp_path))
     assert translator.translate("TestContext", "Hello") == "Hello"
+
+
+def test_translator_loads_catalog_lazily(tmp_path, monkeypatch):
+    create_ts(tmp_path, "ru", "TestContext", "Hello", "Привет")
+    calls = []
+    original = translator_module._parse_ts
+    monkeypatch.setattr(translator_module, "_parse_ts", lambda path: calls.append(path) or original(path))
+
+    translator = Translator(lang="ru", translations_dir=str(tmp_path))
+    assert calls == []
+    assert translator.translate("TestContext", "Hello") == "Привет"
+    assert translator.translate("TestContext", "Hello") == "Привет"
+    assert len(calls) == 1
+
+
+def test_translator_reuses_compiled_catalog_until_ts_changes(tmp_path, monkeypatch):
+    ts_path = create_ts(tmp_path, "ru", "TestContext", "Hello", "Привет")
+    cache_dir = tmp_path / "catalogs"
+    assert Translator("ru", str(tmp_path), str(cache_dir)).translate("TestContext", "Hello") == "Привет"
+    assert [path.name for path in cache_dir.iterdir()] == ["ru.catalog"]
+
+    def fail(_path):
+        raise AssertionError("XML must not be parsed when the catalog is fresh")
+
+    monkeypatch.setattr(translator_module, "_parse_ts", fail)
+    assert Translator("ru", str(tmp_path), str(cache_dir)).translate("TestContext", "Hello") == "Привет"
+
+    monkeypatch.undo()
+    create_ts(tmp_path, "ru", "TestContext", "Hello", "Здравствуйте")
+    os.utime(ts_path, ns=(0, os.stat(ts_path).st_mtime_ns + 10**9))
+    assert Translator("ru", str(tmp_path), str(cache_dir)).translate("TestContext", "Hello") == "Здравствуйте"
+    assert [path.name for path in cache_dir.iterdir()] == ["ru.catalog"]
+
+
+def test_translator_reuses_catalog_when_ts_moves_to_new_directory(tmp_path, monkeypatch):
+    # Сборка --onefile распаковывает ресурсы в новый временный каталог при каждом запуске.
+    cache_dir = tmp_path / "catalogs"
+    cache_dir.mkdir()
+    (cache_dir / "ru-0123456789abcdef.catalog").write_bytes(b"old format")
+    first = tmp_path / "meipass1"
+    first.mkdir()
+    create_ts(first, "ru", "TestContext", "Hello", "Привет")
+    assert Translator("ru", str(first), str(cache_dir)).translate("TestContext", "Hello") == "Привет"
+
+    second = tmp_path / "meipass2"
+    second.mkdir()
+    create_ts(second, "ru", "TestContext", "Hello", "Привет")
+    os.utime(second / "ru.ts", ns=(0, 10**9))
+
+    def fail(_path):
+        raise AssertionError("XML must not be parsed when only the location changed")
+
+    monkeypatch.setattr(translator_module, "_parse_ts", fail)
+    assert Translator("ru", str(second), str(cache_dir)).translate("TestContext", "Hello") == "Привет"
+    assert [path.name for path in cache_dir.iterdir()] == ["ru.catalog"]
+
+
+def test_translator_ignores_corrupt_catalog(tmp_path):
+    create_ts(tmp_path, "ru", "TestContext", "Hello", "Привет")
+    cache_dir = tmp_path / "catalogs"
+    Translator("ru", str(tmp_path), str(cache_dir)).load()
+    for catalog in cache_dir.glob("*.catalog"):
+        catalog.write_bytes(b"\x00garbage")
+
+    assert Translator("ru", str(tmp_path), str(cache_dir)).translate("TestContext", "Hello") == "Привет"
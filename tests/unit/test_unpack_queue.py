@@ -0,0 +1,42 @@
+from efd_unpacker.presentation.unpack_queue import JobStatus, UnpackQueue
+
+
+def test_queue_starts_jobs_in_order_within_worker_limit():
+    queue = UnpackQueue(max_workers=2)
+    for name in ("a.efd", "b.efd", "c.efd"):
+        queue.add(name)
+    queue.assign_output("/out")
+
+    first = queue.start_next()
+    assert [job.input_file for job in first] == ["a.efd", "b.efd"]
+    assert queue.start_next() == []
+
+    queue.finish(first[0], True, "ok")
+    second = queue.start_next()
+    assert [job.input_file for job in second] == ["c.efd"]
+    assert second[0].output_dir == "/out"
+    assert [job.status for job in queue.jobs] == [JobStatus.DONE, JobStatus.RUNNING, JobStatus.RUNNING]
+
+
+def test_queue_skips_duplicates_and_protects_running_jobs():
+    queue = UnpackQueue(max_workers=1)
+    assert queue.add("a.efd") is not None
+    assert queue.add("a.efd") is None
+    queue.add("b.efd")
+    queue.add("c.efd")
+    running = queue.start_next()[0]
+
+    assert not queue.remove(0)
+    assert not queue.move(1, -1)
+    assert queue.move(2, -1)
+    assert [job.input_file for job in queue.jobs] == ["a.efd", "c.efd", "b.efd"]
+    assert queue.remove(2)
+
+    queue.finish(running, False, "broken")
+    assert queue.add("a.efd") is not None
+    queue.requeue_failed()
+    assert [(job.input_file, job.status) for job in queue.jobs] == [
+        ("a.efd", JobStatus.PENDING),
+        ("c.efd", JobStatus.PENDING),
+        ("a.efd", JobStatus.PENDING),
+    ]
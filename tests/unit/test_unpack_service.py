@@ -5,7 +5,7 @@ from pathlib import Path
 
 from efd_unpacker.domain.errors import UnpackError, UnpackErrorCode
 from efd_unpacker.domain import unpack_service
-from efd_unpacker.domain.unpack_service import UnpackService
+from efd_unpacker.domain.unpack_service import UnpackService, UnpackTimings
 
 
 class DummyReader:
@@ -63,5 +63,126 @@ def test_unpack_skips_unsupported_windows_timestamps(monkeypatch, tmp_path) -> N
     assert utime_calls == []
 
 
+def test_unpack_reports_progress_and_probe_reads_manifest(tmp_path) -> None:
+    sample = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+    service = UnpackService()
+    events = []
+
+    service.unpack(str(sample), str(tmp_path), progress=events.append)
+    manifest = service.probe(str(sample))
+
+    assert [event.files_done for event in events] == [1, 2, 3, 4]
+    assert events[-1].bytes_done == events[-1].bytes_total == manifest.total_size
+    assert len(manifest.included_files) == 4
+
+
+def test_unpack_accumulates_phase_timings(tmp_path) -> None:
+    sample = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+    timings = UnpackTimings()
+
+    UnpackService().unpack(str(sample), str(tmp_path), timings=timings)
+
+    assert timings.inflate > 0
+    assert timings.write > 0
+    assert timings.validate == 0
+    assert timings.to_dict()["total"] == timings.total
+
+
+def test_unpack_modes_produce_identical_trees(tmp_path) -> None:
+    sample = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+    trees = {}
+    for mode in unpack_service.UNPACK_MODES:
+        output_dir = tmp_path / mode
+        events = []
+        UnpackService(unpack_service.create_reader_factory(mode, writers=2)).unpack(
+            str(sample), str(output_dir), progress=events.append
+        )
+        assert events[-1].files_done == 4
+        trees[mode] = {
+            path.relative_to(output_dir): (path.read_bytes(), path.stat().st_mtime)
+            for path in output_dir.rglob("*")
+            if path.is_file()
+        }
+    assert trees["stream"] == trees["spool"]
+    assert trees["pooled"] == trees["spool"]
+
+
+def test_streaming_unpack_rejects_truncated_payload(tmp_path) -> None:
+    import zlib
+
+    sample = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+    payload = zlib.decompress(sample.read_bytes(), -15)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    truncated = tmp_path / "truncated.efd"
+    truncated.write_bytes(compressor.compress(payload[:-100]) + compressor.flush())
+
+    for mode in (unpack_service.UNPACK_MODE_STREAM, unpack_service.UNPACK_MODE_POOLED):
+        service = UnpackService(unpack_service.create_reader_factory(mode))
+        try:
+            service.unpack(str(truncated), str(tmp_path / mode))
+        except UnpackError as exc:
+            assert exc.code is UnpackErrorCode.INVALID_FORMAT
+        else:
+            raise AssertionError(f"{mode} accepted truncated payload")
+        assert not [path for path in (tmp_path / mode).rglob("*") if path.is_file()]
+
+
+
+def test_unpack_stops_when_cancel_is_set(tmp_path) -> None:
+    import threading
+
+    sample = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+    first_file = Path(*UnpackService().probe(str(sample)).included_files[0][0].split("\\"))
+    for mode in unpack_service.UNPACK_MODES:
+        cancel = threading.Event()
+        events = []
+
+        def on_progress(event) -> None:
+            events.append(event)
+            cancel.set()
+
+        (tmp_path / mode / first_file).parent.mkdir(parents=True)
+        (tmp_path / mode / first_file).write_text("template")
+        (tmp_path / mode / "keep.txt").write_text("kept")
+        service = UnpackService(unpack_service.create_reader_factory(mode))
+        try:
+            service.unpack(str(sample), str(tmp_path / mode), progress=on_progress, cancel=cancel)
+        except UnpackError as exc:
+            assert exc.code is UnpackErrorCode.CANCELLED
+        else:
+            raise AssertionError(f"{mode} ignored cancellation")
+        assert len(events) == 1
+        remaining = {path.relative_to(tmp_path / mode) for path in (tmp_path / mode).rglob("*") if path.is_file()}
+        assert remaining == {Path("keep.txt"), first_file}
+
+    try:
+        UnpackService().unpack(str(sample), str(tmp_path / "early"), cancel=cancel)
+    except UnpackError as exc:
+        assert exc.code is UnpackErrorCode.CANCELLED
+    assert not (tmp_path / "early").exists()
+
+
+
+def test_failed_unpack_keeps_files_that_existed_before(tmp_path, monkeypatch) -> None:
+    sample = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+    first_file = UnpackService().probe(str(sample)).included_files[0][0]
+    existing = tmp_path.joinpath(*first_file.split("\\"))
+    existing.parent.mkdir(parents=True)
+    existing.write_text("template")
+
+    def locked(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(unpack_service, "_open_new_file", locked)
+    for mode in unpack_service.UNPACK_MODES:
+        try:
+            UnpackService(unpack_service.create_reader_factory(mode)).unpack(str(sample), str(tmp_path))
+        except UnpackError as exc:
+            assert exc.code is UnpackErrorCode.PERMISSION
+        else:
+            raise AssertionError(f"{mode} ignored a locked file")
+        assert existing.read_text() == "template"
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+from efd_unpacker.application.watch_service import WatchService
+from efd_unpacker.domain.errors import UnpackError, UnpackErrorCode
+from efd_unpacker.domain.file_validator import FileValidator
+from efd_unpacker.domain.unpack_service import UnpackService
+
+
+class RecordingUnpackService(UnpackService):
+    def __init__(self) -> None:
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def unpack(self, input_file: str, output_dir: str, progress=None) -> None:
+        with self._lock:
+            self.calls.append((Path(input_file).name, output_dir))
+        if Path(input_file).name.startswith("bad"):
+            raise UnpackError(UnpackErrorCode.INVALID_FORMAT)
+        if Path(input_file).name.startswith("crash"):
+            raise RuntimeError("boom")
+
+
+class ListWatcher:
+    def __init__(self, batches, service) -> None:
+        self.batches = list(batches)
+        self.service = service
+        self.closed = False
+
+    def poll(self, timeout: float):
+        if not self.batches:
+            self.service.stop()
+            return []
+        return self.batches.pop(0)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _make_inbox(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    for name in ("good.efd", "bad.efd", "readme.txt"):
+        _write_settled(inbox / name)
+    return inbox
+
+
+def _write_settled(path):
+    # Файл давно лежит в каталоге: run_once не ждёт окончания копирования.
+    path.write_bytes(b"payload")
+    old = time.time() - 60
+    os.utime(path, (old, old))
+
+
+def test_run_once_moves_files_to_done_and_failed(tmp_path):
+    inbox = _make_inbox(tmp_path)
+    unpack_service = RecordingUnpackService()
+    results = []
+    service = WatchService(
+        FileValidator(),
+        unpack_service,
+        str(inbox),
+        str(tmp_path / "out"),
+        workers=2,
+        on_result=lambda path, error: results.append((Path(path).name, error)),
+    )
+
+    assert service.run_once() == 2
+
+    assert sorted(name for name, _ in unpack_service.calls) == ["bad.efd", "good.efd"]
+    assert (inbox / "done" / "good.efd").exists()
+    assert (inbox / "failed" / "bad.efd").exists()
+    assert (inbox / "readme.txt").exists()
+    errors = dict(results)
+    assert errors["good.efd"] is None
+    assert errors["bad.efd"].code is UnpackErrorCode.INVALID_FORMAT
+
+
+def test_unexpected_errors_and_failed_moves_are_reported(tmp_path, monkeypatch):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    _write_settled(inbox / "crash.efd")
+    results = []
+    service = WatchService(
+        FileValidator(),
+        RecordingUnpackService(),
+        str(inbox),
+        str(tmp_path / "out"),
+        on_result=lambda path, error: results.append((Path(path).name, error)),
+    )
+
+    service.run_once()
+
+    assert (inbox / "failed" / "crash.efd").exists()
+    assert results[0][1].code is UnpackErrorCode.UNEXPECTED
+
+    _write_settled(inbox / "good.efd")
+
+    def refuse_move(_path, _target_dir):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(WatchService, "_move", staticmethod(refuse_move))
+    service.run_once()
+
+    assert (inbox / "good.efd").exists()
+    assert results[1][0] == "good.efd"
+    assert "cannot move" in results[1][1].details["error"]
+
+
+def test_run_once_waits_until_copied_file_settles(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    copying = inbox / "copying.efd"
+    copying.write_bytes(b"part")
+    unpack_service = RecordingUnpackService()
+    service = WatchService(FileValidator(), unpack_service, str(inbox), str(tmp_path / "out"), settle_time=0.5)
+
+    runner = threading.Thread(target=service.run_once)
+    runner.start()
+    time.sleep(0.2)
+    with open(copying, "ab") as handle:
+        handle.write(b"-rest")
+    assert unpack_service.calls == []
+    runner.join(timeout=5)
+
+    assert unpack_service.calls == [("copying.efd", str(tmp_path / "out"))]
+    assert (inbox / "done" / "copying.efd").read_bytes() == b"part-rest"
+
+
+def test_run_processes_watcher_batches_and_avoids_name_collisions(tmp_path):
+    inbox = _make_inbox(tmp_path)
+    done_dir = tmp_path / "archive"
+    done_dir.mkdir()
+    (done_dir / "good.efd").write_bytes(b"older")
+    service = WatchService(
+        FileValidator(),
+        RecordingUnpackService(),
+        str(inbox),
+        str(tmp_path / "out"),
+        done_dir=str(done_dir),
+    )
+    watcher = ListWatcher([[str(inbox / "good.efd")], []], service)
+
+    service.run(watcher)
+
+    assert watcher.closed
+    assert (done_dir / "good.efd").read_bytes() == b"older"
+    assert (done_dir / "good.1.efd").read_bytes() == b"payload"
+    assert (inbox / "bad.efd").exists()
+
+
+def test_watch_unpacks_real_sample(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    sample = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+    (inbox / "renamed.efd").write_bytes(sample.read_bytes())
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    WatchService(FileValidator(), UnpackService(), str(inbox), str(output_dir), settle_time=0.0).run_once()
+
+    assert (output_dir / "IngvarConsulting" / "Test" / "1Cv8.cf").exists()
+    assert (inbox / "done" / "renamed.efd").exists()
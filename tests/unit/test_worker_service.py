@@ -0,0 +1,109 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from efd_unpacker.application.worker_service import (
+    ServiceAlreadyRunningError,
+    ServiceClient,
+    ServiceUnavailableError,
+    WorkerService,
+)
+from efd_unpacker.domain.errors import FileValidationCode, FileValidationError, UnpackError, UnpackErrorCode
+from efd_unpacker.domain.file_validator import FileValidator
+from efd_unpacker.domain.unpack_service import UnpackService
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "1cv8.efd"
+
+
+@pytest.fixture
+def running_service(tmp_path):
+    state_path = tmp_path / "service.json"
+    service = WorkerService(FileValidator(), UnpackService(), workers=2, state_path=state_path)
+    service.start()
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    yield service, state_path
+    service.shutdown()
+    thread.join(timeout=5)
+
+
+def test_client_unpacks_through_service(running_service, tmp_path):
+    _service, state_path = running_service
+    client = ServiceClient(state_path)
+    output_dir = tmp_path / "out"
+    events = []
+
+    client.unpack(str(SAMPLE), str(output_dir), progress=events.append)
+
+    assert (output_dir / "IngvarConsulting" / "Test" / "1Cv8.dt").stat().st_size == 29215
+    assert events[-1].files_done == events[-1].files_total == 4
+
+
+def test_client_probe_returns_manifest(running_service):
+    _service, state_path = running_service
+
+    manifest = ServiceClient(state_path).probe(str(SAMPLE))
+
+    assert manifest.total_size == 138462
+    assert manifest.description["ru"][1] == "Ingvar Consulting, LLC"
+
+
+def test_client_receives_domain_errors(running_service, tmp_path):
+    _service, state_path = running_service
+
+    with pytest.raises(FileValidationError) as ctx:
+        ServiceClient(state_path).unpack(str(tmp_path / "missing.efd"), str(tmp_path / "out"))
+
+    assert ctx.value.code is FileValidationCode.NOT_FOUND
+
+
+def test_client_receives_unexpected_errors(tmp_path):
+    class BrokenUnpackService(UnpackService):
+        def unpack(self, input_file, output_dir, **options):
+            raise RuntimeError("disk controller reset")
+
+    state_path = tmp_path / "service.json"
+    service = WorkerService(FileValidator(), BrokenUnpackService(), workers=1, state_path=state_path)
+    service.start()
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(UnpackError) as ctx:
+            ServiceClient(state_path).unpack(str(SAMPLE), str(tmp_path / "out"))
+    finally:
+        service.shutdown()
+        thread.join(timeout=5)
+
+    assert ctx.value.code is UnpackErrorCode.UNEXPECTED
+    assert ctx.value.details == {"error": "disk controller reset"}
+
+
+def test_second_service_refuses_to_start(running_service):
+    _service, state_path = running_service
+    second = WorkerService(FileValidator(), UnpackService(), state_path=state_path)
+
+    with pytest.raises(ServiceAlreadyRunningError):
+        second.start()
+
+
+def test_shutdown_removes_state_file(tmp_path):
+    state_path = tmp_path / "service.json"
+    service = WorkerService(FileValidator(), UnpackService(), state_path=state_path)
+    service.start()
+
+    service.shutdown()
+
+    assert not state_path.exists()
+    assert not ServiceClient(state_path).ping()
+
+
+def test_client_without_service_is_unavailable(tmp_path):
+    with pytest.raises(ServiceUnavailableError):
+        ServiceClient(tmp_path / "service.json").unpack("input.efd", "out")
+
+
+def test_from_environment_respects_opt_out(monkeypatch):
+    monkeypatch.setenv("EFD_UNPACKER_NO_SERVICE", "1")
+
+    assert ServiceClient.from_environment() is None
@@ -106,6 +106,126 @@
         <source>Unpack error: %1</source>
         <translation>Ошибка при распаковке: %1</translation>
     </message>
+    <message>
+        <source>Move Up</source>
+        <translation>Выше</translation>
+    </message>
+    <message>
+        <source>Move Down</source>
+        <translation>Ниже</translation>
+    </message>
+    <message>
+        <source>Remove</source>
+        <translation>Удалить</translation>
+    </message>
+    <message>
+        <source>Pending</source>
+        <translation>Ожидает</translation>
+    </message>
+    <message>
+        <source>Unpacking</source>
+        <translation>Распаковка</translation>
+    </message>
+    <message>
+        <source>Done</source>
+        <translation>Готово</translation>
+    </message>
+    <message>
+        <source>Failed</source>
+        <translation>Ошибка</translation>
+    </message>
+    <message>
+        <source>Failed to unpack %1 of %2 files</source>
+        <translation>Не удалось распаковать файлов: %1 из %2</translation>
+    </message>
+    <message>
+        <source>Unpacked %1 files</source>
+        <translation>Распаковано файлов: %1</translation>
+    </message>
+    <message>
+        <source>Cancelled</source>
+        <translation>Отменено</translation>
+    </message>
+    <message>
+        <source>Cancel</source>
+        <translation>Отмена</translation>
+    </message>
+    <message>
+        <source>Preparing...</source>
+        <translation>Подготовка...</translation>
+    </message>
+    <message>
+        <source>Cancelling...</source>
+        <translation>Отмена...</translation>
+    </message>
+    <message>
+        <source>Archive %1 of %2</source>
+        <translation>Архив %1 из %2</translation>
+    </message>
+    <message>
+        <source>Files: %1 of %2</source>
+        <translation>Файлов: %1 из %2</translation>
+    </message>
+    <message>
+        <source>%1 MB written, %2 MB/s</source>
+        <translation>Записано %1 МБ, %2 МБ/с</translation>
+    </message>
+    <message>
+        <source>%1 left</source>
+        <translation>осталось %1</translation>
+    </message>
+    <message>
+        <source>Name</source>
+        <translation>Имя</translation>
+    </message>
+    <message>
+        <source>Size</source>
+        <translation>Размер</translation>
+    </message>
+    <message>
+        <source>Reading archive...</source>
+        <translation>Чтение архива...</translation>
+    </message>
+    <message>
+        <source>Files: %1, total size: %2</source>
+        <translation>Файлов: %1, общий размер: %2</translation>
+    </message>
+    <message>
+        <source>Free space in output folder: %1</source>
+        <translation>Свободно в каталоге распаковки: %1</translation>
+    </message>
+    <message>
+        <source>Not enough free space in output folder</source>
+        <translation>Недостаточно места в каталоге распаковки</translation>
+    </message>
+    <message>
+        <source>B</source>
+        <translation>Б</translation>
+    </message>
+    <message>
+        <source>KB</source>
+        <translation>КБ</translation>
+    </message>
+    <message>
+        <source>MB</source>
+        <translation>МБ</translation>
+    </message>
+    <message>
+        <source>GB</source>
+        <translation>ГБ</translation>
+    </message>
+    <message>
+        <source>TB</source>
+        <translation>ТБ</translation>
+    </message>
+    <message>
+        <source>Checking files...</source>
+        <translation>Проверка файлов...</translation>
+    </message>
+    <message>
+        <source>Preparing output folder...</source>
+        <translation>Подготовка каталога распаковки...</translation>
+    </message>
 </context>
 <context>
     <name>UnpackService</name>
@@ -129,6 +249,14 @@
         <source>Unexpected error: %1</source>
         <translation>Неожиданная ошибка: %1</translation>
     </message>
+    <message>
+        <source>Invalid EFD file format</source>
+        <translation>Неверный формат файла EFD</translation>
+    </message>
+    <message>
+        <source>Unpacking cancelled</source>
+        <translation>Распаковка отменена</translation>
+    </message>
 </context>
 <context>
     <name>SettingsService</name>
@@ -191,6 +319,18 @@
         <source>Failed to create output directory: %1</source>
         <translation>Не удалось создать папку вывода: %1</translation>
     </message>
+    <message>
+        <source>Directory does not exist</source>
+        <translation>Каталог не существует</translation>
+    </message>
+    <message>
+        <source>No permission to read directory</source>
+        <translation>Нет прав на чтение каталога</translation>
+    </message>
+    <message>
+        <source>No permission to move files out of the inbox directory</source>
+        <translation>Нет прав на перенос файлов из входящего каталога</translation>
+    </message>
 </context>
 <context>
     <name>CLIHelp</name>
@@ -214,5 +354,123 @@
         <source>Usage:</source>
         <translation>Использование:</translation>
     </message>
+    <message>
+        <source>3. Service mode: keep a warm worker process for fast repeated unpacks</source>
+        <translation>3. Режим сервиса: держать запущенный процесс для быстрых повторных распаковок</translation>
+    </message>
+</context>
+<context>
+    <name>CLI</name>
+    <message>
+        <source>Invalid arguments. Use --help for usage</source>
+        <translation>Неверные аргументы. Используйте --help для справки</translation>
+    </message>
+    <message>
+        <source>Service is listening on %1</source>
+        <translation>Сервис слушает %1</translation>
+    </message>
+    <message>
+        <source>Service is already running</source>
+        <translation>Сервис уже запущен</translation>
+    </message>
+    <message>
+        <source>Service stopped</source>
+        <translation>Сервис остановлен</translation>
+    </message>
+    <message>
+        <source>Files: %1</source>
+        <translation>Файлов: %1</translation>
+    </message>
+    <message>
+        <source>Total size: %1 bytes</source>
+        <translation>Общий размер: %1 байт</translation>
+    </message>
+    <message>
+        <source>Watching %1, unpacking to %2</source>
+        <translation>Наблюдение за %1, распаковка в %2</translation>
+    </message>
+    <message>
+        <source>Processed %1</source>
+        <translation>Обработан %1</translation>
+    </message>
+    <message>
+        <source>Watch stopped</source>
+        <translation>Наблюдение остановлено</translation>
+    </message>
+    <message>
+        <source>Cache is disabled</source>
+        <translation>Кеш отключён</translation>
+    </message>
+    <message>
+        <source>Cache entries removed: %1</source>
+        <translation>Удалено записей кеша: %1</translation>
+    </message>
+    <message>
+        <source>Entries: %1</source>
+        <translation>Записей: %1</translation>
+    </message>
+    <message>
+        <source>Cached trees: %1</source>
+        <translation>Сохранённых деревьев: %1</translation>
+    </message>
+    <message>
+        <source>Disk usage: %1 of %2 bytes</source>
+        <translation>Занято на диске: %1 из %2 байт</translation>
+    </message>
+    <message>
+        <source>Profile written to %1</source>
+        <translation>Профиль записан в %1</translation>
+    </message>
+    <message>
+        <source>Peak memory: %1 bytes</source>
+        <translation>Пиковое потребление памяти: %1 байт</translation>
+    </message>
+    <message>
+        <source>Packed %1 files (%2 bytes) into %3</source>
+        <translation>Упаковано файлов: %1 (%2 байт) в %3</translation>
+    </message>
+    <message>
+        <source>Repacked %1 of %2 files (%3 bytes) into %4</source>
+        <translation>Перепаковано файлов: %1 из %2 (%3 байт) в %4</translation>
+    </message>
+    <message>
+        <source>Files are identical</source>
+        <translation>Файлы совпадают</translation>
+    </message>
+    <message>
+        <source>Added: %1, removed: %2, changed: %3</source>
+        <translation>Добавлено: %1, удалено: %2, изменено: %3</translation>
+    </message>
+    <message>
+        <source>(stopped at first difference)</source>
+        <translation>(остановлено на первом отличии)</translation>
+    </message>
+    <message>
+        <source>Directory matches EFD (%1 files)</source>
+        <translation>Каталог совпадает с EFD (файлов: %1)</translation>
+    </message>
+    <message>
+        <source>Checked %1 files, drifted: %2</source>
+        <translation>Проверено файлов: %1, расхождений: %2</translation>
+    </message>
+    <message>
+        <source>%1: problems found: %2</source>
+        <translation>%1: найдено проблем: %2</translation>
+    </message>
+    <message>
+        <source>%1: %2 files, %3 bytes, %4 MB/s</source>
+        <translation>%1: файлов: %2, байт: %3, %4 МБ/с</translation>
+    </message>
+</context>
+<context>
+    <name>PackService</name>
+    <message>
+        <source>File is too large for EFD: %1</source>
+        <translation>Файл слишком большой для EFD: %1</translation>
+    </message>
+    <message>
+        <source>File changed while packing: %1</source>
+        <translation>Файл изменился во время упаковки: %1</translation>
+    </message>
 </context>
 </TS>